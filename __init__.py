@@ -3,15 +3,18 @@
 Map_researcher0.3V Package Initialization
 """
 
+import os
+
 # Ensure fallbacks are initialized first
 try:
     import fallbacks
 except ImportError:
     pass
 
-# Try to run bootstrap
-try:
-    import bootstrap
-    bootstrap.run_bootstrap()
-except ImportError:
-    pass
\ No newline at end of file
+# Try to run bootstrap, unless disabled (e.g. when the package is only used as a library)
+if not os.environ.get("MR_SKIP_BOOTSTRAP"):
+    try:
+        import bootstrap
+        bootstrap.run_bootstrap()
+    except ImportError:
+        pass
\ No newline at end of file
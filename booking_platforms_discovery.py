@@ -1,17 +1,296 @@
 # web_discovery/booking_platforms_discovery.py
+import os
+import shutil
 import requests
+import asyncio
 import json
+import hashlib
 import time
 import random
 import logging
+import queue
+import threading
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from datetime import datetime, timedelta
-from selenium import webdriver
-from selenium.webdriver.common.by import By
-from selenium.webdriver.support.ui import WebDriverWait
-from selenium.webdriver.support import expected_conditions as EC
-from bs4 import BeautifulSoup
-import pandas as pd
+from urllib.parse import urljoin, urlsplit
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 import re
+from collections import defaultdict
+
+# selenium and bs4 are imported where they are used, so importing this
+# module (e.g. only for its deduplication helpers) stays cheap
+
+try:
+    from rapidfuzz.distance import Levenshtein
+    RAPIDFUZZ_AVAILABLE = True
+except ImportError:
+    RAPIDFUZZ_AVAILABLE = False
+
+# numba only backs up rapidfuzz, so it is not imported when rapidfuzz is there
+NUMBA_AVAILABLE = False
+if not RAPIDFUZZ_AVAILABLE:
+    try:
+        import numpy as np
+        from numba import njit
+        NUMBA_AVAILABLE = True
+    except ImportError:
+        pass
+
+try:
+    import redis
+    REDIS_AVAILABLE = True
+except ImportError:
+    REDIS_AVAILABLE = False
+
+try:
+    from playwright.async_api import async_playwright, TimeoutError as PlaywrightTimeoutError
+    PLAYWRIGHT_AVAILABLE = True
+except ImportError:
+    PLAYWRIGHT_AVAILABLE = False
+
+# Seconds to keep cached search results per platform; prices move faster than inventory
+DEFAULT_CACHE_TTL = 3600
+PLATFORM_CACHE_TTL = {
+    "booking": 1800,
+    "airbnb": 1800,
+    "haraj": 3600
+}
+
+# Result card selectors per platform
+BOOKING_CARD_SELECTOR = "div[data-testid='property-card']"
+AIRBNB_CARD_SELECTOR = "div[itemprop='itemListElement']"
+HARAJ_POST_SELECTOR = "div.post"
+
+# Subresources never needed to read result cards; stylesheets are kept since
+# innerText and lazy loading on scroll depend on layout
+BLOCKED_URL_PATTERNS = ["*.woff", "*.woff2", "*.ttf", "*.otf", "*.mp4", "*.webm"]
+BLOCKED_RESOURCE_TYPES = {"image", "font", "media"}
+
+# Result URL fields: map center coordinates on Booking.com, listing ID on Airbnb
+_CENTER_RE = re.compile(r";center=(-?\d+(?:\.\d+)?),(-?\d+(?:\.\d+)?)")
+_ROOMS_RE = re.compile(r"/rooms/(\d+)")
+
+# Haraj has no rentals category filter, so daily rentals are found by keyword
+HARAJ_SEARCH_TERMS = [
+    "شقق للإيجار اليومي",
+    "شقق مفروشة يومي",
+    "شقق فندقية",
+    "إيجار يومي",
+    "أجنحة فندقية"
+]
+
+# Card schemas: field -> (selector inside the card, how to read the value).
+# Read modes: "text", "text_first_line", "href", "content", "aria_label_first_word".
+BOOKING_SCHEMA = {
+    "name": ("div[data-testid='title']", "text"),
+    "url": ("a[data-testid='title-link']", "href"),
+    "address": ("span[data-testid='address']", "text"),
+    "rating": ("div[data-testid='review-score']", "text_first_line"),
+    "price": ("span[data-testid='price-and-discounted-price']", "text")
+}
+AIRBNB_SCHEMA = {
+    "name": ("meta[itemprop='name']", "content"),
+    "url": ("meta[itemprop='url']", "content"),
+    "price": ("span[data-testid='price-element']", "text"),
+    "rating": ("span[aria-label*='rating']", "aria_label_first_word"),
+    "property_type": ("div[data-testid='listing-card-subtitle']", "text")
+}
+HARAJ_SCHEMA = {
+    "title": ("a.postTitle", "text"),
+    "url": ("a.postTitle", "href"),
+    "city": ("a.city", "text"),
+    "price": ("div.postPrice", "text"),
+    "date": ("span.postDate", "text")
+}
+
+# In-page extractor: returns every card's schema fields in a single WebDriver command.
+# Called with arguments (card_selector, schema); missing elements read as "".
+EXTRACT_CARDS_JS = """
+var schema = arguments[1];
+var read = function (el, mode) {
+    if (!el) return "";
+    switch (mode) {
+        case "href": return el.href || "";
+        case "content": return el.getAttribute("content") || "";
+        case "text_first_line": return el.innerText.split("\\n")[0];
+        case "aria_label_first_word": return (el.getAttribute("aria-label") || "").trim().split(/\\s+/)[0];
+        default: return el.innerText;
+    }
+};
+return Array.from(document.querySelectorAll(arguments[0])).map(function (card) {
+    var record = {};
+    Object.keys(schema).forEach(function (field) {
+        record[field] = read(card.querySelector(schema[field][0]), schema[field][1]);
+    });
+    return record;
+});
+"""
+
+# Scrolls to the bottom and waits in the page for more cards to load, so each
+# scroll is one WebDriver command. Called with arguments (card_selector, timeout_ms)
+# through execute_async_script; resolves to whether new cards appeared.
+SCROLL_AND_WAIT_JS = """
+var selector = arguments[0], timeoutMs = arguments[1], done = arguments[arguments.length - 1];
+var previous = document.querySelectorAll(selector).length;
+var started = Date.now();
+window.scrollTo(0, document.body.scrollHeight);
+(function poll() {
+    if (document.querySelectorAll(selector).length > previous) return done(true);
+    if (Date.now() - started >= timeoutMs) return done(false);
+    setTimeout(poll, 100);
+})();
+"""
+
+# Playwright passes a single argument to page.evaluate, so unpack it into the
+# positional arguments EXTRACT_CARDS_JS expects
+PLAYWRIGHT_EXTRACT_CARDS_JS = "(args) => (function () {" + EXTRACT_CARDS_JS + "}).apply(null, args)"
+
+_chromedriver_path = None
+_chromedriver_lock = threading.Lock()
+
+def _resolve_chromedriver():
+    """
+    Locate the chromedriver binary once per process
+    
+    Without an explicit path every webdriver.Chrome launch runs Selenium
+    Manager's driver lookup again. Order: CHROMEDRIVER environment variable,
+    webdriver_manager's cached download, chromedriver on PATH.
+    
+    Returns:
+        Path to chromedriver, or None to leave the lookup to Selenium
+    """
+    global _chromedriver_path
+    with _chromedriver_lock:
+        if _chromedriver_path is None:
+            path = os.environ.get("CHROMEDRIVER")
+            if not path:
+                try:
+                    from webdriver_manager.chrome import ChromeDriverManager
+                    path = ChromeDriverManager().install()
+                except ImportError:
+                    path = shutil.which("chromedriver")
+                except Exception as e:
+                    # Offline or rate limited: use a local driver, or leave it to Selenium Manager
+                    logging.getLogger("booking_platforms_discovery").warning(
+                        f"webdriver_manager could not provide chromedriver: {str(e)}")
+                    path = shutil.which("chromedriver")
+            # An empty string records that nothing was found
+            _chromedriver_path = path or ""
+        return _chromedriver_path or None
+
+def _canon_url(url):
+    """Identity of a result URL for deduplication: host and path, ignoring query and fragment"""
+    parts = urlsplit(url)
+    return (parts.netloc.lower(), parts.path.rstrip("/"))
+
+# The compiled fallback is also used by data_discovery, so it is public
+if NUMBA_AVAILABLE:
+    @njit(cache=True)
+    def levenshtein_numba(a, b):
+        """Levenshtein distance between two arrays of code points"""
+        cols = b.size + 1
+        prev = np.arange(cols, dtype=np.int64)
+        curr = np.empty(cols, np.int64)
+        
+        for i in range(1, a.size + 1):
+            curr[0] = i
+            for j in range(1, cols):
+                cost = 0 if a[i-1] == b[j-1] else 1
+                curr[j] = min(prev[j] + 1, curr[j-1] + 1, prev[j-1] + cost)
+            prev, curr = curr, prev
+        
+        return prev[cols-1]
+    
+    def code_points(text):
+        """Code points of a string as an array, so names in any script compare per character"""
+        return np.frombuffer(text.encode("utf-32-le"), dtype=np.uint32)
+
+def _name_ngrams(name, n=3):
+    """Character n-grams used to block fuzzy name comparisons"""
+    if len(name) < n:
+        # Names this short can only be similar enough to an identical name
+        return {name}
+    return {name[i:i + n] for i in range(len(name) - n + 1)}
+
+
+class WebDriverPool:
+    """Bounded pool of pre-launched WebDriver instances shared between platform searches"""
+    
+    def __init__(self, driver_factory, size=4, max_uses_per_instance=50):
+        """
+        Initialize the pool and pre-launch its drivers
+        
+        Args:
+            driver_factory: Callable returning a new WebDriver instance
+            size: Maximum number of drivers kept alive at once
+            max_uses_per_instance: Number of checkouts after which a driver is recycled
+        """
+        self.driver_factory = driver_factory
+        self.size = size
+        self.max_uses_per_instance = max_uses_per_instance
+        self.logger = logging.getLogger("booking_platforms_discovery")
+        self._drivers = queue.Queue(maxsize=size)
+        self._uses = {}
+        self._lock = threading.Lock()
+        
+        # Pre-warm the pool; a slot holding None is relaunched lazily on checkout
+        for _ in range(size):
+            try:
+                self._drivers.put(self.driver_factory())
+            except Exception as e:
+                self.logger.error(f"Error launching pooled WebDriver: {str(e)}")
+                self._drivers.put(None)
+    
+    def get(self):
+        """Check a driver out of the pool, blocking until one is free"""
+        driver = self._drivers.get()
+        if driver is None:
+            try:
+                driver = self.driver_factory()
+            except Exception:
+                self._drivers.put(None)
+                raise
+        return driver
+    
+    def put(self, driver, discard=False):
+        """
+        Return a driver to the pool
+        
+        Args:
+            driver: Driver previously obtained from get()
+            discard: Quit the driver instead of reusing it (e.g. after an error)
+        """
+        with self._lock:
+            uses = self._uses.pop(id(driver), 0) + 1
+            if not discard and uses < self.max_uses_per_instance:
+                self._uses[id(driver)] = uses
+        
+        if discard or uses >= self.max_uses_per_instance:
+            self._quit(driver)
+            self._drivers.put(None)
+        else:
+            self._drivers.put(driver)
+    
+    def close(self):
+        """Quit every idle driver in the pool"""
+        while True:
+            try:
+                driver = self._drivers.get_nowait()
+            except queue.Empty:
+                break
+            if driver is not None:
+                self._quit(driver)
+        with self._lock:
+            self._uses.clear()
+    
+    def _quit(self, driver):
+        """Quit a driver, ignoring errors from an already dead browser"""
+        try:
+            driver.quit()
+        except Exception as e:
+            self.logger.warning(f"Error closing pooled WebDriver: {str(e)}")
+
 
 class BookingPlatformsDiscovery:
     """Class for discovering hotels through booking platforms"""
@@ -21,14 +300,67 @@ class BookingPlatformsDiscovery:
         self.db = db
         self.config = config
         self.logger = logging.getLogger("booking_platforms_discovery")
-        self.driver = None
+        self.driver_pool = None
+        self.driver_pool_lock = threading.Lock()
+        self.pool_size = 4
+        self.max_driver_uses = 50
+        if self.config:
+            self.pool_size = self.config.get('webdriver_pool_size', self.pool_size)
+            self.max_driver_uses = self.config.get('webdriver_max_uses', self.max_driver_uses)
+        self.browser_backend = self._select_browser_backend()
         self.headers = {
             'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/96.0.4664.110 Safari/537.36',
             'Accept-Language': 'en-US,en;q=0.9,ar;q=0.8'
         }
+        self.session = self._create_session()
+        self.cache = self._create_cache()
+        
+    def _create_session(self):
+        """Create a keep-alive HTTP session with connection pooling and retries"""
+        session = requests.Session()
+        session.headers.update(self.headers)
+        adapter = HTTPAdapter(
+            pool_connections=16,
+            pool_maxsize=32,
+            max_retries=Retry(total=3, backoff_factor=0.3, status_forcelist=[429, 500, 502, 503, 504])
+        )
+        session.mount("https://", adapter)
+        session.mount("http://", adapter)
+        return session
+    
+    def _select_browser_backend(self):
+        """Pick the browser automation backend from the config: selenium (default) or playwright"""
+        backend = self.config.get('browser_backend', 'selenium') if self.config else 'selenium'
+        if backend == 'playwright' and not PLAYWRIGHT_AVAILABLE:
+            self.logger.warning("Playwright not available, falling back to Selenium")
+            return 'selenium'
+        return backend
+    
+    def _create_cache(self):
+        """Connect to the Redis results cache if one is configured"""
+        if not (REDIS_AVAILABLE and self.config and self.config.get('redis_url')):
+            return None
+        
+        try:
+            return redis.Redis.from_url(self.config['redis_url'])
+        except Exception as e:
+            self.logger.warning(f"Redis cache not available: {str(e)}")
+            return None
         
     def initialize_webdriver(self):
-        """Initialize the Selenium WebDriver"""
+        """Initialize the pool of Selenium WebDrivers"""
+        self.driver_pool = WebDriverPool(
+            self._create_webdriver,
+            size=self.pool_size,
+            max_uses_per_instance=self.max_driver_uses
+        )
+        self.logger.info(f"WebDriver pool initialized with {self.pool_size} drivers")
+        
+    def _create_webdriver(self):
+        """Launch a single headless Chrome WebDriver"""
+        from selenium import webdriver
+        from selenium.webdriver.chrome.service import Service
+        
         options = webdriver.ChromeOptions()
         options.add_argument("--headless")
         options.add_argument("--no-sandbox")
@@ -36,20 +368,44 @@ class BookingPlatformsDiscovery:
         options.add_argument("--disable-gpu")
         options.add_argument("--window-size=1920,1080")
         
+        # Skip images and don't wait for subresources once the DOM is ready
+        options.page_load_strategy = "eager"
+        options.add_experimental_option("prefs", {"profile.managed_default_content_settings.images": 2})
+        options.add_argument("--blink-settings=imagesEnabled=false")
+        options.add_argument("--disable-extensions")
+        options.add_argument("--disable-notifications")
+        
         # Add user agent to avoid detection
         user_agent = "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/96.0.4664.110 Safari/537.36"
         options.add_argument(f'user-agent={user_agent}')
         
-        self.driver = webdriver.Chrome(options=options)
-        self.driver.implicitly_wait(10)
-        self.logger.info("WebDriver initialized successfully")
+        # Each driver needs its own Service (it owns the chromedriver process),
+        # but they all share the path resolved once
+        service = Service(executable_path=_resolve_chromedriver())
+        
+        # No implicit wait: every lookup that needs to wait uses an explicit WebDriverWait
+        driver = webdriver.Chrome(service=service, options=options)
+        
+        # Web fonts and video have no content setting, so drop them at the network layer.
+        # This only saves bandwidth, so a driver without it is still used
+        try:
+            driver.execute_cdp_cmd("Network.enable", {})
+            driver.execute_cdp_cmd("Network.setBlockedURLs", {"urls": BLOCKED_URL_PATTERNS})
+        except Exception as e:
+            self.logger.warning(f"Could not block fonts and media in WebDriver: {str(e)}")
+        return driver
         
+    def close(self):
+        """Close all pooled WebDrivers and the HTTP session"""
+        if self.driver_pool:
+            self.driver_pool.close()
+            self.driver_pool = None
+            self.logger.info("WebDriver pool closed")
+        self.session.close()
+    
     def close_webdriver(self):
-        """Close the WebDriver"""
-        if self.driver:
-            self.driver.quit()
-            self.driver = None
-            self.logger.info("WebDriver closed")
+        """Close all pooled WebDrivers and the HTTP session (kept for existing callers, use close)"""
+        self.close()
     
     def discover_hotels_in_area(self, location, checkin_date=None, checkout_date=None, platforms=None):
         """
@@ -76,45 +432,321 @@ class BookingPlatformsDiscovery:
         if not platforms:
             platforms = ["booking", "airbnb", "hotels", "agoda", "expedia", "local_platforms"]
             
-        # Initialize WebDriver if needed
-        if not self.driver:
-            self.initialize_webdriver()
+        if self.browser_backend == 'playwright':
+            searches = asyncio.run(self._scrape_all(location, checkin_date, checkout_date, platforms))
+        else:
+            searches = self._search_platforms_selenium(location, checkin_date, checkout_date, platforms)
             
         all_results = []
         
-        # Search each platform
-        for platform in platforms:
-            try:
+        for platform, results in searches:
+            if isinstance(results, Exception):
+                self.logger.error(f"Error searching {platform}: {str(results)}")
+                continue
+            
+            # Add platform name to results
+            for result in results:
+                result["platform"] = platform
+                
+            all_results.extend(results)
+            self.logger.info(f"Found {len(results)} results from {platform}")
+                
+        # Deduplicate results
+        unique_results = self._remove_duplicates(all_results)
+        self.logger.info(f"Total unique results: {len(unique_results)}")
+        
+        return unique_results
+    
+    def _search_platforms_selenium(self, location, checkin_date, checkout_date, platforms):
+        """
+        Search all platforms concurrently, each on its own pooled WebDriver
+        
+        The WebDriver pool is only started once a platform search needs
+        a browser.
+        
+        Yields:
+            (platform, results) pairs as searches finish; results is the
+            raised exception if the search failed
+        """
+        with ThreadPoolExecutor(max_workers=self.pool_size) as executor:
+            futures = {}
+            for platform in platforms:
                 platform_method = getattr(self, f"_search_{platform}", None)
                 if platform_method:
                     self.logger.info(f"Searching platform: {platform}")
-                    results = platform_method(location, checkin_date, checkout_date)
-                    
-                    # Add platform name to results
-                    for result in results:
-                        result["platform"] = platform
-                        
-                    all_results.extend(results)
-                    self.logger.info(f"Found {len(results)} results from {platform}")
-                    
-                    # Add random delay between platform searches
-                    time.sleep(random.uniform(2, 5))
+                    future = executor.submit(
+                        self._run_platform_search, platform, platform_method, location, checkin_date, checkout_date
+                    )
+                    futures[future] = platform
                 else:
                     self.logger.warning(f"Search method not implemented for platform: {platform}")
-            except Exception as e:
-                self.logger.error(f"Error searching {platform}: {str(e)}")
+            
+            for future in as_completed(futures):
+                try:
+                    yield futures[future], future.result()
+                except Exception as e:
+                    yield futures[future], e
+    
+    async def _scrape_all(self, location, checkin_date, checkout_date, platforms):
+        """
+        Search all platforms concurrently in one Playwright Chromium process
+        
+        Each platform gets its own browser context (separate cookies and
+        storage) while sharing the browser, instead of a Chrome per driver.
+        
+        Returns:
+            List of (platform, results) pairs; results is the raised
+            exception if the search failed
+        """
+        searches = []
+        pending = []
+        for platform in platforms:
+            if not self._result_pages(platform, location, checkin_date, checkout_date):
+                self.logger.warning(f"Search method not implemented for platform: {platform}")
+                continue
+            
+            cache_key = self._cache_key(platform, location, checkin_date, checkout_date)
+            cached = self._get_cached_results(cache_key)
+            if cached is not None:
+                self.logger.info(f"Using cached results for {platform}")
+                searches.append((platform, cached))
+            else:
+                self.logger.info(f"Searching platform: {platform}")
+                pending.append((platform, cache_key))
+        
+        if not pending:
+            return searches
+        
+        async with async_playwright() as playwright:
+            browser = await playwright.chromium.launch(headless=True)
+            try:
+                outcomes = await asyncio.gather(
+                    *(self._scrape_platform(browser, platform, location, checkin_date, checkout_date)
+                      for platform, _ in pending),
+                    return_exceptions=True
+                )
+            finally:
+                await browser.close()
+        
+        for (platform, cache_key), results in zip(pending, outcomes):
+            if results and not isinstance(results, Exception):
+                self._cache_results(platform, cache_key, results)
+            searches.append((platform, results))
+        
+        return searches
+    
+    async def _scrape_platform(self, browser, platform, location, checkin_date, checkout_date):
+        """
+        Scrape every result page of one platform in its own browser context
+        
+        Args:
+            browser: Shared Playwright browser
+            platform: Platform name
+            location: Location name
+            checkin_date: Check-in date in YYYY-MM-DD format
+            checkout_date: Check-out date in YYYY-MM-DD format
+            
+        Returns:
+            List of properties
+        """
+        # Platforms that serve rendered HTML are tried over plain HTTP first
+        results = await asyncio.get_running_loop().run_in_executor(
+            None, self._search_http, platform, location, checkin_date, checkout_date
+        )
+        if results is not None:
+            return results
+        
+        context = await browser.new_context(
+            user_agent=self.headers['User-Agent'],
+            extra_http_headers={'Accept-Language': self.headers['Accept-Language']}
+        )
+        try:
+            await context.route("**/*", self._block_heavy_resources)
+            page = await context.new_page()
+            results = []
+            for url, card_selector, schema, build_record, scroll in self._result_pages(
+                    platform, location, checkin_date, checkout_date):
+                await page.goto(url, wait_until="domcontentloaded")
+                await page.wait_for_selector(card_selector, timeout=15000)
                 
-        # Deduplicate results
-        unique_results = self._remove_duplicates(all_results)
-        self.logger.info(f"Total unique results: {len(unique_results)}")
+                if scroll:
+                    await self._scroll_page_for_results(page, card_selector)
+                
+                # Extract all cards in one round-trip
+                cards = await page.evaluate(PLAYWRIGHT_EXTRACT_CARDS_JS, [card_selector, schema]) or []
+                
+                # All cards on the page share the time they were scraped
+                timestamp = datetime.now().isoformat()
+                
+                for card in cards:
+                    record = build_record(card, timestamp)
+                    if record:
+                        results.append(record)
+            return results
+        finally:
+            await context.close()
+    
+    async def _block_heavy_resources(self, route):
+        """Abort images, fonts and media, which are never needed to read result cards"""
+        if route.request.resource_type in BLOCKED_RESOURCE_TYPES:
+            await route.abort()
+        else:
+            await route.continue_()
+    
+    async def _scroll_page_for_results(self, page, card_selector, max_scrolls=5, timeout=4):
+        """Playwright counterpart of _scroll_for_results"""
+        for _ in range(max_scrolls):
+            previous_count = await page.evaluate(
+                "(selector) => { window.scrollTo(0, document.body.scrollHeight);"
+                " return document.querySelectorAll(selector).length; }",
+                card_selector
+            )
+            
+            try:
+                await page.wait_for_function(
+                    "([selector, count]) => document.querySelectorAll(selector).length > count",
+                    arg=[card_selector, previous_count],
+                    timeout=timeout * 1000
+                )
+            except PlaywrightTimeoutError:
+                break
+    
+    def _search_http(self, platform, location, checkin_date, checkout_date):
+        """
+        Search a platform that serves rendered HTML without a browser
         
-        return unique_results
+        Returns:
+            List of properties, or None if the platform needs a real browser
+        """
+        try:
+            if platform == "booking":
+                return self._search_booking_http(self._booking_search_url(location, checkin_date, checkout_date))
+            if platform == "haraj":
+                return self._search_haraj_http(location)
+        except requests.RequestException as e:
+            self.logger.warning(f"HTTP search on {platform} failed, falling back to browser: {str(e)}")
+        return None
     
-    def _search_booking(self, location, checkin_date, checkout_date):
+    def _result_pages(self, platform, location, checkin_date, checkout_date):
+        """
+        Describe the result pages to scrape for a platform
+        
+        Returns:
+            List of (url, card selector, card schema, record builder, scroll)
+            tuples, or None if the platform has no scraper
+        """
+        if platform == "booking":
+            return [(self._booking_search_url(location, checkin_date, checkout_date),
+                     BOOKING_CARD_SELECTOR, BOOKING_SCHEMA, self._build_booking_record, True)]
+        if platform == "airbnb":
+            return [(self._airbnb_search_url(location, checkin_date, checkout_date),
+                     AIRBNB_CARD_SELECTOR, AIRBNB_SCHEMA, self._build_airbnb_record, True)]
+        if platform == "haraj":
+            return [(self._haraj_search_url(location, term), HARAJ_POST_SELECTOR, HARAJ_SCHEMA,
+                     lambda post, timestamp, term=term: self._build_haraj_record(post, term, timestamp), False)
+                    for term in HARAJ_SEARCH_TERMS]
+        return None
+    
+    def _run_platform_search(self, platform, platform_method, location, checkin_date, checkout_date):
+        """
+        Run a platform search, serving repeat queries from the cache
+        
+        Platforms that serve rendered HTML are tried over plain HTTP first;
+        a pooled driver is only checked out when they need a real browser.
+        """
+        cache_key = self._cache_key(platform, location, checkin_date, checkout_date)
+        cached = self._get_cached_results(cache_key)
+        if cached is not None:
+            self.logger.info(f"Using cached results for {platform}")
+            return cached
+        
+        results = self._search_http(platform, location, checkin_date, checkout_date)
+        if results is None:
+            driver_pool = self._get_driver_pool()
+            driver = driver_pool.get()
+            failed = False
+            try:
+                results = platform_method(driver, location, checkin_date, checkout_date)
+            except Exception:
+                failed = True
+                raise
+            finally:
+                driver_pool.put(driver, discard=failed)
+        
+        if results:
+            self._cache_results(platform, cache_key, results)
+        return results
+    
+    def _get_driver_pool(self):
+        """Return the WebDriver pool, starting it on first use"""
+        with self.driver_pool_lock:
+            if not self.driver_pool:
+                self.initialize_webdriver()
+            return self.driver_pool
+    
+    def _cache_key(self, platform, location, checkin_date, checkout_date):
+        """Build the cache key for a platform search"""
+        digest = hashlib.sha1(f"{location}|{checkin_date}|{checkout_date}".encode("utf-8")).hexdigest()
+        return f"mr:v1:{platform}:{digest}"
+    
+    def _get_cached_results(self, cache_key):
+        """Return cached search results, or None on a miss or cache error"""
+        if self.cache is None:
+            return None
+        
+        try:
+            cached = self.cache.get(cache_key)
+        except Exception as e:
+            self.logger.warning(f"Error reading from cache: {str(e)}")
+            return None
+        
+        return json.loads(cached) if cached else None
+    
+    def _cache_results(self, platform, cache_key, results):
+        """Store search results in the cache with the platform's TTL"""
+        if self.cache is None:
+            return
+        
+        ttl = PLATFORM_CACHE_TTL.get(platform, DEFAULT_CACHE_TTL)
+        if self.config and platform in self.config.get('cache_ttl', {}):
+            ttl = self.config['cache_ttl'][platform]
+        
+        try:
+            self.cache.setex(cache_key, ttl, json.dumps(results, ensure_ascii=False))
+        except Exception as e:
+            self.logger.warning(f"Error writing to cache: {str(e)}")
+    
+    def _wait_for_element(self, driver, selector, timeout):
+        """Wait until an element matching the CSS selector is present on the page"""
+        from selenium.webdriver.common.by import By
+        from selenium.webdriver.support import expected_conditions as EC
+        from selenium.webdriver.support.ui import WebDriverWait
+        
+        WebDriverWait(driver, timeout).until(
+            EC.presence_of_element_located((By.CSS_SELECTOR, selector))
+        )
+    
+    def _scroll_for_results(self, driver, card_selector, max_scrolls=5, timeout=4):
+        """
+        Scroll a results page until no new result cards are loaded
+        
+        Args:
+            driver: Selenium WebDriver showing the results page
+            card_selector: CSS selector matching one result card
+            max_scrolls: Maximum number of scrolls
+            timeout: Seconds to wait for new cards after each scroll
+        """
+        for _ in range(max_scrolls):
+            # Scroll and wait for new cards in the same round-trip
+            if not driver.execute_async_script(SCROLL_AND_WAIT_JS, card_selector, timeout * 1000):
+                break
+    
+    def _search_booking(self, driver, location, checkin_date, checkout_date):
         """
         Search for hotels on Booking.com
         
         Args:
+            driver: Selenium WebDriver to use
             location: Location name
             checkin_date: Check-in date in YYYY-MM-DD format
             checkout_date: Check-out date in YYYY-MM-DD format
@@ -123,97 +755,26 @@ class BookingPlatformsDiscovery:
             List of hotel properties
         """
         try:
-            # Format dates for Booking.com URL
-            checkin_parts = checkin_date.split("-")
-            checkout_parts = checkout_date.split("-")
-            
-            checkin_formatted = f"{checkin_parts[0]}-{checkin_parts[1]}-{checkin_parts[2]}"
-            checkout_formatted = f"{checkout_parts[0]}-{checkout_parts[1]}-{checkout_parts[2]}"
-            
-            # Format the URL
-            url = f"https://www.booking.com/searchresults.html?ss={location}&checkin={checkin_formatted}&checkout={checkout_formatted}&lang=ar"
-            
-            self.driver.get(url)
+            url = self._booking_search_url(location, checkin_date, checkout_date)
+            driver.get(url)
             
             # Wait for results to load
-            WebDriverWait(self.driver, 15).until(
-                EC.presence_of_element_located((By.CSS_SELECTOR, "div[data-testid='property-card']"))
-            )
+            self._wait_for_element(driver, BOOKING_CARD_SELECTOR, 15)
             
             # Scroll to load more results
-            last_height = self.driver.execute_script("return document.body.scrollHeight")
+            self._scroll_for_results(driver, BOOKING_CARD_SELECTOR)
             
-            for _ in range(5):  # Scroll a few times
-                self.driver.execute_script("window.scrollTo(0, document.body.scrollHeight);")
-                time.sleep(2)
-                
-                new_height = self.driver.execute_script("return document.body.scrollHeight")
-                if new_height == last_height:
-                    break
-                last_height = new_height
+            # Extract hotel data from all cards in one round-trip
+            property_cards = driver.execute_script(EXTRACT_CARDS_JS, BOOKING_CARD_SELECTOR, BOOKING_SCHEMA) or []
             
-            # Extract hotel data
-            property_cards = self.driver.find_elements(By.CSS_SELECTOR, "div[data-testid='property-card']")
+            # All cards on the page share the time they were scraped
+            timestamp = datetime.now().isoformat()
             
             results = []
             for card in property_cards:
-                try:
-                    # Extract hotel name
-                    name_element = card.find_element(By.CSS_SELECTOR, "div[data-testid='title']")
-                    name = name_element.text
-                    
-                    # Extract URL
-                    link_element = card.find_element(By.CSS_SELECTOR, "a[data-testid='title-link']")
-                    url = link_element.get_attribute("href")
-                    
-                    # Extract address if available
-                    address = ""
-                    address_elements = card.find_elements(By.CSS_SELECTOR, "span[data-testid='address']")
-                    if address_elements:
-                        address = address_elements[0].text
-                    
-                    # Extract rating if available
-                    rating = ""
-                    rating_elements = card.find_elements(By.CSS_SELECTOR, "div[data-testid='review-score']")
-                    if rating_elements:
-                        rating = rating_elements[0].text.split('\n')[0]
-                    
-                    # Extract price if available
-                    price = ""
-                    price_elements = card.find_elements(By.CSS_SELECTOR, "span[data-testid='price-and-discounted-price']")
-                    if price_elements:
-                        price = price_elements[0].text
-                    
-                    # Extract latitude and longitude from URL if available
-                    lat, lng = None, None
-                    if "city=" in url:
-                        try:
-                            # Try to extract coordinates from URL in cases where they're included
-                            coords_part = url.split(";center=")[1].split(";")[0] if ";center=" in url else None
-                            if coords_part:
-                                coords = coords_part.split(",")
-                                lat = float(coords[0])
-                                lng = float(coords[1])
-                        except:
-                            pass
-                    
-                    hotel_data = {
-                        "name": name,
-                        "address": address,
-                        "rating": rating,
-                        "price": price,
-                        "url": url,
-                        "latitude": lat,
-                        "longitude": lng,
-                        "source": "booking.com",
-                        "data_timestamp": datetime.now().isoformat()
-                    }
-                    
-                    results.append(hotel_data)
-                    
-                except Exception as e:
-                    self.logger.warning(f"Error extracting property data: {str(e)}")
-                    continue
+                record = self._build_booking_record(card, timestamp)
+                if record:
+                    results.append(record)
             
             return results
             
@@ -221,11 +782,114 @@ class BookingPlatformsDiscovery:
             self.logger.error(f"Error in _search_booking: {str(e)}")
             return []
     
-    def _search_airbnb(self, location, checkin_date, checkout_date):
+    def _booking_search_url(self, location, checkin_date, checkout_date):
+        """Build the Booking.com search results URL"""
+        # Format dates for Booking.com URL
+        checkin_parts = checkin_date.split("-")
+        checkout_parts = checkout_date.split("-")
+        
+        checkin_formatted = f"{checkin_parts[0]}-{checkin_parts[1]}-{checkin_parts[2]}"
+        checkout_formatted = f"{checkout_parts[0]}-{checkout_parts[1]}-{checkout_parts[2]}"
+        
+        return f"https://www.booking.com/searchresults.html?ss={location}&checkin={checkin_formatted}&checkout={checkout_formatted}&lang=ar"
+    
+    def _search_booking_http(self, url):
+        """
+        Fetch Booking.com search results over plain HTTP
+        
+        Args:
+            url: Booking.com search results URL
+            
+        Returns:
+            List of hotel properties, or None if the page needs a real browser
+            (e.g. a bot challenge or consent page without property cards)
+        """
+        from bs4 import BeautifulSoup
+        
+        response = self.session.get(url, timeout=20)
+        if response.status_code != 200:
+            return None
+        
+        soup = BeautifulSoup(response.text, 'html.parser')
+        property_cards = soup.select(BOOKING_CARD_SELECTOR)
+        if not property_cards:
+            return None
+        
+        # All cards on the page share the time they were scraped
+        timestamp = datetime.now().isoformat()
+        
+        results = []
+        for card_element in property_cards:
+            record = self._build_booking_record(self._extract_card(card_element, BOOKING_SCHEMA, url), timestamp)
+            if record:
+                results.append(record)
+        
+        return results
+    
+    def _extract_card(self, card_element, schema, base_url=None):
+        """
+        Read the fields described by a card schema from a parsed HTML card
+        
+        Args:
+            card_element: BeautifulSoup element of one result card
+            schema: Card schema mapping field -> (selector, read mode)
+            base_url: URL of the page, used to resolve relative links
+            
+        Returns:
+            Dictionary of field values, "" for missing elements
+        """
+        card = {}
+        for field, (selector, mode) in schema.items():
+            element = card_element.select_one(selector)
+            if element is None:
+                card[field] = ""
+            elif mode == "href":
+                # Resolve like the DOM's el.href does in EXTRACT_CARDS_JS
+                href = element.get("href", "")
+                card[field] = urljoin(base_url, href) if base_url and href else href
+            elif mode == "content":
+                card[field] = element.get("content", "")
+            elif mode == "text_first_line":
+                card[field] = element.get_text("\n", strip=True).split("\n")[0]
+            elif mode == "aria_label_first_word":
+                words = (element.get("aria-label") or "").split()
+                card[field] = words[0] if words else ""
+            else:
+                card[field] = element.get_text(strip=True)
+        return card
+    
+    def _build_booking_record(self, card, timestamp):
+        """Build a Booking.com property record from a result card, or None if it is incomplete"""
+        if not card.get("name") or not card.get("url"):
+            return None
+        
+        url = card["url"]
+        
+        # Extract latitude and longitude from URL if available
+        lat, lng = None, None
+        if "city=" in url:
+            match = _CENTER_RE.search(url)
+            if match:
+                lat, lng = float(match.group(1)), float(match.group(2))
+        
+        return {
+            "name": card["name"],
+            "address": card["address"],
+            "rating": card["rating"],
+            "price": card["price"],
+            "url": url,
+            "latitude": lat,
+            "longitude": lng,
+            "source": "booking.com",
+            "data_timestamp": timestamp
+        }
+    
+    def _search_airbnb(self, driver, location, checkin_date, checkout_date):
         """
         Search for properties on Airbnb
         
         Args:
+            driver: Selenium WebDriver to use
             location: Location name
             checkin_date: Check-in date in YYYY-MM-DD format
             checkout_date: Check-out date in YYYY-MM-DD format
@@ -234,88 +898,27 @@ class BookingPlatformsDiscovery:
             List of properties
         """
         try:
-            # Format dates for Airbnb URL
-            checkin_formatted = checkin_date.replace("-", "")
-            checkout_formatted = checkout_date.replace("-", "")
+            url = self._airbnb_search_url(location, checkin_date, checkout_date)
             
-            # Format the URL
-            url = f"https://www.airbnb.com/s/{location}/homes?checkin={checkin_formatted}&checkout={checkout_formatted}"
-            
-            self.driver.get(url)
+            driver.get(url)
             
             # Wait for results to load
-            WebDriverWait(self.driver, 15).until(
-                EC.presence_of_element_located((By.CSS_SELECTOR, "div[itemprop='itemListElement']"))
-            )
+            self._wait_for_element(driver, AIRBNB_CARD_SELECTOR, 15)
             
             # Scroll to load more results
-            last_height = self.driver.execute_script("return document.body.scrollHeight")
+            self._scroll_for_results(driver, AIRBNB_CARD_SELECTOR)
             
-            for _ in range(5):  # Scroll a few times
-                self.driver.execute_script("window.scrollTo(0, document.body.scrollHeight);")
-                time.sleep(2)
-                
-                new_height = self.driver.execute_script("return document.body.scrollHeight")
-                if new_height == last_height:
-                    break
-                last_height = new_height
+            # Extract property data from all cards in one round-trip
+            property_elements = driver.execute_script(EXTRACT_CARDS_JS, AIRBNB_CARD_SELECTOR, AIRBNB_SCHEMA) or []
             
-            # Extract property data
-            property_elements = self.driver.find_elements(By.CSS_SELECTOR, "div[itemprop='itemListElement']")
+            # All cards on the page share the time they were scraped
+            timestamp = datetime.now().isoformat()
             
             results = []
             for element in property_elements:
-                try:
-                    # Extract property name
-                    name_element = element.find_element(By.CSS_SELECTOR, "meta[itemprop='name']")
-                    name = name_element.get_attribute("content")
-                    
-                    # Extract URL
-                    url_element = element.find_element(By.CSS_SELECTOR, "meta[itemprop='url']")
-                    url = url_element.get_attribute("content")
-                    
-                    # Extract price if available
-                    price = ""
-                    price_elements = element.find_elements(By.CSS_SELECTOR, "span[data-testid='price-element']")
-                    if price_elements:
-                        price = price_elements[0].text
-                    
-                    # Extract rating if available
-                    rating = ""
-                    rating_elements = element.find_elements(By.CSS_SELECTOR, "span[aria-label*='rating']")
-                    if rating_elements:
-                        rating = rating_elements[0].get_attribute("aria-label").split()[0]
-                    
-                    # Extract type if available
-                    property_type = ""
-                    type_elements = element.find_elements(By.CSS_SELECTOR, "div[data-testid='listing-card-subtitle']")
-                    if type_elements:
-                        property_type = type_elements[0].text
-                    
-                    # We don't have direct access to coordinates, but can extract property ID
-                    property_id = None
-                    if url:
-                        try:
-                            property_id = url.split("/rooms/")[1].split("?")[0]
-                        except:
-                            pass
-                    
-                    property_data = {
-                        "name": name,
-                        "price": price,
-                        "rating": rating,
-                        "property_type": property_type,
-                        "url": url,
-                        "property_id": property_id,
-                        "source": "airbnb",
-                        "data_timestamp": datetime.now().isoformat()
-                    }
-                    
+                property_data = self._build_airbnb_record(element, timestamp)
+                if property_data:
                     results.append(property_data)
-                    
-                except Exception as e:
-                    self.logger.warning(f"Error extracting property data: {str(e)}")
-                    continue
             
             return results
             
@@ -323,11 +926,42 @@ class BookingPlatformsDiscovery:
             self.logger.error(f"Error in _search_airbnb: {str(e)}")
             return []
     
-    def _search_local_platforms(self, location, checkin_date, checkout_date):
+    def _airbnb_search_url(self, location, checkin_date, checkout_date):
+        """Build the Airbnb search results URL"""
+        # Format dates for Airbnb URL
+        checkin_formatted = checkin_date.replace("-", "")
+        checkout_formatted = checkout_date.replace("-", "")
+        
+        return f"https://www.airbnb.com/s/{location}/homes?checkin={checkin_formatted}&checkout={checkout_formatted}"
+    
+    def _build_airbnb_record(self, element, timestamp):
+        """Build an Airbnb property record from a result card, or None if it is incomplete"""
+        name = element.get("name")
+        url = element.get("url")
+        if not name or not url:
+            return None
+        
+        # We don't have direct access to coordinates, but can extract property ID
+        match = _ROOMS_RE.search(url)
+        property_id = match.group(1) if match else None
+        
+        return {
+            "name": name,
+            "price": element["price"],
+            "rating": element["rating"],
+            "property_type": element["property_type"],
+            "url": url,
+            "property_id": property_id,
+            "source": "airbnb",
+            "data_timestamp": timestamp
+        }
+    
+    def _search_local_platforms(self, driver, location, checkin_date, checkout_date):
         """
         Search for properties on local booking platforms
         
         Args:
+            driver: Selenium WebDriver to use
             location: Location name
             checkin_date: Check-in date in YYYY-MM-DD format
             checkout_date: Check-out date in YYYY-MM-DD format
@@ -339,84 +973,40 @@ class BookingPlatformsDiscovery:
         # Implement searches for platforms like Almosafer, Flyin, etc.
         return []
         
-    def _search_haraj(self, location):
+    def _search_haraj(self, driver, location, checkin_date=None, checkout_date=None):
         """
         Search for daily rental properties on Haraj
         
         Args:
+            driver: Selenium WebDriver to use
             location: Location name
+            checkin_date: Unused, accepted for a uniform platform search signature
+            checkout_date: Unused, accepted for a uniform platform search signature
             
         Returns:
             List of properties
         """
         try:
-            # Format the URL for Haraj search
-            search_terms = [
-                "شقق للإيجار اليومي",
-                "شقق مفروشة يومي",
-                "شقق فندقية",
-                "إيجار يومي",
-                "أجنحة فندقية"
-            ]
-            
             all_results = []
             
-            for term in search_terms:
-                url = f"https://haraj.com.sa/search/{term}%20{location}"
+            for term in HARAJ_SEARCH_TERMS:
+                url = self._haraj_search_url(location, term)
                 
-                self.driver.get(url)
+                driver.get(url)
                 
                 # Wait for results to load
-                WebDriverWait(self.driver, 10).until(
-                    EC.presence_of_element_located((By.CSS_SELECTOR, "div.post"))
-                )
+                self._wait_for_element(driver, HARAJ_POST_SELECTOR, 10)
+                
+                # Extract property data from all posts in one round-trip
+                post_elements = driver.execute_script(EXTRACT_CARDS_JS, HARAJ_POST_SELECTOR, HARAJ_SCHEMA) or []
                 
-                # Extract property data
-                post_elements = self.driver.find_elements(By.CSS_SELECTOR, "div.post")
+                # All posts on the page share the time they were scraped
+                timestamp = datetime.now().isoformat()
                 
                 for post in post_elements:
-                    try:
-                        # Extract title
-                        title_element = post.find_element(By.CSS_SELECTOR, "a.postTitle")
-                        title = title_element.text
-                        
-                        # Extract URL
-                        url = title_element.get_attribute("href")
-                        
-                        # Extract city if available
-                        city = ""
-                        city_elements = post.find_elements(By.CSS_SELECTOR, "a.city")
-                        if city_elements:
-                            city = city_elements[0].text
-                        
-                        # Extract price if available
-                        price = ""
-                        price_elements = post.find_elements(By.CSS_SELECTOR, "div.postPrice")
-                        if price_elements:
-                            price = price_elements[0].text
-                        
-                        # Extract date if available
-                        date = ""
-                        date_elements = post.find_elements(By.CSS_SELECTOR, "span.postDate")
-                        if date_elements:
-                            date = date_elements[0].text
-                        
-                        property_data = {
-                            "title": title,
-                            "city": city,
-                            "price": price,
-                            "date_posted": date,
-                            "url": url,
-                            "source": "haraj",
-                            "search_term": term,
-                            "data_timestamp": datetime.now().isoformat()
-                        }
-                        
+                    property_data = self._build_haraj_record(post, term, timestamp)
+                    if property_data:
                         all_results.append(property_data)
-                        
-                    except Exception as e:
-                        self.logger.warning(f"Error extracting property data: {str(e)}")
-                        continue
                 
                 # Add delay between searches
                 time.sleep(random.uniform(1, 3))
@@ -427,6 +1017,68 @@ class BookingPlatformsDiscovery:
             self.logger.error(f"Error in _search_haraj: {str(e)}")
             return []
     
+    def _search_haraj_http(self, location):
+        """
+        Fetch the Haraj results for all search terms concurrently over plain HTTP
+        
+        Args:
+            location: Location name
+            
+        Returns:
+            List of properties, or None if the pages need a real browser
+        """
+        from bs4 import BeautifulSoup
+        
+        urls = [self._haraj_search_url(location, term) for term in HARAJ_SEARCH_TERMS]
+        
+        # One request per term, all sharing the session's keep-alive connections
+        with ThreadPoolExecutor(max_workers=len(urls)) as executor:
+            responses = list(executor.map(lambda url: self.session.get(url, timeout=20), urls))
+        
+        if any(response.status_code != 200 for response in responses):
+            return None
+        
+        all_results = []
+        found_posts = False
+        for term, url, response in zip(HARAJ_SEARCH_TERMS, urls, responses):
+            soup = BeautifulSoup(response.text, 'html.parser')
+            post_elements = soup.select(HARAJ_POST_SELECTOR)
+            found_posts = found_posts or bool(post_elements)
+            
+            # All posts on the page share the time they were scraped
+            timestamp = datetime.now().isoformat()
+            
+            for post_element in post_elements:
+                property_data = self._build_haraj_record(self._extract_card(post_element, HARAJ_SCHEMA, url), term, timestamp)
+                if property_data:
+                    all_results.append(property_data)
+        
+        # No posts for any term means the listings are rendered client-side
+        if not found_posts:
+            return None
+        
+        return all_results
+    
+    def _haraj_search_url(self, location, term):
+        """Build the Haraj search URL for one search term"""
+        return f"https://haraj.com.sa/search/{term}%20{location}"
+    
+    def _build_haraj_record(self, post, term, timestamp):
+        """Build a Haraj listing record from a post, or None if it has no title"""
+        if not post.get("title"):
+            return None
+        
+        return {
+            "title": post["title"],
+            "city": post["city"],
+            "price": post["price"],
+            "date_posted": post["date"],
+            "url": post["url"],
+            "source": "haraj",
+            "search_term": term,
+            "data_timestamp": timestamp
+        }
+    
     def _remove_duplicates(self, properties):
         """
         Remove duplicate properties from the results
@@ -438,43 +1090,86 @@ class BookingPlatformsDiscovery:
             Deduplicated list of properties
         """
         unique_properties = []
-        seen_urls = set()
-        seen_names = {}
+        seen_urls = set()                # Canonical URLs, see _canon_url
+        seen_names = []                  # Lowercased names of properties matched by name
+        seen_names_exact = {}            # Lowercased name -> position in seen_names
+        seen_indices = []                # Position of each seen name in unique_properties
+        name_blocks = defaultdict(list)  # Name n-gram -> positions in seen_names
         
         for prop in properties:
-            # If URL is available and not seen before, add property
-            if prop.get("url") and prop["url"] not in seen_urls:
-                seen_urls.add(prop["url"])
-                unique_properties.append(prop)
+            # If URL is available, it identifies the property on its own
+            if prop.get("url"):
+                url_key = _canon_url(prop["url"])
+                if url_key not in seen_urls:
+                    seen_urls.add(url_key)
+                    unique_properties.append(prop)
                 continue
             
-            # If name is available, check for similarity with seen names
+            # Otherwise, if name is available, check for an exact and then a similar seen name
             if prop.get("name"):
-                duplicate = False
-                for seen_name, seen_index in seen_names.items():
-                    # Check if names are very similar
-                    similarity = self._calculate_string_similarity(prop["name"], seen_name)
-                    if similarity > 0.8:
-                        # It's likely a duplicate, check platform
-                        if unique_properties[seen_index].get("platform") != prop.get("platform"):
-                            # Different platforms, update the existing entry
-                            unique_properties[seen_index]["other_platforms"] = unique_properties[seen_index].get("other_platforms", [])
-                            unique_properties[seen_index]["other_platforms"].append({
-                                "platform": prop.get("platform"),
-                                "url": prop.get("url"),
-                                "price": prop.get("price")
-                            })
-                        duplicate = True
-                        break
+                name = prop["name"].lower()
+                ngrams = None
+                match = seen_names_exact.get(name)
+                if match is None:
+                    ngrams = _name_ngrams(name)
+                    match = self._find_similar_name(name, ngrams, seen_names, name_blocks)
                 
-                if not duplicate:
-                    seen_names[prop["name"]] = len(unique_properties)
+                if match is not None:
+                    # It's likely a duplicate, check platform
+                    seen_index = seen_indices[match]
+                    if unique_properties[seen_index].get("platform") != prop.get("platform"):
+                        # Different platforms, update the existing entry
+                        unique_properties[seen_index]["other_platforms"] = unique_properties[seen_index].get("other_platforms", [])
+                        unique_properties[seen_index]["other_platforms"].append({
+                            "platform": prop.get("platform"),
+                            "url": prop.get("url"),
+                            "price": prop.get("price")
+                        })
+                else:
+                    for ngram in ngrams:
+                        name_blocks[ngram].append(len(seen_names))
+                    seen_names_exact[name] = len(seen_names)
+                    seen_names.append(name)
+                    seen_indices.append(len(unique_properties))
                     unique_properties.append(prop)
         
         return unique_properties
     
-    def _calculate_string_similarity(self, str1, str2):
-        """Calculate similarity between two strings using Levenshtein distance"""
+    def _find_similar_name(self, name, ngrams, seen_names, name_blocks, threshold=0.8):
+        """
+        Find the first seen name that is very similar to the given one
+        
+        Only names sharing an n-gram are compared. For a similarity above 0.8
+        the two names always share at least one trigram, so no match is lost.
+        
+        Args:
+            name: Lowercased property name
+            ngrams: N-grams of the name, from _name_ngrams
+            seen_names: Lowercased names of previously seen properties
+            name_blocks: Mapping of n-gram -> positions in seen_names
+            threshold: Minimum similarity (exclusive) for a match
+            
+        Returns:
+            Position of the matching name in seen_names, or None if there is no match
+        """
+        candidates = sorted({position for ngram in ngrams for position in name_blocks.get(ngram, ())})
+        for position in candidates:
+            if self._calculate_string_similarity(name, seen_names[position], score_cutoff=threshold) > threshold:
+                return position
+        return None
+    
+    def _calculate_string_similarity(self, str1, str2, score_cutoff=0):
+        """
+        Calculate similarity between two strings using Levenshtein distance
+        
+        Args:
+            str1: First string
+            str2: Second string
+            score_cutoff: Similarities below this value are returned as 0
+            
+        Returns:
+            Similarity score (0-1)
+        """
         if not str1 or not str2:
             return 0
         
@@ -482,29 +1177,36 @@ class BookingPlatformsDiscovery:
         s1 = str1.lower()
         s2 = str2.lower()
         
-        # Simple Levenshtein implementation
-        rows = len(s1) + 1
-        cols = len(s2) + 1
-        dist = [[0 for x in range(cols)] for x in range(rows)]
-        
-        for i in range(rows):
-            dist[i][0] = i
+        if RAPIDFUZZ_AVAILABLE:
+            return Levenshtein.normalized_similarity(s1, s2, score_cutoff=score_cutoff)
         
-        for i in range(cols):
-            dist[0][i] = i
+        # Every character of length difference costs at least one edit
+        max_len = max(len(s1), len(s2))
+        if 1 - abs(len(s1) - len(s2)) / max_len < score_cutoff:
+            return 0
         
-        for i in range(1, rows):
-            for j in range(1, cols):
-                cost = 0 if s1[i-1] == s2[j-1] else 1
-                dist[i][j] = min(
-                    dist[i-1][j] + 1,      # deletion
-                    dist[i][j-1] + 1,      # insertion
-                    dist[i-1][j-1] + cost  # substitution
-                )
+        if NUMBA_AVAILABLE:
+            distance = levenshtein_numba(code_points(s1), code_points(s2))
+        else:
+            # Simple Levenshtein implementation, keeping only two rows of the matrix
+            cols = len(s2) + 1
+            prev = list(range(cols))
+            curr = [0] * cols
+            
+            for i in range(1, len(s1) + 1):
+                curr[0] = i
+                for j in range(1, cols):
+                    cost = 0 if s1[i-1] == s2[j-1] else 1
+                    curr[j] = min(
+                        prev[j] + 1,        # deletion
+                        curr[j-1] + 1,      # insertion
+                        prev[j-1] + cost    # substitution
+                    )
+                prev, curr = curr, prev
+            distance = prev[cols-1]
         
-        max_len = max(len(s1), len(s2))
-        similarity = 1 - (dist[rows-1][cols-1] / max_len) if max_len > 0 else 0
-        return similarity
+        similarity = 1 - (distance / max_len)
+        return similarity if similarity >= score_cutoff else 0
 
     def search_twitter_for_rentals(self, location, search_term=None):
         """
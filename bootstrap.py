@@ -8,16 +8,30 @@ and provides fallbacks where needed.
 
 import os
 import sys
+import json
+import time
 import logging
 import importlib
 from datetime import datetime
 
+# Library status is re-probed at most once a day
+STATUS_CACHE_FILE = os.path.join('config', 'bootstrap.json')
+STATUS_CACHE_TTL = 24 * 60 * 60
+
+_DIRS_READY = False
+
+def ensure_directories():
+    """Create the application directories once per process"""
+    global _DIRS_READY
+    if _DIRS_READY:
+        return
+    
+    for directory in ('logs', 'data', 'exports', 'config', 'maps'):
+        os.makedirs(directory, exist_ok=True)
+    _DIRS_READY = True
+
 # Create necessary directories
-os.makedirs('logs', exist_ok=True)
-os.makedirs('data', exist_ok=True)
-os.makedirs('exports', exist_ok=True)
-os.makedirs('config', exist_ok=True)
-os.makedirs('maps', exist_ok=True)
+ensure_directories()
 
 # Setup logging
 try:
@@ -57,44 +71,80 @@ def safe_import(module_name, fallback_message=None):
             logger.warning(f"Failed to import {module_name}")
         return None
 
-# Check and patch libraries
-libraries_status = {}
-
-# Check for tabulate
-tabulate_module = safe_import('tabulate', "Table formatting will be basic")
-libraries_status['tabulate'] = tabulate_module is not None
-
-# Check for rich components
-rich_module = safe_import('rich', "Rich UI features will be limited")
-libraries_status['rich'] = rich_module is not None
+def check_libraries():
+    """Probe the optional libraries and return their availability"""
+    status = {}
+    
+    # Check for tabulate
+    tabulate_module = safe_import('tabulate', "Table formatting will be basic")
+    status['tabulate'] = tabulate_module is not None
+    
+    # Check for rich components
+    rich_module = safe_import('rich', "Rich UI features will be limited")
+    status['rich'] = rich_module is not None
+    
+    if status['rich']:
+        try:
+            from rich.console import Console
+            from rich.table import Table
+            from rich.progress import track
+            status['rich_components'] = True
+        except ImportError:
+            status['rich_components'] = False
+            logger.warning("Rich components not fully available")
+    else:
+        status['rich_components'] = False
+    
+    # Check for folium
+    folium_module = safe_import('folium', "Map visualization will not be available")
+    status['folium'] = folium_module is not None
+    
+    # Check for pandas
+    pandas_module = safe_import('pandas', "Data handling will be limited")
+    status['pandas'] = pandas_module is not None
+    
+    # Check for database support
+    psycopg2_module = safe_import('psycopg2', "PostgreSQL support not available")
+    status['postgresql'] = psycopg2_module is not None
+    
+    return status
 
-if libraries_status['rich']:
+def load_cached_status():
+    """Return the library status saved by a recent run of this interpreter, or None"""
     try:
-        from rich.console import Console
-        from rich.table import Table
-        from rich.progress import track
-        libraries_status['rich_components'] = True
-    except ImportError:
-        libraries_status['rich_components'] = False
-        logger.warning("Rich components not fully available")
-else:
-    libraries_status['rich_components'] = False
-
-# Check for folium
-folium_module = safe_import('folium', "Map visualization will not be available")
-libraries_status['folium'] = folium_module is not None
+        if time.time() - os.path.getmtime(STATUS_CACHE_FILE) > STATUS_CACHE_TTL:
+            return None
+        with open(STATUS_CACHE_FILE, 'r', encoding='utf-8') as f:
+            cached = json.load(f)
+    except (OSError, ValueError):
+        return None
+    
+    # Installing into another interpreter or venv changes what is available
+    if cached.get('python') != sys.executable:
+        return None
+    return cached.get('libraries')
 
-# Check for pandas
-pandas_module = safe_import('pandas', "Data handling will be limited")
-libraries_status['pandas'] = pandas_module is not None
+def save_cached_status(status):
+    """Save the library status for later runs"""
+    try:
+        with open(STATUS_CACHE_FILE, 'w', encoding='utf-8') as f:
+            json.dump({'python': sys.executable, 'libraries': status}, f, indent=2)
+    except OSError as e:
+        logger.warning(f"Could not save library status: {e}")
 
-# Check for database support
-psycopg2_module = safe_import('psycopg2', "PostgreSQL support not available")
-libraries_status['postgresql'] = psycopg2_module is not None
+# Check and patch libraries
+libraries_status = load_cached_status()
+if libraries_status is None:
+    libraries_status = check_libraries()
+    save_cached_status(libraries_status)
 
 # Print bootstrap summary
 def print_status_table():
     """Print a summary table of library status"""
+    # Nobody reads the table when output is piped or logged
+    if not sys.stdout.isatty() and not os.environ.get("MR_BOOTSTRAP_VERBOSE"):
+        return
+    
     try:
         from rich.console import Console
         from rich.table import Table
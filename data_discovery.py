@@ -10,32 +10,474 @@ import os
 import sys
 import time
 import json
+import asyncio
+import hashlib
 import logging
+import unicodedata
+import sqlite3
+import threading
 import concurrent.futures
-from typing import Dict, List, Any, Tuple, Optional
+from array import array
+from collections import OrderedDict, defaultdict, deque
+from functools import lru_cache
+from itertools import islice
+from typing import Dict, List, Any, Tuple, Optional, Union
 from datetime import datetime, timedelta
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 import math
 
+try:
+    import numpy as np
+    NUMPY_AVAILABLE = True
+except ImportError:
+    NUMPY_AVAILABLE = False
+
+try:
+    from scipy.spatial import cKDTree
+    SCIPY_AVAILABLE = True
+except ImportError:
+    SCIPY_AVAILABLE = False
+
+try:
+    from numba import njit
+    NUMBA_AVAILABLE = True
+except ImportError:
+    NUMBA_AVAILABLE = False
+
+try:
+    import redis
+    REDIS_AVAILABLE = True
+except ImportError:
+    REDIS_AVAILABLE = False
+
+try:
+    from rapidfuzz.distance import Levenshtein
+    RAPIDFUZZ_AVAILABLE = True
+except ImportError:
+    RAPIDFUZZ_AVAILABLE = False
+
+# Without rapidfuzz, name similarity uses the compiled Levenshtein of the booking platforms module
+if NUMBA_AVAILABLE and not RAPIDFUZZ_AVAILABLE:
+    from booking_platforms_discovery import levenshtein_numba, code_points
+
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
+try:
+    import ijson
+    IJSON_AVAILABLE = True
+except ImportError:
+    IJSON_AVAILABLE = False
+
 # Initialize logger
 logger = logging.getLogger("data_discovery")
 
+# Data sources: source key -> (scraper method, display name)
+LOCATION_SOURCES = [
+    ("google_places", "_search_google_places", "Google Places"),
+    ("openstreetmap", "_search_openstreetmap", "OpenStreetMap"),
+    ("booking", "_search_booking_com", "Booking.com"),
+    ("tripadvisor", "_search_tripadvisor", "TripAdvisor"),
+    ("expedia", "_search_expedia", "Expedia")
+]
+NAME_SOURCES = [
+    ("google_places", "_search_google_places_by_name", "Google Places"),
+    ("openstreetmap", "_search_openstreetmap_by_name", "OpenStreetMap")
+]
+
+# Seconds to keep cached source results; place data changes slower than prices
+DEFAULT_CACHE_TTL = 3600
+SOURCE_CACHE_TTL = {
+    "google_places": 7200,
+    "openstreetmap": 86400,
+    "booking": 1800,
+    "tripadvisor": 3600,
+    "expedia": 1800
+}
+
+EARTH_RADIUS_KM = 6371
+DUPLICATE_DISTANCE_KM = 0.05  # Hotels closer than 50 meters are the same place
+# Flat-earth distances are only used as a prefilter below this latitude
+# cosine (about 6 km from a pole), where meridians converge too fast
+APPROX_MIN_COS_LAT = 1e-3
+
+# Geocoded locations kept in memory, and seconds to keep them in the results cache
+GEOCODE_CACHE_SIZE = 4096
+GEOCODE_CACHE_TTL = 30 * 86400
+
+# Nominatim allows at most one request per second per application
+NOMINATIM_URL = "https://nominatim.openstreetmap.org/"
+NOMINATIM_MIN_INTERVAL = 1.0
+
+# Sources backed by OpenStreetMap services: searched one at a time, within the Nominatim rate limit
+RATE_LIMITED_SOURCES = ("openstreetmap",)
+
+# SQLite file that keeps geocoded locations across restarts
+GEOCODE_DB_PATH = os.path.join('data', 'geocode_cache.db')
+
+# Imported column names for each hotel field, most preferred first
+IMPORT_FIELD_MAPPING = {
+    # Common CSV headers to our internal format
+    'name': ['name', 'hotel_name', 'property_name', 'title'],
+    'address': ['address', 'hotel_address', 'property_address', 'street_address'],
+    'city': ['city', 'town', 'municipality'],
+    'country': ['country', 'country_name'],
+    'latitude': ['latitude', 'lat', 'y', 'latitude_degrees'],
+    'longitude': ['longitude', 'lng', 'lon', 'x', 'longitude_degrees'],
+    'phone': ['phone', 'telephone', 'contact_phone', 'phone_number'],
+    'email': ['email', 'contact_email', 'email_address'],
+    'website': ['website', 'url', 'web_address', 'hotel_website'],
+    'stars': ['stars', 'rating', 'hotel_stars', 'star_rating'],
+    'price_range': ['price_range', 'price', 'price_category'],
+    'facilities': ['facilities', 'amenities', 'services'],
+    'legal_status': ['legal_status', 'status', 'hotel_status'],
+    'data_source': ['data_source', 'source']
+}
+
+# Column name -> (hotel field, preference), so a record is mapped in one pass
+IMPORT_FIELD_ALIASES = {
+    name: (our_field, rank)
+    for our_field, possible_names in IMPORT_FIELD_MAPPING.items()
+    for rank, name in enumerate(possible_names)
+}
+
+# JSON imports larger than this are parsed incrementally (with ijson)
+JSON_STREAM_THRESHOLD = 256 * 1024 * 1024
+
+# Hotels per bulk database write; keeps each transaction and statement bounded
+SAVE_BATCH_SIZE = 1000
+
+# Bookkeeping fields that are not reported as hotel data changes
+DIFF_EXCLUDED_FIELDS = frozenset({'id', 'last_updated'})
+
+def _unit_sphere_points(lats, lngs):
+    """Project latitude/longitude degrees onto the unit sphere as an (n, 3) array"""
+    lat = np.radians(np.asarray(lats, dtype=float))
+    lng = np.radians(np.asarray(lngs, dtype=float))
+    cos_lat = np.cos(lat)
+    return np.column_stack([cos_lat * np.cos(lng), cos_lat * np.sin(lng), np.sin(lat)])
+
+def _coordinate_rows(lats, lngs):
+    """
+    Stack latitude/longitude degrees into an (n, 2) float array
+    
+    Raises:
+        ValueError: If a coordinate is not a finite, in-range number
+    """
+    coords = np.column_stack([np.asarray(lats, dtype=float), np.asarray(lngs, dtype=float)])
+    if not (np.all(np.abs(coords[:, 0]) <= 90) and np.all(np.abs(coords[:, 1]) <= 180)):
+        raise ValueError("Coordinates out of range")
+    return coords
+
+if NUMBA_AVAILABLE:
+    @njit(cache=True)
+    def _haversine_nb(lat1, lon1, lat2, lon2):
+        """Compiled body of _haversine_cached"""
+        lat1, lon1, lat2, lon2 = math.radians(lat1), math.radians(lon1), math.radians(lat2), math.radians(lon2)
+        a = math.sin((lat2 - lat1) / 2)**2 + math.cos(lat1) * math.cos(lat2) * math.sin((lon2 - lon1) / 2)**2
+        return 2 * math.atan2(math.sqrt(a), math.sqrt(1 - a)) * EARTH_RADIUS_KM
+
+@lru_cache(maxsize=1 << 16)
+def _haversine_cached(lat1, lon1, lat2, lon2):
+    """
+    Haversine distance in kilometers between points given in millionths of
+    a degree, memoized because discovery keeps comparing the same places
+    """
+    lat1, lon1, lat2, lon2 = lat1 / 1e6, lon1 / 1e6, lat2 / 1e6, lon2 / 1e6
+    if NUMBA_AVAILABLE:
+        return _haversine_nb(lat1, lon1, lat2, lon2)
+    
+    # Convert decimal degrees to radians
+    lat1, lon1, lat2, lon2 = map(math.radians, [lat1, lon1, lat2, lon2])
+    
+    # Haversine formula
+    dlon = lon2 - lon1
+    dlat = lat2 - lat1
+    a = math.sin(dlat/2)**2 + math.cos(lat1) * math.cos(lat2) * math.sin(dlon/2)**2
+    c = 2 * math.atan2(math.sqrt(a), math.sqrt(1 - a))
+    
+    return c * EARTH_RADIUS_KM
+
+@lru_cache(maxsize=1024)
+def _decode_json_object(text):
+    """
+    Decode a JSON object string, memoized for fields such as additional_info
+    that are read again on every detail or update run; callers must not
+    modify the returned dict
+    """
+    try:
+        decoded = orjson.loads(text) if ORJSON_AVAILABLE else json.loads(text)
+    except (TypeError, ValueError):
+        return {}
+    
+    return decoded if isinstance(decoded, dict) else {}
+
+@lru_cache(maxsize=65536)
+def _name_key(name):
+    """
+    Normalize a hotel name for comparison: compatibility forms (full-width,
+    ligatures, Arabic presentation forms) are folded, accents and other
+    combining marks are dropped and case is folded, so "Café Royal" and
+    "CAFE ROYAL" compare equal. Letters of every script are kept
+    """
+    decomposed = unicodedata.normalize('NFKD', name)
+    return "".join(ch for ch in decomposed if not unicodedata.combining(ch)).casefold()
+
+def _chord_length(distance_km):
+    """Straight-line distance on the unit sphere between points distance_km apart on Earth"""
+    return 2 * math.sin(distance_km / EARTH_RADIUS_KM / 2)
+
+def _grid_cell(lat, lng, cell_size):
+    """Cube of side cell_size on the unit sphere grid that holds a latitude/longitude point"""
+    lat, lng = math.radians(float(lat)), math.radians(float(lng))
+    cos_lat = math.cos(lat)
+    return (math.floor(cos_lat * math.cos(lng) / cell_size),
+            math.floor(cos_lat * math.sin(lng) / cell_size),
+            math.floor(math.sin(lat) / cell_size))
+
+def _neighbour_cells(cell):
+    """A grid cell and the 26 cells around it"""
+    x, y, z = cell
+    return [(x + dx, y + dy, z + dz) for dx in (-1, 0, 1) for dy in (-1, 0, 1) for dz in (-1, 0, 1)]
+
+class RateLimiter:
+    """Space out calls from any number of threads by a minimum interval"""
+    
+    def __init__(self, min_interval: float):
+        """
+        Initialize the limiter
+        
+        Args:
+            min_interval (float): Minimum seconds between the start of two calls
+        """
+        self.min_interval = min_interval
+        self.lock = threading.Lock()
+        self.next_call = 0.0
+    
+    def reserve(self) -> float:
+        """
+        Reserve the next free slot
+        
+        Returns:
+            float: Seconds the caller must wait before starting its call
+        """
+        with self.lock:
+            now = time.monotonic()
+            delay = max(0.0, self.next_call - now)
+            # Slots are handed out in order, so waiting callers queue up
+            self.next_call = max(now, self.next_call) + self.min_interval
+        return delay
+    
+    def wait(self):
+        """Block until the caller may start its call"""
+        time.sleep(self.reserve())
+
+class RateLimitedAdapter(HTTPAdapter):
+    """HTTPAdapter that waits for a shared RateLimiter before sending each request"""
+    
+    def __init__(self, limiter: RateLimiter, **kwargs):
+        self.limiter = limiter
+        super().__init__(**kwargs)
+    
+    def send(self, request, **kwargs):
+        self.limiter.wait()
+        return super().send(request, **kwargs)
+
+class HotelIndex:
+    """
+    Names and locations of a growing list of hotels, for duplicate checks
+    
+    Locations are held in a KD-tree (with scipy) that is rebuilt once
+    rebuild_every hotels have been added since the last build; the hotels
+    added after the build are checked directly. Without scipy, locations
+    are bucketed by grid cell instead and only nearby cells are checked.
+    """
+    
+    def __init__(self, hotels: List[Dict] = None, rebuild_every: int = 64):
+        """
+        Initialize the index
+        
+        Args:
+            hotels (List[Dict], optional): Hotels to index
+            rebuild_every (int): Number of new locations that triggers a tree rebuild
+        """
+        self.names = set()
+        self.lats = []
+        self.lngs = []
+        self.rebuild_every = rebuild_every
+        self.tree = None
+        self.tree_size = 0  # Locations covered by the tree
+        # Grid cell -> (latitudes, longitudes), used when there is no tree
+        self.cell_size = _chord_length(DUPLICATE_DISTANCE_KM)
+        self.cells = None if SCIPY_AVAILABLE else defaultdict(lambda: ([], []))
+        
+        for hotel in hotels or []:
+            self.add(hotel, rebuild=False)
+        self._rebuild_tree()
+    
+    def add(self, hotel: Dict, rebuild: bool = True):
+        """
+        Add a hotel to the index
+        
+        Args:
+            hotel (Dict): Hotel data
+            rebuild (bool): Rebuild the tree if enough locations were added
+        """
+        self.names.add(_name_key(hotel.get('name', '')))
+        
+        lat = hotel.get('latitude')
+        lng = hotel.get('longitude')
+        if not (lat and lng):
+            return
+        
+        # Scraped coordinates may be text such as 'N/A'; such locations are not indexed
+        try:
+            lat, lng = float(lat), float(lng)
+        except (TypeError, ValueError):
+            return
+        if not (math.isfinite(lat) and math.isfinite(lng)):
+            return
+        
+        self.lats.append(lat)
+        self.lngs.append(lng)
+        if self.cells is not None:
+            cell_lats, cell_lngs = self.cells[_grid_cell(lat, lng, self.cell_size)]
+            cell_lats.append(lat)
+            cell_lngs.append(lng)
+        elif rebuild and len(self.lats) - self.tree_size >= self.rebuild_every:
+            self._rebuild_tree()
+    
+    def nearby(self, lat: float, lng: float) -> Tuple[List[float], List[float]]:
+        """
+        Get the indexed locations in the grid cells around a point
+        
+        Args:
+            lat (float): Latitude of the point
+            lng (float): Longitude of the point
+            
+        Returns:
+            Tuple[List[float], List[float]]: Latitudes and longitudes of every location
+            within DUPLICATE_DISTANCE_KM of the point, and possibly some further away
+        """
+        lats, lngs = [], []
+        for cell in _neighbour_cells(_grid_cell(lat, lng, self.cell_size)):
+            if cell in self.cells:
+                cell_lats, cell_lngs = self.cells[cell]
+                lats.extend(cell_lats)
+                lngs.extend(cell_lngs)
+        return lats, lngs
+    
+    def _rebuild_tree(self):
+        """Build the KD-tree over all indexed locations"""
+        if SCIPY_AVAILABLE and len(self.lats) > self.tree_size:
+            self.tree = cKDTree(_unit_sphere_points(self.lats, self.lngs))
+            self.tree_size = len(self.lats)
+
 class DataDiscovery:
     """Class for hotel discovery and data collection operations"""
     
-    def __init__(self, db=None, scraper=None):
+    def __init__(self, db=None, scraper=None, config: Dict = None):
         """
         Initialize the data discovery module
         
         Args:
             db: Database instance
             scraper: HotelScraper instance
+            config (Dict, optional): Settings, e.g. redis_url and cache_ttl for the results cache,
+                geocode_db_path for the persistent geocode cache (None disables it)
         """
         self.db = db
         self.scraper = scraper
+        self.config = config or {}
+        # Sources are queried concurrently; set to 1 for a scraper that is not thread-safe
+        self.max_source_workers = 5
+        # City scan subdivisions searched at the same time (each one queries its sources concurrently);
+        # rate-limited sources still run one search at a time across all of them
+        self.max_area_workers = 8
+        self.cache = self._create_cache()
+        self.cache_stats = {'hits': 0, 'misses': 0}
+        self.geocode_cache = OrderedDict()  # Normalized location -> (latitude, longitude), least recent first
+        self.geocode_db_lock = threading.Lock()
+        self.geocode_db = self._create_geocode_db()
+        # Shared by every Nominatim request, whichever thread makes it
+        self.nominatim_limiter = RateLimiter(NOMINATIM_MIN_INTERVAL)
+        self.source_semaphores = {source: threading.Semaphore(1) for source in RATE_LIMITED_SOURCES}
+        self.session = self._create_session()
+        # Let a scraper without its own session reuse the pooled connections
+        if self.scraper is not None and getattr(self.scraper, 'session', None) is None:
+            try:
+                self.scraper.session = self.session
+            except AttributeError:
+                pass
+    
+    def _create_session(self):
+        """Create a keep-alive HTTP session with connection pooling and retries"""
+        session = requests.Session()
+        # Contact information (required by Nominatim)
+        session.headers.update({"User-Agent": "Map_researcher0.4"})
+        adapter = HTTPAdapter(
+            pool_connections=20,
+            pool_maxsize=50,
+            max_retries=Retry(total=3, backoff_factor=0.3, status_forcelist=[429, 500, 502, 503, 504])
+        )
+        session.mount("https://", adapter)
+        session.mount("http://", adapter)
+        # Requests to Nominatim (also those of a scraper using this session) wait for the rate limit
+        session.mount(NOMINATIM_URL, RateLimitedAdapter(
+            self.nominatim_limiter,
+            max_retries=Retry(total=3, backoff_factor=1, status_forcelist=[429, 500, 502, 503, 504])
+        ))
+        return session
+    
+    def _create_cache(self):
+        """Connect to the Redis results cache if one is configured"""
+        if not (REDIS_AVAILABLE and self.config.get('redis_url')):
+            return None
+        
+        try:
+            return redis.Redis.from_url(self.config['redis_url'])
+        except Exception as e:
+            logger.warning(f"Redis cache not available: {e}")
+            return None
+    
+    def _create_geocode_db(self):
+        """Open the persistent geocode cache and load its most recent entries into memory"""
+        path = self.config.get('geocode_db_path', GEOCODE_DB_PATH)
+        if not path:
+            return None
+        
+        try:
+            directory = os.path.dirname(path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            # Lookups may come from worker threads; access is serialized with geocode_db_lock
+            conn = sqlite3.connect(path, check_same_thread=False)
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS geocode_cache "
+                "(q TEXT PRIMARY KEY, lat REAL, lng REAL, fetched_at INTEGER)"
+            )
+            conn.commit()
+            
+            rows = conn.execute(
+                "SELECT q, lat, lng FROM geocode_cache WHERE fetched_at > ? "
+                "ORDER BY fetched_at DESC LIMIT ?",
+                (int(time.time()) - GEOCODE_CACHE_TTL, GEOCODE_CACHE_SIZE)
+            ).fetchall()
+            # Oldest first, so the most recent entries are the last to be evicted
+            for q, lat, lng in reversed(rows):
+                self.geocode_cache[q] = (lat, lng)
+            return conn
+        except Exception as e:
+            logger.warning(f"Geocode cache database not available: {e}")
+            return None
     
     def discover_by_location(self, location: str, radius: int = 5000, language: str = "en", 
-                             data_sources: List[str] = None) -> List[Dict]:
+                             data_sources: List[str] = None, stop_after: int = None) -> List[Dict]:
         """
         Comprehensive discovery by location
         
@@ -44,6 +486,7 @@ class DataDiscovery:
             radius (int): Search radius in meters
             language (str): Search language (en, ar)
             data_sources (List[str]): List of data sources to use
+            stop_after (int): Stop waiting for slower sources once this many hotels were found
             
         Returns:
             List[Dict]: List of discovered hotels
@@ -54,67 +497,273 @@ class DataDiscovery:
         if data_sources is None:
             data_sources = ["google_places", "openstreetmap", "booking", "tripadvisor", "expedia"]
         
+        # Query all selected sources the scraper implements at the same time
+        searches = self._source_searches(LOCATION_SOURCES, data_sources, (location, radius, language))
+        results = self._run_source_searches(searches, stop_after)
+        
+        results = self._match_hotels(results)
+        
+        logger.info(f"Discovery complete. Found {len(results)} unique hotels")
+        return results
+    
+    async def discover_by_location_async(self, location: str, radius: int = 5000, language: str = "en",
+                                         data_sources: List[str] = None, stop_after: int = None) -> List[Dict]:
+        """
+        Comprehensive discovery by location, for callers running an event loop
+        
+        Uses the scraper's coroutine search methods (e.g. _search_google_places_async)
+        where it has them; other sources run in the event loop's thread pool.
+        
+        Args:
+            location (str): Location name or coordinates
+            radius (int): Search radius in meters
+            language (str): Search language (en, ar)
+            data_sources (List[str]): List of data sources to use
+            stop_after (int): Cancel slower sources once this many hotels were found
+            
+        Returns:
+            List[Dict]: List of discovered hotels
+        """
+        logger.info(f"Starting location discovery for: {location}, radius: {radius}m")
+        
+        # Set default data sources if not provided
+        if data_sources is None:
+            data_sources = ["google_places", "openstreetmap", "booking", "tripadvisor", "expedia"]
+        
+        searches = self._source_searches(LOCATION_SOURCES, data_sources, (location, radius, language), prefer_async=True)
+        results = await self._run_source_searches_async(searches, stop_after)
+        
+        results = self._match_hotels(results)
+        
+        logger.info(f"Discovery complete. Found {len(results)} unique hotels")
+        return results
+    
+    def _source_searches(self, sources: List[Tuple[str, str, str]], data_sources: List[str], args: tuple,
+                         prefer_async: bool = False) -> List[Tuple[str, Any, tuple]]:
+        """
+        Pick the scraper searches to run for the selected data sources
+        
+        Args:
+            sources (List[Tuple]): LOCATION_SOURCES or NAME_SOURCES
+            data_sources (List[str]): Selected data sources
+            args (tuple): Arguments for every search method
+            prefer_async (bool): Use the scraper's "<method>_async" coroutine where it has one
+            
+        Returns:
+            List[Tuple]: (source, display name, search function, arguments) per source
+        """
+        searches = []
+        if not self.scraper:
+            return searches
+        
+        for source, method, label in sources:
+            if source not in data_sources:
+                continue
+            
+            search = getattr(self.scraper, f"{method}_async", None) if prefer_async else None
+            search = search or getattr(self.scraper, method, None)
+            if search:
+                searches.append((source, label, search, args))
+        
+        return searches
+    
+    def _run_source_searches(self, searches: List[Tuple[str, Any, tuple]], stop_after: int = None) -> List[Dict]:
+        """
+        Run independent data source searches concurrently
+        
+        Args:
+            searches (List[Tuple]): (source, display name, search function, arguments) per source
+            stop_after (int): Stop waiting for the remaining sources once this many hotels were found
+            
+        Returns:
+            List[Dict]: Combined results, in the order the sources were given
+        """
+        source_results = [self._get_cached_results(source, search, args) for source, _, search, args in searches]
+        pending = [index for index, cached in enumerate(source_results) if cached is None]
+        found = sum(len(results) for results in source_results if results)
+        if not pending or (stop_after is not None and found >= stop_after):
+            return [hotel for results in source_results if results for hotel in results]
+        
+        executor = concurrent.futures.ThreadPoolExecutor(max_workers=min(len(pending), self.max_source_workers))
+        futures = {}
+        try:
+            for index in pending:
+                source, label, search, args = searches[index]
+                logger.info(f"Searching {label}")
+                futures[executor.submit(self._call_source, source, search, *args)] = index
+            
+            for future in concurrent.futures.as_completed(futures):
+                index = futures[future]
+                source, label, search, args = searches[index]
+                try:
+                    source_results[index] = future.result()
+                    logger.info(f"Found {len(source_results[index])} hotels from {label}")
+                    self._cache_results(source, search, args, source_results[index])
+                except Exception as e:
+                    source_results[index] = []
+                    logger.error(f"Error searching {label}: {e}")
+                
+                found += len(source_results[index])
+                if stop_after is not None and found >= stop_after:
+                    logger.info(f"Found {found} hotels, not waiting for the remaining sources")
+                    break
+        finally:
+            # Searches that have not started are dropped; running ones finish in the background
+            for future in futures:
+                future.cancel()
+            executor.shutdown(wait=False)
+        
+        # Keep source order so duplicate removal keeps the same hotel every run
+        return [hotel for results in source_results if results for hotel in results]
+    
+    async def _run_source_searches_async(self, searches: List[Tuple[str, Any, tuple]],
+                                         stop_after: int = None) -> List[Dict]:
+        """
+        Run independent data source searches concurrently in the running event loop
+        
+        Args:
+            searches (List[Tuple]): (source, display name, search function, arguments) per source
+            stop_after (int): Cancel the remaining searches once this many hotels were found
+            
+        Returns:
+            List[Dict]: Combined results, in the order the sources were given
+        """
+        loop = asyncio.get_running_loop()
+        
+        async def call(search, args):
+            if asyncio.iscoroutinefunction(search):
+                return await search(*args)
+            return await loop.run_in_executor(None, search, *args)
+        
+        async def run(source, label, search, args):
+            cached = self._get_cached_results(source, search, args)
+            if cached is not None:
+                return cached
+            
+            logger.info(f"Searching {label}")
+            semaphore = self.source_semaphores.get(source)
+            if semaphore is None:
+                found = await call(search, args)
+            else:
+                # Poll instead of blocking, so the event loop keeps running other searches
+                while not semaphore.acquire(blocking=False):
+                    await asyncio.sleep(0.05)
+                try:
+                    await asyncio.sleep(self._source_delay())
+                    found = await call(search, args)
+                finally:
+                    semaphore.release()
+            
+            logger.info(f"Found {len(found)} hotels from {label}")
+            self._cache_results(source, search, args, found)
+            return found
+        
+        tasks = [asyncio.ensure_future(run(*search)) for search in searches]
+        pending = set(tasks)
+        found = 0
+        while pending:
+            done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+            found += sum(len(task.result()) for task in done if task.exception() is None)
+            if stop_after is not None and found >= stop_after:
+                logger.info(f"Found {found} hotels, cancelling the remaining sources")
+                for task in pending:
+                    task.cancel()
+                break
+        
         results = []
+        for (_, label, _, _), task in zip(searches, tasks):
+            if task in pending:
+                continue
+            
+            if task.exception() is not None:
+                logger.error(f"Error searching {label}: {task.exception()}")
+                continue
+            
+            results.extend(task.result())
         
-        # Google Places API (if available and selected)
-        if "google_places" in data_sources and self.scraper and hasattr(self.scraper, '_search_google_places'):
-            try:
-                logger.info("Searching Google Places API")
-                google_results = self.scraper._search_google_places(location, radius, language)
-                results.extend(google_results)
-                logger.info(f"Found {len(google_results)} hotels from Google Places")
-            except Exception as e:
-                logger.error(f"Error searching Google Places: {e}")
+        return results
+    
+    def _source_delay(self) -> float:
+        """Reserve a Nominatim slot for a rate-limited source search and return the seconds to wait"""
+        # Requests made through the shared session already wait in its adapter
+        if getattr(self.scraper, 'session', None) is self.session:
+            return 0.0
+        return self.nominatim_limiter.reserve()
+    
+    def _call_source(self, source: str, search, *args):
+        """
+        Run one source search, one at a time and spaced out for rate-limited sources
         
-        # OpenStreetMap (if selected)
-        if "openstreetmap" in data_sources and self.scraper and hasattr(self.scraper, '_search_openstreetmap'):
-            try:
-                logger.info("Searching OpenStreetMap")
-                osm_results = self.scraper._search_openstreetmap(location, radius, language)
-                results.extend(osm_results)
-                logger.info(f"Found {len(osm_results)} hotels from OpenStreetMap")
-            except Exception as e:
-                logger.error(f"Error searching OpenStreetMap: {e}")
+        Args:
+            source (str): Source key
+            search: Search function
+            *args: Search arguments
+            
+        Returns:
+            The search results
+        """
+        semaphore = self.source_semaphores.get(source)
+        if semaphore is None:
+            return search(*args)
         
-        # Booking.com (if selected)
-        if "booking" in data_sources and self.scraper and hasattr(self.scraper, '_search_booking_com'):
-            try:
-                logger.info("Searching Booking.com")
-                booking_results = self.scraper._search_booking_com(location, radius, language)
-                results.extend(booking_results)
-                logger.info(f"Found {len(booking_results)} hotels from Booking.com")
-            except Exception as e:
-                logger.error(f"Error searching Booking.com: {e}")
-                # If the method doesn't exist yet, log a message
-                if not hasattr(self.scraper, '_search_booking_com'):
-                    logger.info("Booking.com search not implemented yet")
+        with semaphore:
+            time.sleep(self._source_delay())
+            return search(*args)
+    
+    def _cache_key(self, source: str, search, args: tuple) -> str:
+        """Build the cache key for one source search"""
+        # A coroutine search and its sync counterpart return the same results
+        method = search.__name__
+        if method.endswith("_async"):
+            method = method[:-len("_async")]
+        digest = hashlib.sha256(json.dumps([method, list(args)], default=str).encode("utf-8")).hexdigest()
+        return f"mr:v1:src:{source}:{digest}"
+    
+    def _get_cached_results(self, source: str, search, args: tuple) -> Optional[List[Dict]]:
+        """Return cached results of a source search, or None on a miss or cache error"""
+        if self.cache is None:
+            return None
         
-        # TripAdvisor (if selected)
-        if "tripadvisor" in data_sources and self.scraper and hasattr(self.scraper, '_search_tripadvisor'):
-            try:
-                logger.info("Searching TripAdvisor")
-                tripadvisor_results = self.scraper._search_tripadvisor(location, radius, language)
-                results.extend(tripadvisor_results)
-                logger.info(f"Found {len(tripadvisor_results)} hotels from TripAdvisor")
-            except Exception as e:
-                logger.error(f"Error searching TripAdvisor: {e}")
-                # If the method doesn't exist yet, log a message
-                if not hasattr(self.scraper, '_search_tripadvisor'):
-                    logger.info("TripAdvisor search not implemented yet")
+        try:
+            cached = self.cache.get(self._cache_key(source, search, args))
+        except Exception as e:
+            logger.warning(f"Error reading from cache: {e}")
+            return None
         
-        # Expedia (if selected)
-        if "expedia" in data_sources and self.scraper and hasattr(self.scraper, '_search_expedia'):
-            try:
-                logger.info("Searching Expedia")
-                expedia_results = self.scraper._search_expedia(location, radius, language)
-                results.extend(expedia_results)
-                logger.info(f"Found {len(expedia_results)} hotels from Expedia")
-            except Exception as e:
-                logger.error(f"Error searching Expedia: {e}")
-                # If the method doesn't exist yet, log a message
-                if not hasattr(self.scraper, '_search_expedia'):
-                    logger.info("Expedia search not implemented yet")
+        if not cached:
+            self.cache_stats['misses'] += 1
+            return None
+        
+        self.cache_stats['hits'] += 1
+        logger.info(f"Using cached results for {source}")
+        return orjson.loads(cached) if ORJSON_AVAILABLE else json.loads(cached)
+    
+    def _cache_results(self, source: str, search, args: tuple, results: List[Dict]):
+        """Store the results of a source search in the cache with the source's TTL"""
+        if self.cache is None or not results:
+            return
         
+        ttl = self.config.get('cache_ttl', {}).get(source, SOURCE_CACHE_TTL.get(source, DEFAULT_CACHE_TTL))
+        
+        try:
+            if ORJSON_AVAILABLE:
+                payload = orjson.dumps(results, default=str, option=orjson.OPT_NON_STR_KEYS)
+            else:
+                payload = json.dumps(results, ensure_ascii=False, default=str)
+            self.cache.setex(self._cache_key(source, search, args), ttl, payload)
+        except Exception as e:
+            logger.warning(f"Error writing to cache: {e}")
+    
+    def _match_hotels(self, results: List[Dict]) -> List[Dict]:
+        """
+        Merge hotels found by several sources
+        
+        Args:
+            results (List[Dict]): Hotels from all sources
+            
+        Returns:
+            List[Dict]: List of unique hotels
+        """
         # Apply matching algorithm if scraper has it implemented
         if self.scraper and hasattr(self.scraper, 'enhanced_matching_algorithm'):
             try:
@@ -130,7 +779,6 @@ class DataDiscovery:
             # Use basic duplicate removal
             results = self._remove_duplicates(results)
         
-        logger.info(f"Discovery complete. Found {len(results)} unique hotels")
         return results
     
     def _remove_duplicates(self, hotels: List[Dict]) -> List[Dict]:
@@ -143,12 +791,18 @@ class DataDiscovery:
         Returns:
             List[Dict]: List of unique hotels
         """
+        if SCIPY_AVAILABLE:
+            return self._remove_duplicates_indexed(hotels)
+        
         unique_hotels = []
         seen_names = set()
-        seen_coords = set()
+        # Kept latitudes and longitudes bucketed by grid cell; a hotel within
+        # 50 meters is always in the same or an adjacent cell
+        cell_size = _chord_length(DUPLICATE_DISTANCE_KM)
+        seen_cells = defaultdict(lambda: ([], []))
         
         for hotel in hotels:
-            name = hotel.get('name', '').lower()
+            name = _name_key(hotel.get('name', ''))
             lat = hotel.get('latitude')
             lng = hotel.get('longitude')
             
@@ -162,18 +816,70 @@ class DataDiscovery:
                 continue
             
             # Check if we have seen similar coordinates
-            coords_seen = False
-            for seen_lat, seen_lng in seen_coords:
-                # Calculate distance (approximate)
-                dist = self._haversine_distance(lat, lng, seen_lat, seen_lng)
-                if dist < 0.05:  # Within 50 meters
-                    coords_seen = True
-                    break
+            anchor = self._prep_anchor(lat, lng)
+            cell = _grid_cell(lat, lng, cell_size)
+            nearby = [seen_cells[neighbour] for neighbour in _neighbour_cells(cell) if neighbour in seen_cells]
+            coords_seen = any(self._within_distance(anchor, seen_lat, seen_lng, DUPLICATE_DISTANCE_KM)
+                              for seen_lats, seen_lngs in nearby
+                              for seen_lat, seen_lng in zip(seen_lats, seen_lngs))
             
             if not coords_seen:
                 seen_names.add(name)
-                seen_coords.add((lat, lng))
+                seen_lats, seen_lngs = seen_cells[cell]
+                seen_lats.append(lat)
+                seen_lngs.append(lng)
+                unique_hotels.append(hotel)
+        
+        return unique_hotels
+    
+    def _remove_duplicates_indexed(self, hotels: List[Dict]) -> List[Dict]:
+        """
+        Same result as the loop in _remove_duplicates, with the 50 meter
+        check answered by a KD-tree over all hotels instead of a scan of
+        every kept hotel
+        
+        Args:
+            hotels (List[Dict]): List of hotels
+            
+        Returns:
+            List[Dict]: List of unique hotels
+        """
+        located = [hotel.get('name', '') and hotel.get('latitude') and hotel.get('longitude') for hotel in hotels]
+        located_hotels = [hotel for hotel, has_location in zip(hotels, located) if has_location]
+        
+        neighbours = []
+        if located_hotels:
+            points = _unit_sphere_points([h['latitude'] for h in located_hotels],
+                                         [h['longitude'] for h in located_hotels])
+            tree = cKDTree(points)
+            neighbours = tree.query_ball_point(points, r=_chord_length(DUPLICATE_DISTANCE_KM))
+        
+        unique_hotels = []
+        seen_names = set()
+        kept = [False] * len(located_hotels)
+        position = 0
+        
+        for hotel, has_location in zip(hotels, located):
+            # Skip hotels without name or coordinates
+            if not has_location:
                 unique_hotels.append(hotel)
+                continue
+            
+            current = position
+            position += 1
+            
+            # Check if we have seen this name before
+            name = _name_key(hotel['name'])
+            if name in seen_names:
+                continue
+            
+            # Check if a kept hotel is within 50 meters
+            if any(kept[other] for other in neighbours[current]):
+                continue
+            
+            kept[current] = True
+            seen_names.add(name)
+            unique_hotels.append(hotel)
         
         return unique_hotels
     
@@ -188,19 +894,166 @@ class DataDiscovery:
             lon2 (float): Longitude of second point
             
         Returns:
-            float: Distance in kilometers
+            float: Distance in kilometers
+        """
+        # Round to 6 decimals (about 0.1 meter) so repeated pairs share a cache entry
+        return _haversine_cached(round(float(lat1) * 1e6), round(float(lon1) * 1e6),
+                                 round(float(lat2) * 1e6), round(float(lon2) * 1e6))
+    
+    def _prep_anchor(self, lat: float, lon: float) -> Tuple[float, float, float]:
+        """
+        Precompute the trigonometry of a point that is compared against many others
+        
+        Args:
+            lat (float): Latitude of the point
+            lon (float): Longitude of the point
+            
+        Returns:
+            Tuple[float, float, float]: Latitude and longitude in radians, cosine of the latitude
+        """
+        lat_r = math.radians(float(lat))
+        return lat_r, math.radians(float(lon)), math.cos(lat_r)
+    
+    def _haversine_anchor(self, anchor: Tuple[float, float, float], lat2: float, lon2: float) -> float:
+        """
+        Calculate distance from a prepared anchor (see _prep_anchor) to another point
+        
+        Args:
+            anchor (Tuple[float, float, float]): Result of _prep_anchor
+            lat2 (float): Latitude of the other point
+            lon2 (float): Longitude of the other point
+            
+        Returns:
+            float: Distance in kilometers
+        """
+        lat1_r, lon1_r, cos_lat1_r = anchor
+        lat2_r, lon2_r = math.radians(lat2), math.radians(lon2)
+        a = math.sin((lat2_r - lat1_r) / 2)**2 + cos_lat1_r * math.cos(lat2_r) * math.sin((lon2_r - lon1_r) / 2)**2
+        return 2 * EARTH_RADIUS_KM * math.atan2(math.sqrt(a), math.sqrt(1 - a))
+    
+    def _approx_distance_km(self, anchor: Tuple[float, float, float], lat2: float, lon2: float) -> float:
+        """
+        Approximate distance from a prepared anchor using an equirectangular projection
+        
+        Within a fraction of a percent of the Haversine distance for points a few
+        hundred meters apart, at the cost of a single square root.
+        
+        Args:
+            anchor (Tuple[float, float, float]): Result of _prep_anchor
+            lat2 (float): Latitude of the other point
+            lon2 (float): Longitude of the other point
+            
+        Returns:
+            float: Approximate distance in kilometers
+        """
+        lat1_r, lon1_r, cos_lat1_r = anchor
+        # Wrap the longitude difference into [-pi, pi) so the antimeridian is not a wall
+        dlon = (math.radians(lon2) - lon1_r + math.pi) % (2 * math.pi) - math.pi
+        x = dlon * cos_lat1_r
+        y = math.radians(lat2) - lat1_r
+        return EARTH_RADIUS_KM * math.sqrt(x * x + y * y)
+    
+    def _within_distance(self, anchor: Tuple[float, float, float], lat2: float, lon2: float,
+                         distance_km: float) -> bool:
+        """
+        Check whether a point is closer than distance_km to a prepared anchor
+        
+        Points clearly out of range are rejected with _approx_distance_km; only
+        the remaining ones get the exact Haversine distance.
+        
+        Args:
+            anchor (Tuple[float, float, float]): Result of _prep_anchor
+            lat2 (float): Latitude of the other point
+            lon2 (float): Longitude of the other point
+            distance_km (float): Distance threshold in kilometers
+            
+        Returns:
+            bool: True if the point is within the distance
+        """
+        if anchor[2] > APPROX_MIN_COS_LAT and self._approx_distance_km(anchor, lat2, lon2) >= 2 * distance_km:
+            return False
+        
+        return self._haversine_anchor(anchor, lat2, lon2) < distance_km
+    
+    def _haversine_vec(self, lat1: float, lon1: float, lats2, lons2):
+        """
+        Calculate distances from one point to many points using Haversine formula
+        
+        Args:
+            lat1 (float): Latitude of the point
+            lon1 (float): Longitude of the point
+            lats2: Latitudes of the other points
+            lons2: Longitudes of the other points
+            
+        Returns:
+            np.ndarray: Distances in kilometers
+        """
+        # Single point: math is faster than NumPy on scalars
+        lat1_r, lon1_r, cos_lat1_r = self._prep_anchor(lat1, lon1)
+        lats2 = np.radians(np.asarray(lats2, dtype=float))
+        lons2 = np.radians(np.asarray(lons2, dtype=float))
+        
+        a = np.sin((lats2 - lat1_r) / 2)**2 + cos_lat1_r * np.cos(lats2) * np.sin((lons2 - lon1_r) / 2)**2
+        return 2 * EARTH_RADIUS_KM * np.arctan2(np.sqrt(a), np.sqrt(1 - a))
+    
+    def _haversine_matrix(self, lats1, lons1, lats2, lons2):
+        """
+        Calculate distances between every point of one set and every point of another
+        
+        Args:
+            lats1: Latitudes of the first set
+            lons1: Longitudes of the first set
+            lats2: Latitudes of the second set
+            lons2: Longitudes of the second set
+            
+        Returns:
+            np.ndarray: (len(lats1), len(lats2)) distances in kilometers
+        """
+        lats1 = np.radians(np.asarray(lats1, dtype=float))[:, None]
+        lons1 = np.radians(np.asarray(lons1, dtype=float))[:, None]
+        lats2 = np.radians(np.asarray(lats2, dtype=float))[None, :]
+        lons2 = np.radians(np.asarray(lons2, dtype=float))[None, :]
+        
+        a = np.sin((lats2 - lats1) / 2)**2 + np.cos(lats1) * np.cos(lats2) * np.sin((lons2 - lons1) / 2)**2
+        return 2 * EARTH_RADIUS_KM * np.arctan2(np.sqrt(a), np.sqrt(1 - a))
+    
+    def _any_within(self, lat: float, lng: float, lats, lngs, distance_km: float) -> bool:
+        """
+        Check whether any of the given points is closer than distance_km to a point
+        
+        Args:
+            lat (float): Latitude of the point
+            lng (float): Longitude of the point
+            lats: Latitudes of the other points
+            lngs: Longitudes of the other points
+            distance_km (float): Distance threshold in kilometers
+            
+        Returns:
+            bool: True if a point is within the distance
         """
-        # Convert decimal degrees to radians
-        lat1, lon1, lat2, lon2 = map(math.radians, [lat1, lon1, lat2, lon2])
+        if not len(lats):
+            return False
         
-        # Haversine formula
-        dlon = lon2 - lon1
-        dlat = lat2 - lat1
-        a = math.sin(dlat/2)**2 + math.cos(lat1) * math.cos(lat2) * math.sin(dlon/2)**2
-        c = 2 * math.asin(math.sqrt(a))
-        r = 6371  # Radius of Earth in kilometers
+        anchor = self._prep_anchor(lat, lng)
         
-        return c * r
+        if NUMPY_AVAILABLE:
+            lats = np.asarray(lats, dtype=float)
+            lngs = np.asarray(lngs, dtype=float)
+            
+            # Equirectangular prefilter (see _approx_distance_km), then exact distances for what is left
+            lat_r, lng_r, cos_lat_r = anchor
+            if cos_lat_r > APPROX_MIN_COS_LAT:
+                dlon = (np.radians(lngs) - lng_r + math.pi) % (2 * math.pi) - math.pi
+                approx = EARTH_RADIUS_KM * np.hypot(dlon * cos_lat_r, np.radians(lats) - lat_r)
+                close = approx < 2 * distance_km
+                if not close.any():
+                    return False
+                lats, lngs = lats[close], lngs[close]
+            
+            return bool((self._haversine_vec(lat, lng, lats, lngs) < distance_km).any())
+        
+        return any(self._within_distance(anchor, other_lat, other_lng, distance_km)
+                   for other_lat, other_lng in zip(lats, lngs))
     
     def discover_by_name(self, name: str, location: str = None, radius: int = 5000, 
                          language: str = "en", data_sources: List[str] = None) -> List[Dict]:
@@ -240,50 +1093,12 @@ class DataDiscovery:
         
         else:
             # Direct name search without location constraint
+            searches = self._source_searches(NAME_SOURCES, data_sources, (name, language))
+            results = self._run_source_searches(searches)
             
-            # Google Places API (if available and selected)
-            if "google_places" in data_sources and self.scraper and hasattr(self.scraper, '_search_google_places_by_name'):
-                try:
-                    logger.info("Searching Google Places API by name")
-                    google_results = self.scraper._search_google_places_by_name(name, language)
-                    results.extend(google_results)
-                    logger.info(f"Found {len(google_results)} hotels from Google Places")
-                except Exception as e:
-                    logger.error(f"Error searching Google Places by name: {e}")
-                    # If the method doesn't exist yet, log a message
-                    if not hasattr(self.scraper, '_search_google_places_by_name'):
-                        logger.info("Google Places search by name not implemented yet")
-            
-            # OpenStreetMap (if selected)
-            if "openstreetmap" in data_sources and self.scraper and hasattr(self.scraper, '_search_openstreetmap_by_name'):
-                try:
-                    logger.info("Searching OpenStreetMap by name")
-                    osm_results = self.scraper._search_openstreetmap_by_name(name, language)
-                    results.extend(osm_results)
-                    logger.info(f"Found {len(osm_results)} hotels from OpenStreetMap")
-                except Exception as e:
-                    logger.error(f"Error searching OpenStreetMap by name: {e}")
-                    # If the method doesn't exist yet, log a message
-                    if not hasattr(self.scraper, '_search_openstreetmap_by_name'):
-                        logger.info("OpenStreetMap search by name not implemented yet")
-            
-            # Add other data sources (Booking.com, TripAdvisor, etc.)
-            # Same pattern as above
+            # Add other data sources (Booking.com, TripAdvisor, etc.) to NAME_SOURCES
         
-        # Apply matching algorithm if available
-        if self.scraper and hasattr(self.scraper, 'enhanced_matching_algorithm'):
-            try:
-                logger.info("Applying enhanced matching algorithm")
-                results = self.scraper.enhanced_matching_algorithm(results)
-                logger.info(f"After matching: {len(results)} unique hotels")
-            except Exception as e:
-                logger.error(f"Error applying matching algorithm: {e}")
-                # If the method doesn't exist yet, use basic comparison
-                logger.info("Using basic comparison to remove duplicates")
-                results = self._remove_duplicates(results)
-        else:
-            # Use basic duplicate removal
-            results = self._remove_duplicates(results)
+        results = self._match_hotels(results)
         
         logger.info(f"Name-based discovery complete. Found {len(results)} unique hotels")
         return results
@@ -306,8 +1121,9 @@ class DataDiscovery:
         
         # Initialize result list and tracking sets
         all_hotels = []
+        hotel_index = HotelIndex()
         processed_locations = set()
-        search_points = [(start_location, 1000)]  # Start with 1km radius
+        search_points = deque([(start_location, 1000)])  # Start with 1km radius
         
         # Set default stop criteria if not provided
         if stop_criteria is None:
@@ -333,7 +1149,7 @@ class DataDiscovery:
                 break
             
             # Get next search point
-            current_location, radius = search_points.pop(0)
+            current_location, radius = search_points.popleft()
             
             # Skip if already processed
             if current_location in processed_locations:
@@ -346,11 +1162,17 @@ class DataDiscovery:
             
             # Search hotels at this location
             try:
-                hotels = self.discover_by_location(current_location, radius)
+                # Don't wait for slow sources once the remaining hotel budget is covered
+                stop_after = None
+                if "max_hotels" in stop_criteria:
+                    stop_after = stop_criteria["max_hotels"] - len(all_hotels)
+                hotels = self.discover_by_location(current_location, radius, stop_after=stop_after)
                 
                 # Add new hotels to results (avoid duplicates)
-                new_hotels = [h for h in hotels if not self._is_duplicate_hotel(h, all_hotels)]
+                new_hotels = [h for h in hotels if not self._is_duplicate_hotel(h, hotel_index)]
                 all_hotels.extend(new_hotels)
+                for hotel in new_hotels:
+                    hotel_index.add(hotel)
                 
                 logger.info(f"Found {len(new_hotels)} new hotels at {current_location}")
                 
@@ -366,6 +1188,7 @@ class DataDiscovery:
                 logger.error(f"Error during smart discovery at {current_location}: {e}")
         
         logger.info(f"Smart discovery complete. Found {len(all_hotels)} unique hotels from {len(processed_locations)} locations")
+        _haversine_cached.cache_clear()
         return all_hotels
     
     def _extract_search_points(self, hotels: List[Dict], existing_points: set) -> List[str]:
@@ -382,73 +1205,183 @@ class DataDiscovery:
         new_points = []
         locations = set()
         
-        for hotel in hotels:
-            lat = hotel.get('latitude')
-            lng = hotel.get('longitude')
+        # Parse the coordinates of existing points once for all hotels
+        point_lats, point_lngs = [], []
+        for point in existing_points:
+            try:
+                if ',' in point:
+                    p_lat, p_lng = map(float, point.split(','))
+                    point_lats.append(p_lat)
+                    point_lngs.append(p_lng)
+            except:
+                pass
+        
+        located = [hotel for hotel in hotels if hotel.get('latitude') and hotel.get('longitude')]
+        
+        # Check distance of every hotel from every existing point (within 1 km) at once
+        too_close = [False] * len(located)
+        if located and point_lats:
+            try:
+                lats = [hotel['latitude'] for hotel in located]
+                lngs = [hotel['longitude'] for hotel in located]
+                if NUMPY_AVAILABLE:
+                    too_close = (self._haversine_matrix(lats, lngs, point_lats, point_lngs) < 1.0).any(axis=1).tolist()
+                else:
+                    too_close = [self._any_within(lat, lng, point_lats, point_lngs, 1.0) for lat, lng in zip(lats, lngs)]
+            except (TypeError, ValueError):
+                pass
+        
+        for hotel, hotel_too_close in zip(located, too_close):
+            # Create coordinate string
+            coord_str = f"{hotel['latitude']},{hotel['longitude']}"
             
-            if lat and lng:
-                # Create coordinate string
-                coord_str = f"{lat},{lng}"
-                
-                # Check if this is a new location and not too close to existing points
-                if coord_str not in existing_points and coord_str not in locations:
-                    # Check distance from existing points
-                    too_close = False
-                    for point in existing_points:
-                        try:
-                            if ',' in point:
-                                p_lat, p_lng = map(float, point.split(','))
-                                dist = self._haversine_distance(lat, lng, p_lat, p_lng)
-                                if dist < 1.0:  # Within 1 km
-                                    too_close = True
-                                    break
-                        except:
-                            pass
-                    
-                    if not too_close:
-                        locations.add(coord_str)
-                        new_points.append(coord_str)
+            # Check if this is a new location and not too close to existing points
+            if coord_str not in existing_points and coord_str not in locations and not hotel_too_close:
+                locations.add(coord_str)
+                new_points.append(coord_str)
         
         return new_points
     
-    def _is_duplicate_hotel(self, hotel: Dict, existing_hotels: List[Dict]) -> bool:
+    def _is_duplicate_hotel(self, hotel: Dict, existing_hotels: Union[List[Dict], HotelIndex]) -> bool:
         """
         Check if a hotel is a duplicate of any in the existing list
         
         Args:
             hotel (Dict): Hotel data
-            existing_hotels (List[Dict]): List of existing hotels
+            existing_hotels (List[Dict] or HotelIndex): Existing hotels; pass a
+                HotelIndex when checking many hotels against a growing list
             
         Returns:
             bool: True if duplicate, False otherwise
         """
         # Check by name and approximate location
-        hotel_name = hotel.get('name', '').lower()
+        hotel_name = _name_key(hotel.get('name', ''))
         lat = hotel.get('latitude')
         lng = hotel.get('longitude')
         
         if not hotel_name or not lat or not lng:
             return False
         
-        for existing in existing_hotels:
-            # Check name similarity
-            existing_name = existing.get('name', '').lower()
-            if hotel_name == existing_name:
-                return True
+        if not isinstance(existing_hotels, HotelIndex):
+            return self._is_duplicate_in_list(hotel_name, lat, lng, existing_hotels)
+        
+        # Check name
+        if hotel_name in existing_hotels.names:
+            return True
+        
+        # Check location proximity: the tree first, then hotels added since it was built
+        try:
+            if existing_hotels.cells is not None:
+                nearby_lats, nearby_lngs = existing_hotels.nearby(lat, lng)
+                return self._any_within(lat, lng, nearby_lats, nearby_lngs, DUPLICATE_DISTANCE_KM)
             
-            # Check location proximity
-            existing_lat = existing.get('latitude')
-            existing_lng = existing.get('longitude')
+            if existing_hotels.tree is not None:
+                point = _unit_sphere_points([lat], [lng])[0]
+                if existing_hotels.tree.query_ball_point(point, r=_chord_length(DUPLICATE_DISTANCE_KM)):
+                    return True
             
-            if existing_lat and existing_lng:
-                try:
-                    dist = self._haversine_distance(lat, lng, existing_lat, existing_lng)
-                    if dist < 0.05:  # Within 50 meters
-                        return True
-                except:
-                    pass
+            start = existing_hotels.tree_size
+            return self._any_within(lat, lng, existing_hotels.lats[start:], existing_hotels.lngs[start:],
+                                    DUPLICATE_DISTANCE_KM)
+        except (TypeError, ValueError):
+            return False
+    
+    def _is_duplicate_in_list(self, hotel_name: str, lat: float, lng: float, existing_hotels: List[Dict]) -> bool:
+        """
+        One-off duplicate check against a plain list, without building an index
+        
+        Args:
+            hotel_name (str): Lowercase hotel name
+            lat (float): Latitude of the hotel
+            lng (float): Longitude of the hotel
+            existing_hotels (List[Dict]): Existing hotels
+            
+        Returns:
+            bool: True if duplicate, False otherwise
+        """
+        # A name match settles it without any distance computation
+        if any(_name_key(existing.get('name', '')) == hotel_name for existing in existing_hotels):
+            return True
+        
+        located = [existing for existing in existing_hotels if existing.get('latitude') and existing.get('longitude')]
+        try:
+            return self._any_within(lat, lng, [existing['latitude'] for existing in located],
+                                    [existing['longitude'] for existing in located], DUPLICATE_DISTANCE_KM)
+        except (TypeError, ValueError):
+            return False
+    
+    def _new_hotels_per_batch(self, batches: List[List[Dict]]) -> List[List[Dict]]:
+        """
+        Drop the hotels of each batch that duplicate a hotel kept from an earlier batch
+        
+        Same result as checking every batch with _is_duplicate_hotel against a
+        HotelIndex of the hotels kept so far, but with one KD-tree over all
+        batches (with scipy) instead of an index that is rebuilt as it grows.
+        Overlapping searches return the same hotels again, so the tree only
+        holds each distinct location once.
+        
+        Args:
+            batches (List[List[Dict]]): Hotels found per search, in search order
+            
+        Returns:
+            List[List[Dict]]: The new hotels of each batch
+        """
+        located = [(batch_number, hotel) for batch_number, hotels in enumerate(batches) for hotel in hotels
+                   if hotel.get('name', '') and hotel.get('latitude') and hotel.get('longitude')]
+        
+        neighbours = None
+        if SCIPY_AVAILABLE and located:
+            try:
+                coords = _coordinate_rows([hotel['latitude'] for _, hotel in located],
+                                          [hotel['longitude'] for _, hotel in located])
+                # Hotels at exactly the same location share a tree point
+                locations, location_of = np.unique(coords, axis=0, return_inverse=True)
+                points = _unit_sphere_points(locations[:, 0], locations[:, 1])
+                neighbours = cKDTree(points).query_ball_point(points, r=_chord_length(DUPLICATE_DISTANCE_KM))
+                location_of = location_of.ravel().tolist()
+            except (TypeError, ValueError):
+                # Malformed coordinates; the per-hotel checks below skip just those hotels
+                neighbours = None
+        
+        if neighbours is None:
+            hotel_index = HotelIndex()
+            new_per_batch = []
+            for hotels in batches:
+                new_hotels = [h for h in hotels if not self._is_duplicate_hotel(h, hotel_index)]
+                for hotel in new_hotels:
+                    hotel_index.add(hotel)
+                new_per_batch.append(new_hotels)
+            return new_per_batch
+        
+        # Earliest batch that kept a hotel at each location
+        kept_batch = [len(batches)] * len(neighbours)
+        kept_names = set()
+        position = 0
+        new_per_batch = []
+        
+        for batch_number, hotels in enumerate(batches):
+            new_hotels = []
+            for hotel in hotels:
+                if not (hotel.get('name', '') and hotel.get('latitude') and hotel.get('longitude')):
+                    new_hotels.append(hotel)
+                    continue
+                
+                current = location_of[position]
+                position += 1
+                
+                # Only hotels kept from earlier batches count, as with the growing index
+                if _name_key(hotel['name']) in kept_names:
+                    continue
+                if any(kept_batch[other] < batch_number for other in neighbours[current]):
+                    continue
+                
+                kept_batch[current] = min(kept_batch[current], batch_number)
+                new_hotels.append(hotel)
+            
+            kept_names.update(_name_key(hotel.get('name', '')) for hotel in new_hotels)
+            new_per_batch.append(new_hotels)
         
-        return False
+        return new_per_batch
     
     def collect_detailed_info(self, hotel_id: str = None, hotel_data: Dict = None) -> Dict:
         """
@@ -480,113 +1413,81 @@ class DataDiscovery:
         # Collect detailed information from all possible sources
         sources_checked = []
         
-        # 1. Get detailed info from Google Places if available
-        if self.scraper and hasattr(self.scraper, '_get_google_place_details'):
-            try:
-                place_id = None
-                
-                # Try to get place_id from additional_info
-                if hotel_data.get('additional_info'):
-                    try:
-                        additional_info = json.loads(hotel_data.get('additional_info', '{}'))
-                        place_id = additional_info.get('place_id')
-                    except:
-                        pass
-                
-                # If place_id found, get details
-                if place_id:
-                    logger.info(f"Getting Google Places details for place_id: {place_id}")
-                    google_details = self.scraper._get_google_place_details(place_id)
-                    
-                    if google_details:
-                        # Merge details into result
-                        for key, value in google_details.items():
-                            if key not in result or not result[key]:
-                                result[key] = value
-                        
-                        sources_checked.append("Google Places")
-            except Exception as e:
-                logger.error(f"Error getting Google Places details: {e}")
+        # Look up the hotel's IDs in the source systems
+        additional_info = self._parse_additional_info(hotel_data.get('additional_info'))
+        place_id = additional_info.get('place_id')
+        osm_id = additional_info.get('osm_id')
+        osm_type = additional_info.get('osm_type')
         
-        # 2. Get detailed info from OpenStreetMap if available
-        if self.scraper and hasattr(self.scraper, '_get_osm_details'):
-            try:
-                osm_id = None
-                
-                # Try to get osm_id from additional_info
-                if hotel_data.get('additional_info'):
-                    try:
-                        additional_info = json.loads(hotel_data.get('additional_info', '{}'))
-                        osm_id = additional_info.get('osm_id')
-                        osm_type = additional_info.get('osm_type')
-                        
-                        if osm_id and osm_type:
-                            osm_id = f"{osm_type}:{osm_id}"
-                    except:
-                        pass
-                
-                # If osm_id found, get details
-                if osm_id:
-                    logger.info(f"Getting OpenStreetMap details for osm_id: {osm_id}")
-                    osm_details = self.scraper._get_osm_details(osm_id)
-                    
-                    if osm_details:
-                        # Merge details into result
-                        for key, value in osm_details.items():
-                            if key not in result or not result[key]:
-                                result[key] = value
-                        
-                        sources_checked.append("OpenStreetMap")
-            except Exception as e:
-                logger.error(f"Error getting OpenStreetMap details: {e}")
+        if osm_id and osm_type:
+            osm_id = f"{osm_type}:{osm_id}"
         
-        # 3. Extract information from hotel website if available
-        if hotel_data.get('website') and self.scraper and hasattr(self.scraper, 'extract_hotel_website_info'):
-            try:
+        # The sources are independent, so fetch them all at the same time
+        with concurrent.futures.ThreadPoolExecutor(max_workers=self.max_source_workers) as executor:
+            google_future = osm_future = website_future = history_future = platforms_future = None
+            
+            if place_id and self.scraper and hasattr(self.scraper, '_get_google_place_details'):
+                logger.info(f"Getting Google Places details for place_id: {place_id}")
+                google_future = executor.submit(self.scraper._get_google_place_details, place_id)
+            
+            if osm_id and self.scraper and hasattr(self.scraper, '_get_osm_details'):
+                logger.info(f"Getting OpenStreetMap details for osm_id: {osm_id}")
+                osm_future = executor.submit(self._call_source, "openstreetmap",
+                                             self.scraper._get_osm_details, osm_id)
+            
+            if hotel_data.get('website') and self.scraper and hasattr(self.scraper, 'extract_hotel_website_info'):
                 logger.info(f"Extracting information from website: {hotel_data['website']}")
-                website_info = self.scraper.extract_hotel_website_info(hotel_data['website'])
-                
-                if website_info:
-                    # Merge website information
-                    for key, value in website_info.items():
-                        if key not in result:
-                            result[key] = value
-                        elif key == 'contact' and isinstance(value, dict):
-                            # Merge contact information
-                            for contact_key, contact_value in value.items():
-                                if contact_key not in result or not result[contact_key]:
-                                    result[contact_key] = contact_value
-                    
-                    sources_checked.append("Hotel Website")
-            except Exception as e:
-                logger.error(f"Error extracting website information: {e}")
-        
-        # 4. Check for hotel history and add it to the result
-        if hotel_id and self.db and hasattr(self.db, 'get_hotel_history'):
-            try:
+                website_future = executor.submit(self.scraper.extract_hotel_website_info, hotel_data['website'])
+            
+            if hotel_id and self.db and hasattr(self.db, 'get_hotel_history'):
                 logger.info(f"Getting hotel history for hotel ID: {hotel_id}")
-                history = self.db.get_hotel_history(hotel_id)
-                
-                if history:
-                    result['history'] = history
-                    sources_checked.append("Historical Records")
-            except Exception as e:
-                logger.error(f"Error getting hotel history: {e}")
-        
-        # 5. Check for presence on booking platforms
-        if self.scraper and hasattr(self.scraper, 'check_booking_platforms'):
-            try:
+                history_future = executor.submit(self.db.get_hotel_history, hotel_id)
+            
+            if self.scraper and hasattr(self.scraper, 'check_booking_platforms'):
                 logger.info(f"Checking booking platforms for hotel: {hotel_data.get('name')}")
-                platforms_data = self.scraper.check_booking_platforms(hotel_data)
-                
-                if platforms_data:
-                    result['booking_platforms'] = platforms_data
-                    sources_checked.append("Booking Platforms")
-            except Exception as e:
-                logger.error(f"Error checking booking platforms: {e}")
-                # If the method doesn't exist yet, log a message
-                if not hasattr(self.scraper, 'check_booking_platforms'):
-                    logger.info("Booking platforms check not implemented yet")
+                platforms_future = executor.submit(self.scraper.check_booking_platforms, hotel_data)
+        
+        # Merge in a fixed order: earlier sources win for fields set by several
+        
+        # 1. Detailed info from Google Places
+        google_details = self._future_result(google_future, "Error getting Google Places details")
+        if google_details:
+            # Merge details into result, filling only missing or empty fields
+            result.update({key: value for key, value in google_details.items() if not result.get(key)})
+            
+            sources_checked.append("Google Places")
+        
+        # 2. Detailed info from OpenStreetMap
+        osm_details = self._future_result(osm_future, "Error getting OpenStreetMap details")
+        if osm_details:
+            # Merge details into result, filling only missing or empty fields
+            result.update({key: value for key, value in osm_details.items() if not result.get(key)})
+            
+            sources_checked.append("OpenStreetMap")
+        
+        # 3. Information from the hotel website
+        website_info = self._future_result(website_future, "Error extracting website information")
+        if website_info:
+            # Merge website information
+            contact = website_info.get('contact') if 'contact' in result else None
+            result.update({key: value for key, value in website_info.items() if key not in result})
+            if isinstance(contact, dict):
+                # Merge contact information
+                result.update({key: value for key, value in contact.items() if not result.get(key)})
+            
+            sources_checked.append("Hotel Website")
+        
+        # 4. Hotel history
+        history = self._future_result(history_future, "Error getting hotel history")
+        if history:
+            result['history'] = history
+            sources_checked.append("Historical Records")
+        
+        # 5. Presence on booking platforms
+        platforms_data = self._future_result(platforms_future, "Error checking booking platforms")
+        if platforms_data:
+            result['booking_platforms'] = platforms_data
+            sources_checked.append("Booking Platforms")
         
         # Add metadata about the collection process
         result['detail_collection'] = {
@@ -598,6 +1499,49 @@ class DataDiscovery:
         logger.info(f"Detailed information collection complete. Sources checked: {', '.join(sources_checked)}")
         return result
     
+    def _parse_additional_info(self, additional_info) -> Dict:
+        """
+        Decode a hotel's additional_info field
+        
+        Args:
+            additional_info: JSON string as stored in the database, or an already decoded dict
+            
+        Returns:
+            Dict: Decoded fields, empty if missing or invalid
+        """
+        if not additional_info:
+            return {}
+        
+        if isinstance(additional_info, dict):
+            return additional_info
+        
+        if isinstance(additional_info, (bytes, bytearray)):
+            additional_info = bytes(additional_info)
+        elif not isinstance(additional_info, str):
+            return {}
+        
+        return _decode_json_object(additional_info)
+    
+    def _future_result(self, future, error_message: str):
+        """
+        Get the result of a source fetch, logging its error instead of raising
+        
+        Args:
+            future: Future of the fetch, or None if the source was not queried
+            error_message (str): Log message prefix used if the fetch failed
+            
+        Returns:
+            The fetched data, or None
+        """
+        if future is None:
+            return None
+        
+        try:
+            return future.result()
+        except Exception as e:
+            logger.error(f"{error_message}: {e}")
+            return None
+    
     def import_from_file(self, file_path: str, file_type: str = None) -> Dict:
         """
         Import hotel data from an external file
@@ -631,73 +1575,42 @@ class DataDiscovery:
         
         # Import based on file type
         try:
-            imported_hotels = []
-            
             if file_type == 'csv':
                 # Import from CSV
-                import pandas as pd
-                df = pd.read_csv(file_path)
-                records = df.to_dict('records')
-                
-                # Process and save each record
-                for record in records:
-                    # Convert to hotel data format
-                    hotel_data = self._convert_to_hotel_data(record)
-                    
-                    # Save to database if available
-                    if self.db and hasattr(self.db, 'save_hotel'):
-                        hotel_id = self.db.save_hotel(hotel_data)
-                        hotel_data['id'] = hotel_id
-                    
-                    imported_hotels.append(hotel_data)
+                records = self._read_csv_records(file_path)
             
             elif file_type == 'excel':
                 # Import from Excel
-                import pandas as pd
-                df = pd.read_excel(file_path)
-                records = df.to_dict('records')
-                
-                # Process and save each record
-                for record in records:
-                    # Convert to hotel data format
-                    hotel_data = self._convert_to_hotel_data(record)
-                    
-                    # Save to database if available
-                    if self.db and hasattr(self.db, 'save_hotel'):
-                        hotel_id = self.db.save_hotel(hotel_data)
-                        hotel_data['id'] = hotel_id
-                    
-                    imported_hotels.append(hotel_data)
+                records = self._read_excel_records(file_path)
             
             elif file_type == 'json':
                 # Import from JSON
-                with open(file_path, 'r', encoding='utf-8') as f:
-                    json_data = json.load(f)
-                
-                # Handle both array and object formats
-                if isinstance(json_data, list):
-                    records = json_data
-                else:
-                    records = [json_data]
+                records = self._read_json_records(file_path)
+            
+            else:
+                records = []
+            
+            # Convert to hotel data format and save to database if available, a batch at a time,
+            # so streamed records are never all held in memory
+            timestamp = datetime.now().isoformat()
+            hotels = (self._convert_to_hotel_data(record, timestamp) for record in records)
+            imported_count = 0
+            first_hotels = []
+            while True:
+                batch = list(islice(hotels, SAVE_BATCH_SIZE))
+                if not batch:
+                    break
                 
-                # Process and save each record
-                for record in records:
-                    # Convert to hotel data format
-                    hotel_data = self._convert_to_hotel_data(record)
-                    
-                    # Save to database if available
-                    if self.db and hasattr(self.db, 'save_hotel'):
-                        hotel_id = self.db.save_hotel(hotel_data)
-                        hotel_data['id'] = hotel_id
-                    
-                    imported_hotels.append(hotel_data)
+                self._save_hotels(batch)
+                first_hotels.extend(batch[:10 - len(first_hotels)])
+                imported_count += len(batch)
             
-            logger.info(f"Import complete. Imported {len(imported_hotels)} hotels")
+            logger.info(f"Import complete. Imported {imported_count} hotels")
             
             return {
                 "status": "success",
-                "imported_count": len(imported_hotels),
-                "first_10_hotels": imported_hotels[:10] if len(imported_hotels) > 10 else imported_hotels
+                "imported_count": imported_count,
+                "first_10_hotels": first_hotels
             }
             
         except Exception as e:
@@ -706,60 +1619,185 @@ class DataDiscovery:
             traceback.print_exc()
             return {"error": f"Import failed: {str(e)}"}
     
-    def _convert_to_hotel_data(self, record: Dict) -> Dict:
+    def _read_csv_records(self, file_path: str) -> List[Dict]:
+        """
+        Read the rows of a CSV file as records
+        
+        Uses pyarrow's multithreaded parser directly when pyarrow is
+        installed, which also skips building a DataFrame; empty cells
+        come back as None. Dates and times are kept as the text in the
+        file, as pandas returns them. Otherwise pandas reads the file.
+        
+        Args:
+            file_path (str): Path to the file
+            
+        Returns:
+            List[Dict]: One record per row
+        """
+        try:
+            import pyarrow as pa
+            from pyarrow import csv as pa_csv
+            
+            table = pa_csv.read_csv(file_path, convert_options=pa_csv.ConvertOptions(strings_can_be_null=True))
+            date_columns = [field.name for field in table.schema if pa.types.is_temporal(field.type)]
+            if date_columns:
+                # Read inferred date and time columns again as plain strings
+                table = pa_csv.read_csv(file_path, convert_options=pa_csv.ConvertOptions(
+                    strings_can_be_null=True,
+                    column_types={name: pa.string() for name in date_columns}))
+            return table.to_pylist()
+        except (ImportError, ValueError):
+            pass
+        
+        import pandas as pd
+        
+        df = pd.read_csv(file_path)
+        return df.to_dict('records')
+    
+    def _read_json_records(self, file_path: str):
+        """
+        Read the records of a JSON file holding an array of objects or a single object
+        
+        Uses orjson when it is installed. Arrays in files over
+        JSON_STREAM_THRESHOLD are parsed one record at a time with ijson,
+        so the whole document is never held in memory.
+        
+        Args:
+            file_path (str): Path to the file
+            
+        Returns:
+            Iterator[Dict]: The records, read as they are iterated
+        """
+        if IJSON_AVAILABLE and os.path.getsize(file_path) > JSON_STREAM_THRESHOLD:
+            with open(file_path, 'rb') as f:
+                head = f.read(4096).lstrip()
+                f.seek(0)
+                if head.startswith(b'\xef\xbb\xbf'):
+                    head = head[3:].lstrip()
+                if head.startswith(b'['):
+                    yield from ijson.items(f, 'item', use_float=True)
+                    return
+        
+        if ORJSON_AVAILABLE:
+            with open(file_path, 'rb') as f:
+                json_data = orjson.loads(f.read())
+        else:
+            with open(file_path, 'r', encoding='utf-8') as f:
+                json_data = json.load(f)
+        
+        # Handle both array and object formats
+        if isinstance(json_data, list):
+            yield from json_data
+        else:
+            yield json_data
+    
+    def _read_excel_records(self, file_path: str) -> List[Dict]:
+        """
+        Read the rows of the first sheet of an Excel file as records
+        
+        Uses the compiled calamine reader when python-calamine is installed.
+        
+        Args:
+            file_path (str): Path to the file
+            
+        Returns:
+            List[Dict]: One record per row
+        """
+        import pandas as pd
+        
+        try:
+            df = pd.read_excel(file_path, engine="calamine")
+        except (ImportError, ValueError):
+            df = pd.read_excel(file_path)
+        
+        return df.to_dict('records')
+    
+    def _save_hotels(self, hotels: List[Dict], skip_errors: bool = False) -> int:
+        """
+        Save hotels to the database and set the 'id' of each
+        
+        Uses the database's save_hotels_bulk or save_hotels_batch (one
+        round-trip per SAVE_BATCH_SIZE hotels, returning the new IDs in
+        order) when it has one, and save_hotel per hotel otherwise.
+        
+        Args:
+            hotels (List[Dict]): Hotels to save
+            skip_errors (bool): Log failed saves and carry on instead of raising
+            
+        Returns:
+            int: Number of hotels saved
+        """
+        if not self.db or not hotels:
+            return 0
+        
+        saved_count = 0
+        save_bulk = getattr(self.db, 'save_hotels_bulk', None) or getattr(self.db, 'save_hotels_batch', None)
+        if save_bulk:
+            for start in range(0, len(hotels), SAVE_BATCH_SIZE):
+                batch = hotels[start:start + SAVE_BATCH_SIZE]
+                try:
+                    hotel_ids = save_bulk(batch)
+                except Exception as e:
+                    if not skip_errors:
+                        raise
+                    logger.error(f"Error saving {len(batch)} hotels to database: {e}")
+                    continue
+                
+                for hotel, hotel_id in zip(batch, hotel_ids):
+                    hotel['id'] = hotel_id
+                saved_count += len(batch)
+        elif hasattr(self.db, 'save_hotel'):
+            for hotel in hotels:
+                try:
+                    hotel['id'] = self.db.save_hotel(hotel)
+                    saved_count += 1
+                except Exception as e:
+                    if not skip_errors:
+                        raise
+                    logger.error(f"Error saving hotel to database: {e}")
+        
+        return saved_count
+    
+    def _convert_to_hotel_data(self, record: Dict, timestamp: str = None) -> Dict:
         """
         Convert a record from imported file to hotel data format
         
         Args:
             record (Dict): Record from imported file
+            timestamp (str, optional): last_updated value, shared by all records of an import
             
         Returns:
             Dict: Formatted hotel data
         """
-        # Map common field names to our format
-        field_mapping = {
-            # Common CSV headers to our internal format
-            'name': ['name', 'hotel_name', 'property_name', 'title'],
-            'address': ['address', 'hotel_address', 'property_address', 'street_address'],
-            'city': ['city', 'town', 'municipality'],
-            'country': ['country', 'country_name'],
-            'latitude': ['latitude', 'lat', 'y', 'latitude_degrees'],
-            'longitude': ['longitude', 'lng', 'lon', 'x', 'longitude_degrees'],
-            'phone': ['phone', 'telephone', 'contact_phone', 'phone_number'],
-            'email': ['email', 'contact_email', 'email_address'],
-            'website': ['website', 'url', 'web_address', 'hotel_website'],
-            'stars': ['stars', 'rating', 'hotel_stars', 'star_rating'],
-            'price_range': ['price_range', 'price', 'price_category'],
-            'facilities': ['facilities', 'amenities', 'services'],
-            'legal_status': ['legal_status', 'status', 'hotel_status'],
-            'data_source': ['data_source', 'source']
-        }
-        
         # Create new hotel data
         hotel_data = {}
         
-        # Map fields using the mapping
-        for our_field, possible_names in field_mapping.items():
-            for name in possible_names:
-                if name in record:
-                    hotel_data[our_field] = record[name]
-                    break
-        
-        # Add any remaining fields that might be useful
+        # Map fields using the mapping; the most preferred column present wins.
+        # Unmapped columns are kept in additional_info
+        mapped_ranks = {}
+        additional_info = {}
         for key, value in record.items():
-            if key not in [item for sublist in field_mapping.values() for item in sublist]:
-                # Store in additional_info if not already mapped
-                if 'additional_info' not in hotel_data:
-                    hotel_data['additional_info'] = {}
-                
-                hotel_data['additional_info'][key] = value
+            if key in IMPORT_FIELD_ALIASES:
+                our_field, rank = IMPORT_FIELD_ALIASES[key]
+                if rank < mapped_ranks.get(our_field, len(IMPORT_FIELD_MAPPING[our_field])):
+                    hotel_data[our_field] = value
+                    mapped_ranks[our_field] = rank
+            else:
+                additional_info[key] = value
+        
+        if additional_info:
+            hotel_data['additional_info'] = additional_info
         
         # If additional_info exists, convert to JSON string
         if 'additional_info' in hotel_data and isinstance(hotel_data['additional_info'], dict):
-            hotel_data['additional_info'] = json.dumps(hotel_data['additional_info'])
+            if ORJSON_AVAILABLE:
+                hotel_data['additional_info'] = orjson.dumps(hotel_data['additional_info'], default=str,
+                                                             option=orjson.OPT_NON_STR_KEYS).decode('utf-8')
+            else:
+                hotel_data['additional_info'] = json.dumps(hotel_data['additional_info'], default=str)
         
         # Add metadata
-        hotel_data['last_updated'] = datetime.now().isoformat()
+        hotel_data['last_updated'] = timestamp or datetime.now().isoformat()
         if 'data_source' not in hotel_data:
             hotel_data['data_source'] = 'Imported Data'
         
@@ -810,48 +1848,37 @@ class DataDiscovery:
             # Perform subdivision scan
             logger.info(f"Performing subdivision scan with max {max_subdivisions} subdivisions")
             
-            # Calculate initial subdivision
-            # We'll create a grid around the city center
-            # Start with a 2x2 grid and increase if needed
+            # We'll create a grid around the city center: grid_size is the
+            # smallest size (at least 2) whose square reaches max_subdivisions,
+            # and the points come from the grid one size smaller (2x2 at least)
+            grid_size = max(2, math.ceil(math.sqrt(max_subdivisions)))
+            points_per_side = max(2, grid_size - 1)
             
-            grid_size = 2
-            while grid_size * grid_size < max_subdivisions:
-                lat_step = (radius * 2) / 111000 / grid_size  # Convert meters to approximate degrees
-                lng_step = lat_step / math.cos(math.radians(city_lat))  # Adjust for longitude compression
-                
-                # Calculate grid bounds
-                min_lat = city_lat - (lat_step * grid_size / 2)
-                min_lng = city_lng - (lng_step * grid_size / 2)
-                
-                # Create search points
-                search_points = []
-                for i in range(grid_size):
-                    for j in range(grid_size):
-                        point_lat = min_lat + (i * lat_step) + (lat_step / 2)
-                        point_lng = min_lng + (j * lng_step) + (lng_step / 2)
-                        search_points.append((point_lat, point_lng))
-                
-                # If we have enough points, break
-                if len(search_points) >= max_subdivisions:
-                    break
-                
-                # Increase grid size
-                grid_size += 1
+            lat_step = (radius * 2) / 111000 / points_per_side  # Convert meters to approximate degrees
+            lng_step = lat_step / math.cos(math.radians(city_lat))  # Adjust for longitude compression
+            
+            # Calculate grid bounds
+            min_lat = city_lat - (lat_step * points_per_side / 2)
+            min_lng = city_lng - (lng_step * points_per_side / 2)
+            
+            # Create search points
+            search_points = [(min_lat + (i * lat_step) + (lat_step / 2), min_lng + (j * lng_step) + (lng_step / 2))
+                             for i in range(points_per_side) for j in range(points_per_side)]
             
             # Perform search at each point
             sub_radius = radius / (grid_size * 0.75)  # Reduce radius based on grid size with some overlap
             
-            for i, (lat, lng) in enumerate(search_points):
-                if i >= max_subdivisions:
-                    break
-                
-                logger.info(f"Scanning subdivision {i+1}/{len(search_points)}: {lat}, {lng}")
-                hotels = self.discover_by_location(f"{lat},{lng}", int(sub_radius))
-                
-                # Add new hotels (avoid duplicates)
-                new_hotels = [h for h in hotels if not self._is_duplicate_hotel(h, all_hotels)]
+            # The subdivisions are independent searches, so run them at the same time
+            with concurrent.futures.ThreadPoolExecutor(max_workers=self.max_area_workers) as executor:
+                futures = []
+                for i, (lat, lng) in enumerate(search_points[:max_subdivisions]):
+                    logger.info(f"Scanning subdivision {i+1}/{len(search_points)}: {lat}, {lng}")
+                    futures.append(executor.submit(self.discover_by_location, f"{lat},{lng}", int(sub_radius)))
+            
+            # Add new hotels (avoid duplicates), in subdivision order so the same hotels are kept every run
+            batches = [future.result() for future in futures]
+            for i, new_hotels in enumerate(self._new_hotels_per_batch(batches)):
                 all_hotels.extend(new_hotels)
-                
                 logger.info(f"Found {len(new_hotels)} new hotels in subdivision {i+1}")
                 processed_areas += 1
         
@@ -859,12 +1886,7 @@ class DataDiscovery:
         saved_count = 0
         if self.db and all_hotels:
             logger.info(f"Saving {len(all_hotels)} hotels to database")
-            for hotel in all_hotels:
-                try:
-                    hotel_id = self.db.save_hotel(hotel)
-                    saved_count += 1
-                except Exception as e:
-                    logger.error(f"Error saving hotel to database: {e}")
+            saved_count = self._save_hotels(all_hotels, skip_errors=True)
         
         logger.info(f"City scan complete. Found {len(all_hotels)} hotels in {processed_areas} areas. Saved {saved_count} to database.")
         
@@ -882,6 +1904,70 @@ class DataDiscovery:
         """
         Get coordinates for a city using geocoding
         
+        Args:
+            location (str): City name, optionally with country
+            
+        Returns:
+            Optional[Tuple[float, float]]: Coordinates (latitude, longitude) or None if not found
+        """
+        # Places don't move, so answers are reused from memory, the local database or the results cache
+        key = " ".join(str(location).split()).lower()
+        if key in self.geocode_cache:
+            self.geocode_cache.move_to_end(key)
+            return self.geocode_cache[key]
+        
+        coordinates = None
+        if self.geocode_db is not None:
+            try:
+                with self.geocode_db_lock:
+                    row = self.geocode_db.execute(
+                        "SELECT lat, lng FROM geocode_cache WHERE q = ? AND fetched_at > ?",
+                        (key, int(time.time()) - GEOCODE_CACHE_TTL)
+                    ).fetchone()
+                if row:
+                    coordinates = (row[0], row[1])
+            except Exception as e:
+                logger.warning(f"Error reading from geocode cache database: {e}")
+        
+        cache_key = f"mr:v1:geo:{hashlib.sha256(key.encode('utf-8')).hexdigest()}"
+        if coordinates is None and self.cache is not None:
+            try:
+                cached = self.cache.get(cache_key)
+                if cached:
+                    coordinates = tuple(json.loads(cached))
+            except Exception as e:
+                logger.warning(f"Error reading from cache: {e}")
+        
+        if coordinates is None:
+            coordinates = self._geocode(location)
+            if coordinates and self.cache is not None:
+                try:
+                    self.cache.setex(cache_key, GEOCODE_CACHE_TTL, json.dumps(coordinates))
+                except Exception as e:
+                    logger.warning(f"Error writing to cache: {e}")
+            if coordinates and self.geocode_db is not None:
+                try:
+                    with self.geocode_db_lock:
+                        self.geocode_db.execute(
+                            "INSERT OR REPLACE INTO geocode_cache (q, lat, lng, fetched_at) VALUES (?, ?, ?, ?)",
+                            (key, coordinates[0], coordinates[1], int(time.time()))
+                        )
+                        self.geocode_db.commit()
+                except Exception as e:
+                    logger.warning(f"Error writing to geocode cache database: {e}")
+        
+        # Failed lookups are not remembered so they are retried next time
+        if coordinates:
+            self.geocode_cache[key] = coordinates
+            if len(self.geocode_cache) > GEOCODE_CACHE_SIZE:
+                self.geocode_cache.popitem(last=False)
+        
+        return coordinates
+    
+    def _geocode(self, location: str) -> Optional[Tuple[float, float]]:
+        """
+        Look up the coordinates of a location with the scraper or Nominatim
+        
         Args:
             location (str): City name, optionally with country
             
@@ -894,19 +1980,14 @@ class DataDiscovery:
                 return self.scraper._get_coordinates(location)
             
             # Fallback to direct Nominatim API call
-            nominatim_url = "https://nominatim.openstreetmap.org/search"
+            nominatim_url = NOMINATIM_URL + "search"
             params = {
                 "q": location,
                 "format": "json",
                 "limit": 1
             }
             
-            # Add contact information (required by Nominatim)
-            headers = {
-                "User-Agent": "Map_researcher0.4"
-            }
-            
-            response = requests.get(nominatim_url, params=params, headers=headers)
+            response = self.session.get(nominatim_url, params=params)
             data = response.json()
             
             if data and len(data) > 0:
@@ -954,14 +2035,13 @@ class DataDiscovery:
                 # Add update metadata
                 hotel_data['last_updated'] = datetime.now().isoformat()
                 
-                # Track changes for history
-                changes = {}
-                for key, value in hotel_data.items():
-                    if key in existing_hotel and existing_hotel[key] != value:
-                        changes[key] = {
-                            'old': existing_hotel[key],
-                            'new': value
-                        }
+                # Track changes for history (only fields present on both sides)
+                common_fields = (hotel_data.keys() & existing_hotel.keys()) - DIFF_EXCLUDED_FIELDS
+                changes = {
+                    key: {'old': existing_hotel[key], 'new': hotel_data[key]}
+                    for key in hotel_data
+                    if key in common_fields and existing_hotel[key] != hotel_data[key]
+                }
                 
                 # Update in database
                 success = self.db.update_hotel(hotel_id, hotel_data)
@@ -1074,18 +2154,26 @@ class DataDiscovery:
                 if business_data:
                     temporal_updates['business_records'] = business_data
                     
-                    # Record ownership changes if found
-                    if hasattr(self.db, 'record_hotel_history'):
-                        for record in business_data:
-                            if record.get('event_type') == 'ownership_change':
-                                self.db.record_hotel_history(
-                                    hotel_id=hotel_id,
-                                    event_type='ownership_change',
-                                    old_value=record.get('old_owner'),
-                                    new_value=record.get('new_owner'),
-                                    source='business_registry',
-                                    event_date=record.get('timestamp')
-                                )
+                    # Record ownership changes if found, in one batch when the
+                    # database supports it
+                    history_rows = [
+                        (hotel_id, 'ownership_change', record.get('old_owner'),
+                         record.get('new_owner'), 'business_registry', record.get('timestamp'))
+                        for record in business_data
+                        if record.get('event_type') == 'ownership_change'
+                    ]
+                    if history_rows and hasattr(self.db, 'record_hotel_history_bulk'):
+                        self.db.record_hotel_history_bulk(history_rows)
+                    elif history_rows and hasattr(self.db, 'record_hotel_history'):
+                        for row_hotel_id, event_type, old_value, new_value, source, event_date in history_rows:
+                            self.db.record_hotel_history(
+                                hotel_id=row_hotel_id,
+                                event_type=event_type,
+                                old_value=old_value,
+                                new_value=new_value,
+                                source=source,
+                                event_date=event_date
+                            )
             except Exception as e:
                 logger.error(f"Error searching business records: {e}")
         
@@ -1182,17 +2270,36 @@ class DataDiscovery:
                 except Exception as e:
                     logger.error(f"Error searching {platform['name']}: {e}")
         
-        # Calculate similarity and distance for each result
+        # Calculate similarity for each result
+        located = []
         for result in results:
             try:
-                # Calculate name similarity
                 if hotel_data.get('name') and result.get('name'):
                     result['name_similarity'] = self._calculate_name_similarity(
                         hotel_data['name'], result['name']
                     )
-                
-                # Calculate distance
-                if result.get('latitude') and result.get('longitude'):
+            except Exception as e:
+                logger.error(f"Error calculating similarity/distance: {e}")
+                continue
+            
+            if result.get('latitude') and result.get('longitude'):
+                located.append(result)
+        
+        # Calculate distances of all located results in one vectorized pass
+        distances = None
+        if NUMPY_AVAILABLE and located:
+            try:
+                distances = self._haversine_vec(lat, lng, [result['latitude'] for result in located],
+                                                [result['longitude'] for result in located]) * 1000  # Convert to meters
+            except (TypeError, ValueError):
+                # A malformed coordinate; go one by one so only that listing is skipped
+                distances = None
+        
+        for index, result in enumerate(located):
+            try:
+                if distances is not None:
+                    result['distance'] = float(distances[index])
+                else:
                     result['distance'] = self._haversine_distance(
                         lat, lng, result['latitude'], result['longitude']
                     ) * 1000  # Convert to meters
@@ -1216,40 +2323,45 @@ class DataDiscovery:
         Returns:
             float: Similarity score (0-1)
         """
-        # Simple implementation of Levenshtein distance
-        # For production, consider using a dedicated library
+        # Compare case-, accent- and width-insensitively
+        s1 = _name_key(name1)
+        s2 = _name_key(name2)
+        if s1 == s2:
+            return 1.0
         
-        # Convert to lowercase
-        s1 = name1.lower()
-        s2 = name2.lower()
+        if RAPIDFUZZ_AVAILABLE:
+            return Levenshtein.normalized_similarity(s1, s2)
         
-        # Create matrix
+        if NUMBA_AVAILABLE:
+            max_len = max(len(s1), len(s2))
+            if max_len == 0:
+                return 1.0
+            return 1.0 - (levenshtein_numba(code_points(s1), code_points(s2)) / max_len)
+        
+        # Simple implementation of Levenshtein distance, keeping only two rows of the matrix
         rows = len(s1) + 1
         cols = len(s2) + 1
-        distance = [[0 for _ in range(cols)] for _ in range(rows)]
-        
-        # Initialize first row and column
-        for i in range(rows):
-            distance[i][0] = i
-        for j in range(cols):
-            distance[0][j] = j
+        prev = array('i', range(cols))
+        curr = array('i', [0]) * cols
         
         # Calculate distance
         for i in range(1, rows):
+            curr[0] = i
             for j in range(1, cols):
                 cost = 0 if s1[i-1] == s2[j-1] else 1
-                distance[i][j] = min(
-                    distance[i-1][j] + 1,      # deletion
-                    distance[i][j-1] + 1,      # insertion
-                    distance[i-1][j-1] + cost  # substitution
+                curr[j] = min(
+                    prev[j] + 1,        # deletion
+                    curr[j-1] + 1,      # insertion
+                    prev[j-1] + cost    # substitution
                 )
+            prev, curr = curr, prev
         
         # Calculate similarity score
         max_len = max(len(s1), len(s2))
         if max_len == 0:
             return 1.0
         
-        return 1.0 - (distance[rows-1][cols-1] / max_len)
+        return 1.0 - (prev[cols-1] / max_len)
 
 # If run directly, display module info
 if __name__ == "__main__":
@@ -12,12 +12,267 @@ import time
 import json
 import logging
 import csv
+import importlib.util
+from bisect import bisect_right
+from collections import OrderedDict
+from functools import lru_cache
+from itertools import chain, count, islice
 from typing import Dict, List, Any, Tuple, Optional, Union
 from datetime import datetime, timedelta
 
+# xlsxwriter is only imported by the first Excel export (see _xlsxwriter), so that
+# CSV, JSON and map exports do not pay for loading it
+XLSXWRITER_AVAILABLE = importlib.util.find_spec('xlsxwriter') is not None
+
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
 # Initialize logger
 logger = logging.getLogger("export_module")
 
+# Hotels fetched from the database at a time when it can stream query results
+EXPORT_CHUNK_ROWS = 50000
+
+# Buffer size for export files, so large exports reach the disk in few, large writes
+EXPORT_WRITE_BUFFER = 1 << 20
+
+# Maps with at least this many hotels build their markers in the browser (FastMarkerCluster)
+FAST_MARKER_CLUSTER_MIN = 500
+
+# Builds a marker from a [lat, lng, tooltip, popup HTML, icon color] row, like folium.Marker does
+FAST_MARKER_CALLBACK = """function (row) {
+    var marker = L.marker(new L.LatLng(row[0], row[1]));
+    marker.setIcon(L.AwesomeMarkers.icon(
+        {icon: 'hotel', iconColor: 'white', markerColor: row[4], prefix: 'fa', extraClasses: 'fa-rotate-0'}));
+    marker.bindTooltip('<div>' + row[2] + '</div>', {sticky: true});
+    marker.bindPopup(row[3], {maxWidth: 300});
+    return marker;
+}"""
+
+# Risk levels by risk score: below 3 is low, below 7 medium, otherwise high
+RISK_SCORE_THRESHOLDS = (3, 7)
+RISK_LEVELS = ('low', 'medium', 'high')
+RISK_LEVEL_RANKS = {level: rank for rank, level in enumerate(RISK_LEVELS)}
+
+# Map colors: risk level text in popups, marker icons by data source, else by risk rank
+RISK_COLORS = {'high': 'red', 'medium': 'orange', 'low': 'green'}
+SOURCE_ICON_COLORS = {'Google Places': 'red', 'OpenStreetMap': 'green'}
+RISK_ICON_COLORS = ('blue', 'orange', 'darkred')
+
+# Query results kept for re-exporting the same hotels in another format, and for how many seconds
+EXPORT_QUERY_CACHE_SIZE = 8
+EXPORT_QUERY_CACHE_TTL = 60
+
+VIOLATIONS_REPORT_TEMPLATE = """<!DOCTYPE html>
+<html>
+<head>
+    <meta charset="utf-8">
+    <meta name="viewport" content="width=device-width, initial-scale=1">
+    <title>Hotel Violations Report</title>
+    <style>
+        body { font-family: Arial, sans-serif; margin: 0; padding: 20px; }
+        h1, h2, h3 { color: #333; }
+        .container { max-width: 1200px; margin: 0 auto; }
+        .header { background-color: #f2f2f2; padding: 20px; border-radius: 5px; margin-bottom: 20px; }
+        .section { margin-bottom: 30px; }
+        table { border-collapse: collapse; width: 100%; }
+        th, td { border: 1px solid #ddd; padding: 8px; }
+        th { background-color: #f2f2f2; text-align: left; }
+        tr:nth-child(even) { background-color: #f9f9f9; }
+        .high { color: #d9534f; }
+        .medium { color: #f0ad4e; }
+        .low { color: #5cb85c; }
+        .summary-box { display: inline-block; width: 200px; height: 100px; margin: 10px;
+                       padding: 15px; border-radius: 5px; text-align: center; }
+        .high-bg { background-color: #ffebee; }
+        .medium-bg { background-color: #fff8e1; }
+        .low-bg { background-color: #e8f5e9; }
+        .recommendations { background-color: #e3f2fd; padding: 15px; border-radius: 5px; }
+    </style>
+</head>
+<body>
+    <div class="container">
+        <div class="header">
+            <h1>Hotel Violations Report</h1>
+            <p>Generated on: {{ generated_at }}</p>
+        </div>
+        
+        <div class="section">
+            <h2>Summary</h2>
+            <div class="summary-box high-bg">
+                <h3>High Risk</h3>
+                <p>{{ summary.get('high_risk_count', 0) }}</p>
+            </div>
+            <div class="summary-box medium-bg">
+                <h3>Medium Risk</h3>
+                <p>{{ summary.get('medium_risk_count', 0) }}</p>
+            </div>
+            <div class="summary-box low-bg">
+                <h3>Low Risk</h3>
+                <p>{{ summary.get('low_risk_count', 0) }}</p>
+            </div>
+            <p>Total Hotels Analyzed: {{ summary.get('total_hotels', 0) }}</p>
+        </div>
+        
+        <div class="section">
+            <h2>Risk Factors</h2>
+            <table>
+                <tr>
+                    <th>Risk Factor</th>
+                    <th>Count</th>
+                </tr>
+                {%- for factor, count in risk_factors.items() %}
+                <tr>
+                    <td>{{ factor }}</td>
+                    <td>{{ count }}</td>
+                </tr>
+                {%- endfor %}
+            </table>
+        </div>
+        
+        <div class="section recommendations">
+            <h2>Recommendations</h2>
+            <ul>
+                {%- for rec in recommendations %}
+                <li class="{{ rec.get('priority', 'medium') }}">{{ rec.get('description', '') }}</li>
+                {%- endfor %}
+            </ul>
+        </div>
+        {%- if high_risk_hotels %}
+        
+        <div class="section">
+            <h2>High Risk Hotels</h2>
+            <table>
+                <tr>
+                    <th>ID</th>
+                    <th>Name</th>
+                    <th>Address</th>
+                    <th>Risk Score</th>
+                    <th>Risk Factors</th>
+                </tr>
+                {%- for hotel in high_risk_hotels %}
+                {%- set risk_analysis = hotel.get('risk_analysis') or {} %}
+                <tr>
+                    <td>{{ hotel.get('id', '') }}</td>
+                    <td>{{ hotel.get('name', '') }}</td>
+                    <td>{{ hotel.get('address', '') }}</td>
+                    <td class="high">{{ risk_analysis.get('risk_score', 0) }}</td>
+                    <td><ul>{% for factor in risk_analysis.get('risk_factors', []) %}<li>{{ factor.get('details', '') }}</li>{% endfor %}</ul></td>
+                </tr>
+                {%- endfor %}
+            </table>
+        </div>
+        {%- endif %}
+    </div>
+</body>
+</html>
+"""
+
+# Timeline CSS class of an event: the first rule whose keyword is in the lowercased event type
+TIMELINE_EVENT_CLASSES = (
+    ('name', 'name-change'),
+    ('owner', 'ownership-change'),
+    ('status', 'status-change'),
+    ('classification', 'status-change'),
+    ('platform', 'platform-change'),
+    ('listing', 'platform-change'),
+)
+
+# HTML special characters and their entities, for text written into the timeline page
+HTML_ESCAPES = str.maketrans({'&': '&amp;', '<': '&lt;', '>': '&gt;', '"': '&quot;'})
+
+# One hotel history event on the timeline page, filled in with str.format
+TIMELINE_EVENT_TEMPLATE = """
+            <div class="{container_class}">
+                <div class="date">{event_date}</div>
+                <div class="content {event_class}">
+                    <h3>{event_type}</h3>
+                    <p>From: {old_value}</p>
+                    <p>To: {new_value}</p>
+                    <p>Source: {source}</p>
+                </div>
+            </div>
+"""
+
+@lru_cache(maxsize=1)
+def _xlsxwriter():
+    """Import xlsxwriter on first use"""
+    import xlsxwriter
+    return xlsxwriter
+
+@lru_cache(maxsize=1)
+def _violations_report_template():
+    """Compile the violations report template once (values are HTML-escaped)"""
+    import jinja2
+    return jinja2.Environment(autoescape=True).from_string(VIOLATIONS_REPORT_TEMPLATE)
+
+def _escape_html(value) -> str:
+    """Text of a value with HTML special characters escaped"""
+    return str(value).translate(HTML_ESCAPES)
+
+def _score_risk_level(risk_score) -> str:
+    """Risk level ('low', 'medium' or 'high') for a numeric risk score"""
+    return RISK_LEVELS[bisect_right(RISK_SCORE_THRESHOLDS, risk_score)]
+
+def _project_rows(data, fields: List[str], default: Any = ''):
+    """
+    Project hotels onto a fixed list of columns
+    
+    Args:
+        data: Iterable of hotel dicts
+        fields: Columns to keep, in output order
+        default: Value for fields a hotel does not have
+        
+    Returns:
+        Generator of row lists, one per hotel
+    """
+    for hotel in data:
+        get = hotel.get
+        yield [get(k, default) for k in fields]
+
+class HotelStream:
+    """
+    Hotels matching a query, read from the database in batches
+    
+    Can be iterated more than once (each pass runs the query again), so
+    exports that need several passes never hold every hotel in memory.
+    Testing the stream for emptiness starts the first pass, which then
+    resumes from the hotel it read instead of running the query again.
+    """
+    
+    def __init__(self, db, query: Dict, chunk_rows: int = EXPORT_CHUNK_ROWS):
+        """
+        Initialize the stream
+        
+        Args:
+            db: Database instance with search_hotels_iter
+            query: Query to run
+            chunk_rows: Hotels fetched from the database at a time
+        """
+        self.db = db
+        self.query = query
+        self.chunk_rows = chunk_rows
+        self._pending = None
+    
+    def __iter__(self):
+        if self._pending is not None:
+            pending, self._pending = self._pending, None
+            return pending
+        return iter(self.db.search_hotels_iter(self.query, batch=self.chunk_rows))
+    
+    def __bool__(self):
+        if self._pending is None:
+            hotels = iter(self)
+            first = next(hotels, None)
+            if first is None:
+                return False
+            # Put the hotel back in front of the rest of the pass
+            self._pending = chain([first], hotels)
+        return True
+
 class ExportModule:
     """Class for data and report export operations"""
     
@@ -31,9 +286,45 @@ class ExportModule:
         """
         self.db = db
         self.scraper = scraper
+        self.query_cache = OrderedDict()  # Query JSON -> (fetch time, hotels), least recent first
+    
+    def _query_export_data(self, query: Dict = None, chunk_rows: int = EXPORT_CHUNK_ROWS):
+        """
+        Get the hotels matching a query for export
+        
+        Results read in one piece are reused for EXPORT_QUERY_CACHE_TTL seconds,
+        so exporting the same hotels in several formats queries the database once
+        
+        Args:
+            query: Query to run
+            chunk_rows: Hotels read at a time, if the database can stream results
+            
+        Returns:
+            List[Dict] or HotelStream: Hotels to export
+        """
+        if hasattr(self.db, 'search_hotels_iter'):
+            logger.info(f"Streaming hotels for export in batches of {chunk_rows}")
+            return HotelStream(self.db, query or {}, chunk_rows)
+        
+        key = json.dumps(query or {}, sort_keys=True, default=str)
+        cached = self.query_cache.get(key)
+        if cached and time.monotonic() - cached[0] < EXPORT_QUERY_CACHE_TTL:
+            self.query_cache.move_to_end(key)
+            logger.info(f"Reusing {len(cached[1])} hotels retrieved for the same query")
+            return cached[1]
+        
+        data = self.db.search_hotels(query or {})
+        logger.info(f"Retrieved {len(data)} hotels for export")
+        
+        self.query_cache[key] = (time.monotonic(), data)
+        self.query_cache.move_to_end(key)
+        if len(self.query_cache) > EXPORT_QUERY_CACHE_SIZE:
+            self.query_cache.popitem(last=False)
+        return data
     
     def export_excel(self, data: List[Dict] = None, output_path: str = None, 
-                    format_type: str = 'detailed', query: Dict = None) -> Dict:
+                    format_type: str = 'detailed', query: Dict = None,
+                    chunk_rows: int = EXPORT_CHUNK_ROWS, low_memory: bool = False) -> Dict:
         """
         Export data to Excel format
         
@@ -42,6 +333,9 @@ class ExportModule:
             output_path: Output file path
             format_type: Export format type (simple, detailed, multi_sheet)
             query: Query to use if data not provided
+            chunk_rows: Hotels read from the database at a time, if it can stream results
+            low_memory: Flush each row to the file as it is written, at the cost of a larger
+                file (always on for results streamed from the database)
             
         Returns:
             Dict: Export result
@@ -56,8 +350,7 @@ class ExportModule:
         # Get data if not provided
         if not data and self.db:
             try:
-                data = self.db.search_hotels(query or {})
-                logger.info(f"Retrieved {len(data)} hotels for export")
+                data = self._query_export_data(query, chunk_rows)
             except Exception as e:
                 logger.error(f"Error retrieving data: {e}")
                 return {"error": f"Database error: {str(e)}"}
@@ -67,144 +360,175 @@ class ExportModule:
             return {"error": "No data to export"}
         
         try:
-            # Import pandas and openpyxl for Excel export
-            import pandas as pd
-            from openpyxl import Workbook
-            from openpyxl.utils.dataframe import dataframe_to_rows
-            from openpyxl.styles import Font, Alignment, PatternFill
-            
-            # Create workbook
-            wb = Workbook()
+            # xlsxwriter is faster and writes smaller files; openpyxl is the fallback
+            # and always streams rows to the file instead of keeping them as cells
+            if XLSXWRITER_AVAILABLE:
+                # Links are written as plain text, as openpyxl does
+                options = {'strings_to_urls': False}
+                if low_memory or isinstance(data, HotelStream):
+                    # Rows go straight to the sheet XML (strings inline, no shared string table)
+                    options['constant_memory'] = True
+                wb = _xlsxwriter().Workbook(output_path, options)
+            else:
+                from openpyxl import Workbook
+                wb = Workbook(write_only=True)
+            header_format = self._excel_header_format(wb)
             
             if format_type == 'simple':
                 # Simple format with basic fields
-                ws = wb.active
-                ws.title = "Hotels"
-                
-                # Define fields to export
                 fields = ['id', 'name', 'address', 'city', 'country', 'stars', 'data_source']
-                
-                # Create DataFrame with selected fields
-                df = pd.DataFrame([{k: h.get(k, '') for k in fields} for h in data])
-                
-                # Add data to worksheet
-                for r in dataframe_to_rows(df, index=False, header=True):
-                    ws.append(r)
-                
-                # Format header
-                for cell in ws[1]:
-                    cell.font = Font(bold=True)
-                    cell.fill = PatternFill(start_color="E0E0E0", end_color="E0E0E0", fill_type="solid")
+                record_count = self._write_excel_sheet(wb, header_format, "Hotels", fields,
+                                                       _project_rows(data, fields))
             
             elif format_type == 'detailed':
-                # Detailed format with all fields in one sheet
-                ws = wb.active
-                ws.title = "Hotels Detailed"
-                
-                # Add all fields
-                df = pd.DataFrame(data)
-                
-                # Add data to worksheet
-                for r in dataframe_to_rows(df, index=False, header=True):
-                    ws.append(r)
-                
-                # Format header
-                for cell in ws[1]:
-                    cell.font = Font(bold=True)
-                    cell.fill = PatternFill(start_color="E0E0E0", end_color="E0E0E0", fill_type="solid")
+                # Detailed format with all fields in one sheet, in order of first appearance
+                fields = list({k: None for h in data for k in h})
+                record_count = self._write_excel_sheet(wb, header_format, "Hotels Detailed", fields,
+                                                       _project_rows(data, fields, None))
             
             else:  # multi_sheet
-                # Multiple sheets for different aspects
+                # Multiple sheets for different aspects, all filled in one pass over the hotels
                 # Sheet 1: Basic Info
-                ws_basic = wb.active
-                ws_basic.title = "Basic Info"
-                
                 basic_fields = ['id', 'name', 'address', 'city', 'country', 'stars', 'price_range', 'last_updated']
-                df_basic = pd.DataFrame([{k: h.get(k, '') for k in basic_fields} for h in data])
-                
-                for r in dataframe_to_rows(df_basic, index=False, header=True):
-                    ws_basic.append(r)
-                
-                # Format header
-                for cell in ws_basic[1]:
-                    cell.font = Font(bold=True)
-                    cell.fill = PatternFill(start_color="E0E0E0", end_color="E0E0E0", fill_type="solid")
                 
                 # Sheet 2: Contact Info
-                ws_contact = wb.create_sheet("Contact Info")
-                
                 contact_fields = ['id', 'name', 'phone', 'email', 'website']
-                df_contact = pd.DataFrame([{k: h.get(k, '') for k in contact_fields} for h in data])
-                
-                for r in dataframe_to_rows(df_contact, index=False, header=True):
-                    ws_contact.append(r)
-                
-                # Format header
-                for cell in ws_contact[1]:
-                    cell.font = Font(bold=True)
-                    cell.fill = PatternFill(start_color="E0E0E0", end_color="E0E0E0", fill_type="solid")
                 
                 # Sheet 3: Facilities
-                ws_facilities = wb.create_sheet("Facilities")
-                
                 facilities_fields = ['id', 'name', 'facilities', 'stars', 'price_range']
-                df_facilities = pd.DataFrame([{k: h.get(k, '') for k in facilities_fields} for h in data])
-                
-                for r in dataframe_to_rows(df_facilities, index=False, header=True):
-                    ws_facilities.append(r)
                 
-                # Format header
-                for cell in ws_facilities[1]:
-                    cell.font = Font(bold=True)
-                    cell.fill = PatternFill(start_color="E0E0E0", end_color="E0E0E0", fill_type="solid")
+                sheets = [
+                    (self._add_excel_sheet(wb, header_format, title, fields), fields)
+                    for title, fields in (("Basic Info", basic_fields),
+                                          ("Contact Info", contact_fields),
+                                          ("Facilities", facilities_fields))
+                ]
                 
-                # Sheet 4: Risk Analysis (if available)
-                risk_data = []
+                # Sheet 4: Risk Analysis (if available), added once its rows are known
+                risk_rows = []
+                record_count = 0
                 for hotel in data:
-                    if hotel.get('risk_analysis') or hotel.get('risk_score'):
-                        risk_level = (hotel.get('risk_analysis', {}).get('risk_level') or 
-                                     'high' if hotel.get('risk_score', 0) >= 7 else 
-                                     'medium' if hotel.get('risk_score', 0) >= 3 else 'low')
+                    record_count += 1
+                    get = hotel.get
+                    for add_row, fields in sheets:
+                        add_row([get(k, '') for k in fields])
+                    
+                    risk_analysis = get('risk_analysis') or {}
+                    risk_score = get('risk_score', 0)
+                    if risk_analysis or risk_score:
+                        # The stated level wins; otherwise it follows from the score
+                        risk_level = risk_analysis.get('risk_level') or _score_risk_level(risk_score)
                         
-                        risk_data.append({
-                            'id': hotel.get('id', ''),
-                            'name': hotel.get('name', ''),
-                            'risk_score': hotel.get('risk_score', hotel.get('risk_analysis', {}).get('risk_score', 0)),
-                            'risk_level': risk_level,
-                            'risk_factors': str(hotel.get('risk_analysis', {}).get('risk_factors', []))
-                        })
+                        risk_rows.append((
+                            get('id', ''),
+                            get('name', ''),
+                            get('risk_score', risk_analysis.get('risk_score', 0)),
+                            risk_level,
+                            str(risk_analysis.get('risk_factors', []))
+                        ))
                 
-                if risk_data:
-                    ws_risk = wb.create_sheet("Risk Analysis")
-                    df_risk = pd.DataFrame(risk_data)
-                    
-                    for r in dataframe_to_rows(df_risk, index=False, header=True):
-                        ws_risk.append(r)
-                    
-                    # Format header
-                    for cell in ws_risk[1]:
-                        cell.font = Font(bold=True)
-                        cell.fill = PatternFill(start_color="E0E0E0", end_color="E0E0E0", fill_type="solid")
+                if risk_rows:
+                    risk_fields = ['id', 'name', 'risk_score', 'risk_level', 'risk_factors']
+                    self._write_excel_sheet(wb, header_format, "Risk Analysis", risk_fields, risk_rows)
             
             # Save workbook
-            wb.save(output_path)
+            if XLSXWRITER_AVAILABLE:
+                wb.close()
+            else:
+                wb.save(output_path)
             
             logger.info(f"Excel export completed successfully: {output_path}")
             return {
                 "status": "success",
                 "message": f"Data exported successfully to {output_path}",
                 "file_path": output_path,
-                "record_count": len(data)
+                "record_count": record_count
             }
         
         except Exception as e:
-            logger.error(f"Error exporting to Excel: {e}")
-            import traceback
-            traceback.print_exc()
+            logger.exception(f"Error exporting to Excel: {e}")
             return {"error": f"Export failed: {str(e)}"}
     
+    def _excel_header_format(self, wb):
+        """
+        Get the header row style, created once per export
+        
+        Args:
+            wb: xlsxwriter Workbook, or openpyxl Workbook in write-only mode
+            
+        Returns:
+            xlsxwriter Format, or openpyxl (Font, PatternFill) pair
+        """
+        if XLSXWRITER_AVAILABLE:
+            return wb.add_format({'bold': True, 'bg_color': '#E0E0E0'})
+        
+        from openpyxl.styles import Font, PatternFill
+        return (Font(bold=True),
+                PatternFill(start_color="E0E0E0", end_color="E0E0E0", fill_type="solid"))
+    
+    def _write_excel_sheet(self, wb, header_format, title: str, fields: List[str], rows) -> int:
+        """
+        Add a sheet with a formatted, frozen header row to a workbook
+        
+        Args:
+            wb: xlsxwriter Workbook, or openpyxl Workbook in write-only mode
+            header_format: Header row style from _excel_header_format
+            title: Sheet title
+            fields: Column names for the header row
+            rows: Iterable of row values, in field order
+            
+        Returns:
+            int: Number of rows written, not counting the header
+        """
+        add_row = self._add_excel_sheet(wb, header_format, title, fields)
+        
+        row_count = 0
+        for row_count, row in enumerate(rows, 1):
+            add_row(row)
+        return row_count
+    
+    def _add_excel_sheet(self, wb, header_format, title: str, fields: List[str]):
+        """
+        Add a sheet with a formatted, frozen header row and return a row appender
+        
+        Rows can be appended to several sheets of the same workbook in turn.
+        
+        Args:
+            wb: xlsxwriter Workbook, or openpyxl Workbook in write-only mode
+            header_format: Header row style from _excel_header_format
+            title: Sheet title
+            fields: Column names for the header row
+            
+        Returns:
+            Callable taking one row of values, in field order
+        """
+        if XLSXWRITER_AVAILABLE:
+            ws = wb.add_worksheet(title)
+            ws.write_row(0, 0, fields, header_format)
+            ws.freeze_panes(1, 0)
+            rows = count(1)
+            return lambda row: ws.write_row(next(rows), 0, row)
+        
+        from openpyxl.cell import WriteOnlyCell
+        
+        ws = wb.create_sheet(title=title)
+        ws.freeze_panes = 'A2'
+        
+        # Format header (styles are shared by all header cells)
+        header_font, header_fill = header_format
+        header = []
+        for field in fields:
+            cell = WriteOnlyCell(ws, value=field)
+            cell.font = header_font
+            cell.fill = header_fill
+            header.append(cell)
+        ws.append(header)
+        
+        return ws.append
+    
     def export_csv(self, data: List[Dict] = None, output_path: str = None, 
-                  format_type: str = 'detailed', query: Dict = None) -> Dict:
+                  format_type: str = 'detailed', query: Dict = None,
+                  chunk_rows: int = EXPORT_CHUNK_ROWS) -> Dict:
         """
         Export data to CSV format
         
@@ -213,6 +537,7 @@ class ExportModule:
             output_path: Output file path
             format_type: Export format type (simple, detailed, multiple)
             query: Query to use if data not provided
+            chunk_rows: Hotels read from the database at a time, if it can stream results
             
         Returns:
             Dict: Export result
@@ -227,8 +552,7 @@ class ExportModule:
         # Get data if not provided
         if not data and self.db:
             try:
-                data = self.db.search_hotels(query or {})
-                logger.info(f"Retrieved {len(data)} hotels for export")
+                data = self._query_export_data(query, chunk_rows)
             except Exception as e:
                 logger.error(f"Error retrieving data: {e}")
                 return {"error": f"Database error: {str(e)}"}
@@ -244,28 +568,17 @@ class ExportModule:
                 fields = ['id', 'name', 'address', 'city', 'country', 'stars', 'data_source']
                 
                 # Create CSV file
-                with open(output_path, 'w', newline='', encoding='utf-8') as f:
-                    writer = csv.DictWriter(f, fieldnames=fields, extrasaction='ignore')
-                    writer.writeheader()
-                    for hotel in data:
-                        writer.writerow({k: hotel.get(k, '') for k in fields})
+                with open(output_path, 'w', newline='', encoding='utf-8', buffering=EXPORT_WRITE_BUFFER) as f:
+                    record_count = self._write_csv_tables([(f, fields)], data, chunk_rows)
             
             elif format_type == 'detailed':
                 # Detailed format with all fields
-                # Get all possible field names
-                all_fields = set()
-                for hotel in data:
-                    all_fields.update(hotel.keys())
-                
-                # Sort fields for consistent output
-                sorted_fields = sorted(all_fields)
+                # Get all possible field names, sorted for consistent output
+                sorted_fields = sorted({k for hotel in data for k in hotel})
                 
                 # Create CSV file
-                with open(output_path, 'w', newline='', encoding='utf-8') as f:
-                    writer = csv.DictWriter(f, fieldnames=sorted_fields, extrasaction='ignore')
-                    writer.writeheader()
-                    for hotel in data:
-                        writer.writerow(hotel)
+                with open(output_path, 'w', newline='', encoding='utf-8', buffering=EXPORT_WRITE_BUFFER) as f:
+                    record_count = self._write_csv_tables([(f, sorted_fields)], data, chunk_rows)
             
             else:  # 'multiple'
                 # Multiple CSV files for different aspects
@@ -276,21 +589,15 @@ class ExportModule:
                 basic_fields = ['id', 'name', 'address', 'city', 'country', 'stars', 'price_range', 'last_updated']
                 basic_path = f"{base_path}_basic.csv"
                 
-                with open(basic_path, 'w', newline='', encoding='utf-8') as f:
-                    writer = csv.DictWriter(f, fieldnames=basic_fields, extrasaction='ignore')
-                    writer.writeheader()
-                    for hotel in data:
-                        writer.writerow({k: hotel.get(k, '') for k in basic_fields})
-                
                 # Contact info CSV
                 contact_fields = ['id', 'name', 'phone', 'email', 'website']
                 contact_path = f"{base_path}_contact.csv"
                 
-                with open(contact_path, 'w', newline='', encoding='utf-8') as f:
-                    writer = csv.DictWriter(f, fieldnames=contact_fields, extrasaction='ignore')
-                    writer.writeheader()
-                    for hotel in data:
-                        writer.writerow({k: hotel.get(k, '') for k in contact_fields})
+                # Both files are filled in the same pass over the hotels
+                with open(basic_path, 'w', newline='', encoding='utf-8', buffering=EXPORT_WRITE_BUFFER) as basic_file, \
+                     open(contact_path, 'w', newline='', encoding='utf-8', buffering=EXPORT_WRITE_BUFFER) as contact_file:
+                    record_count = self._write_csv_tables(
+                        [(basic_file, basic_fields), (contact_file, contact_fields)], data, chunk_rows)
                 
                 # Set output path to the base path for result
                 output_path = base_path
@@ -300,17 +607,47 @@ class ExportModule:
                 "status": "success",
                 "message": f"Data exported successfully to {output_path}",
                 "file_path": output_path,
-                "record_count": len(data)
+                "record_count": record_count
             }
         
         except Exception as e:
-            logger.error(f"Error exporting to CSV: {e}")
-            import traceback
-            traceback.print_exc()
+            logger.exception(f"Error exporting to CSV: {e}")
             return {"error": f"Export failed: {str(e)}"}
     
+    def _write_csv_tables(self, tables: List[Tuple[Any, List[str]]], data: List[Dict],
+                          chunk_rows: int = EXPORT_CHUNK_ROWS) -> int:
+        """
+        Write one or more CSV files from a single pass over the hotels
+        
+        Each file gets a header row and one row per hotel with its fields.
+        
+        Args:
+            tables: (file opened for writing with newline='', column names) pairs
+            data: Hotels to write; missing fields are left empty
+            chunk_rows: Hotels handed to the writers at a time
+            
+        Returns:
+            int: Number of hotels written
+        """
+        writers = []
+        for f, fields in tables:
+            writer = csv.writer(f)
+            writer.writerow(fields)
+            writers.append((writer, fields))
+        
+        row_count = 0
+        hotels = iter(data)
+        while True:
+            chunk = list(islice(hotels, chunk_rows))
+            if not chunk:
+                return row_count
+            for writer, fields in writers:
+                writer.writerows(_project_rows(chunk, fields))
+            row_count += len(chunk)
+    
     def export_json(self, data: List[Dict] = None, output_path: str = None, 
-                   format_type: str = 'detailed', query: Dict = None) -> Dict:
+                   format_type: str = 'detailed', query: Dict = None,
+                   chunk_rows: int = EXPORT_CHUNK_ROWS) -> Dict:
         """
         Export data to JSON format
         
@@ -319,6 +656,7 @@ class ExportModule:
             output_path: Output file path
             format_type: Export format type (simple, detailed)
             query: Query to use if data not provided
+            chunk_rows: Hotels read from the database at a time, if it can stream results
             
         Returns:
             Dict: Export result
@@ -333,8 +671,7 @@ class ExportModule:
         # Get data if not provided
         if not data and self.db:
             try:
-                data = self.db.search_hotels(query or {})
-                logger.info(f"Retrieved {len(data)} hotels for export")
+                data = self._query_export_data(query, chunk_rows)
             except Exception as e:
                 logger.error(f"Error retrieving data: {e}")
                 return {"error": f"Database error: {str(e)}"}
@@ -350,33 +687,59 @@ class ExportModule:
                 fields = ['id', 'name', 'address', 'city', 'country', 'stars', 'data_source']
                 
                 # Filter data to include only basic fields
-                filtered_data = [{k: h.get(k, '') for k in fields} for h in data]
+                filtered_data = ({k: h.get(k, '') for k in fields} for h in data)
                 
                 # Export to JSON
-                with open(output_path, 'w', encoding='utf-8') as f:
-                    json.dump(filtered_data, f, ensure_ascii=False, indent=2)
+                with open(output_path, 'wb', buffering=EXPORT_WRITE_BUFFER) as f:
+                    record_count = self._write_json_array(f, filtered_data)
             
             else:  # 'detailed'
                 # Export full data
-                with open(output_path, 'w', encoding='utf-8') as f:
-                    json.dump(data, f, ensure_ascii=False, indent=2)
+                with open(output_path, 'wb', buffering=EXPORT_WRITE_BUFFER) as f:
+                    record_count = self._write_json_array(f, data)
             
             logger.info(f"JSON export completed successfully: {output_path}")
             return {
                 "status": "success",
                 "message": f"Data exported successfully to {output_path}",
                 "file_path": output_path,
-                "record_count": len(data)
+                "record_count": record_count
             }
         
         except Exception as e:
-            logger.error(f"Error exporting to JSON: {e}")
-            import traceback
-            traceback.print_exc()
+            logger.exception(f"Error exporting to JSON: {e}")
             return {"error": f"Export failed: {str(e)}"}
     
+    def _write_json_array(self, f, records) -> int:
+        """
+        Write records as an indented UTF-8 JSON array, one record at a time
+        
+        The layout is the same as json.dump(list(records), f, ensure_ascii=False, indent=2);
+        records are serialized with orjson when it is installed
+        
+        Args:
+            f: Binary file opened for writing
+            records: Iterable of JSON-serializable dicts
+            
+        Returns:
+            int: Number of records written
+        """
+        record_count = 0
+        f.write(b"[")
+        for record in records:
+            if ORJSON_AVAILABLE:
+                encoded = orjson.dumps(record, option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS)
+            else:
+                encoded = json.dumps(record, ensure_ascii=False, indent=2).encode('utf-8')
+            f.write(b",\n  " if record_count else b"\n  ")
+            f.write(encoded.replace(b"\n", b"\n  "))
+            record_count += 1
+        f.write(b"\n]" if record_count else b"]")
+        return record_count
+    
     def export_map(self, data: List[Dict] = None, output_path: str = None, 
-                  query: Dict = None, map_title: str = None) -> Dict:
+                  query: Dict = None, map_title: str = None,
+                  chunk_rows: int = EXPORT_CHUNK_ROWS) -> Dict:
         """
         Export hotel data to interactive map (HTML)
         
@@ -385,22 +748,25 @@ class ExportModule:
             output_path: Output file path
             query: Query to use if data not provided
             map_title: Title for the map
+            chunk_rows: Hotels read from the database at a time, if it can stream results
             
         Returns:
             Dict: Export result
         """
         logger.info(f"Exporting data to map: {output_path}")
         
+        # One timestamp for both the default file name and the page itself
+        now = datetime.now()
+        
         # Set default output path if not provided
         if not output_path:
             os.makedirs("exports", exist_ok=True)
-            output_path = f"exports/hotels_map_{datetime.now().strftime('%Y%m%d_%H%M%S')}.html"
+            output_path = f"exports/hotels_map_{now.strftime('%Y%m%d_%H%M%S')}.html"
         
         # Get data if not provided
         if not data and self.db:
             try:
-                data = self.db.search_hotels(query or {})
-                logger.info(f"Retrieved {len(data)} hotels for map export")
+                data = self._query_export_data(query, chunk_rows)
             except Exception as e:
                 logger.error(f"Error retrieving data: {e}")
                 return {"error": f"Database error: {str(e)}"}
@@ -412,7 +778,7 @@ class ExportModule:
         try:
             # Import folium for map creation
             import folium
-            from folium.plugins import MarkerCluster
+            from folium.plugins import MarkerCluster, FastMarkerCluster
             
             # Filter hotels with coordinates
             hotels_with_coords = [h for h in data if h.get('latitude') and h.get('longitude')]
@@ -421,11 +787,13 @@ class ExportModule:
                 logger.error("No hotels with coordinates found")
                 return {"error": "No hotels with coordinates found"}
             
+            # Convert coordinates once, for the map center and the markers
+            lats = [float(h['latitude']) for h in hotels_with_coords]
+            lngs = [float(h['longitude']) for h in hotels_with_coords]
+            
             # Calculate map center (average of coordinates)
-            lat_sum = sum(float(h.get('latitude', 0)) for h in hotels_with_coords)
-            lng_sum = sum(float(h.get('longitude', 0)) for h in hotels_with_coords)
-            center_lat = lat_sum / len(hotels_with_coords)
-            center_lng = lng_sum / len(hotels_with_coords)
+            center_lat = sum(lats) / len(lats)
+            center_lng = sum(lngs) / len(lngs)
             
             # Create map
             title = map_title or f"Hotel Map ({len(hotels_with_coords)} hotels)"
@@ -434,67 +802,33 @@ class ExportModule:
             # Add title
             title_html = f'''
                 <h3 align="center" style="font-size:16px"><b>{title}</b></h3>
-                <p align="center">Generated on {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}</p>
+                <p align="center">Generated on {now.strftime('%Y-%m-%d %H:%M:%S')}</p>
             '''
             hotel_map.get_root().html.add_child(folium.Element(title_html))
             
-            # Use marker cluster for better performance with many markers
-            marker_cluster = MarkerCluster().add_to(hotel_map)
+            if len(hotels_with_coords) >= FAST_MARKER_CLUSTER_MIN:
+                # Markers are created in the browser from one data array
+                marker_rows = []
+                for hotel, lat, lng in zip(hotels_with_coords, lats, lngs):
+                    tooltip, popup_content, icon_color = self._map_marker_content(hotel)
+                    marker_rows.append([lat, lng, tooltip, popup_content, icon_color])
+                FastMarkerCluster(marker_rows, callback=FAST_MARKER_CALLBACK).add_to(hotel_map)
             
-            # Add markers for each hotel
-            for hotel in hotels_with_coords:
-                # Prepare tooltip content
-                tooltip = f"{hotel.get('name', 'Unknown Hotel')}"
-                
-                # Prepare popup content
-                popup_content = f"""
-                <div style="min-width:200px">
-                    <h4>{hotel.get('name', 'Unknown Hotel')}</h4>
-                    <p><b>Address:</b> {hotel.get('address', 'N/A')}</p>
-                """
+            else:
+                # Use marker cluster for better performance with many markers
+                marker_cluster = MarkerCluster().add_to(hotel_map)
                 
-                if hotel.get('stars'):
-                    popup_content += f"<p><b>Rating:</b> {hotel.get('stars')} ★</p>"
-                
-                if hotel.get('phone'):
-                    popup_content += f"<p><b>Phone:</b> {hotel.get('phone')}</p>"
-                
-                if hotel.get('website'):
-                    popup_content += f'<p><b>Website:</b> <a href="{hotel.get("website")}" target="_blank">{hotel.get("website")}</a></p>'
-                
-                popup_content += f"<p><b>Source:</b> {hotel.get('data_source', 'N/A')}</p>"
-                
-                # Add risk info if available
-                if hotel.get('risk_level') or hotel.get('risk_score') or hotel.get('risk_analysis'):
-                    risk_level = (hotel.get('risk_level') or 
-                                hotel.get('risk_analysis', {}).get('risk_level') or 
-                                ('high' if hotel.get('risk_score', 0) >= 7 else 
-                                'medium' if hotel.get('risk_score', 0) >= 3 else 'low'))
-                    
-                    risk_color = {'high': 'red', 'medium': 'orange', 'low': 'green'}.get(risk_level, 'gray')
+                # Add markers for each hotel
+                for hotel, lat, lng in zip(hotels_with_coords, lats, lngs):
+                    tooltip, popup_content, icon_color = self._map_marker_content(hotel)
                     
-                    popup_content += f'<p><b>Risk Level:</b> <span style="color:{risk_color};font-weight:bold;">{risk_level.upper()}</span></p>'
-                
-                popup_content += "</div>"
-                
-                # Set icon color based on data source
-                icon_color = 'blue'
-                if hotel.get('data_source') == 'Google Places':
-                    icon_color = 'red'
-                elif hotel.get('data_source') == 'OpenStreetMap':
-                    icon_color = 'green'
-                elif hotel.get('risk_level') == 'high' or (hotel.get('risk_score', 0) >= 7):
-                    icon_color = 'darkred'
-                elif hotel.get('risk_level') == 'medium' or (hotel.get('risk_score', 0) >= 3):
-                    icon_color = 'orange'
-                
-                # Create marker
-                folium.Marker(
-                    location=[float(hotel.get('latitude')), float(hotel.get('longitude'))],
-                    popup=folium.Popup(popup_content, max_width=300),
-                    tooltip=tooltip,
-                    icon=folium.Icon(color=icon_color, icon='hotel', prefix='fa')
-                ).add_to(marker_cluster)
+                    # Create marker
+                    folium.Marker(
+                        location=[lat, lng],
+                        popup=folium.Popup(popup_content, max_width=300),
+                        tooltip=tooltip,
+                        icon=folium.Icon(color=icon_color, icon='hotel', prefix='fa')
+                    ).add_to(marker_cluster)
             
             # Save map to file
             hotel_map.save(output_path)
@@ -508,11 +842,90 @@ class ExportModule:
             }
         
         except Exception as e:
-            logger.error(f"Error exporting to map: {e}")
-            import traceback
-            traceback.print_exc()
+            logger.exception(f"Error exporting to map: {e}")
             return {"error": f"Export failed: {str(e)}"}
     
+    def _map_marker_content(self, hotel: Dict) -> Tuple[str, str, str]:
+        """
+        Build the tooltip, popup HTML and icon color of a hotel's map marker
+        
+        Args:
+            hotel: Hotel data
+            
+        Returns:
+            Tuple[str, str, str]: Tooltip, popup HTML and icon color
+        """
+        name = hotel.get('name', 'Unknown Hotel')
+        stars = hotel.get('stars')
+        phone = hotel.get('phone')
+        website = hotel.get('website')
+        data_source = hotel.get('data_source')
+        stated_risk_level = hotel.get('risk_level')
+        risk_score = hotel.get('risk_score', 0)
+        risk_analysis = hotel.get('risk_analysis') or {}
+        
+        # Prepare tooltip content
+        tooltip = f"{name}"
+        
+        # Prepare popup content
+        popup_content = f"""
+        <div style="min-width:200px">
+            <h4>{name}</h4>
+            <p><b>Address:</b> {hotel.get('address', 'N/A')}</p>
+        """
+        
+        if stars:
+            popup_content += f"<p><b>Rating:</b> {stars} ★</p>"
+        
+        if phone:
+            popup_content += f"<p><b>Phone:</b> {phone}</p>"
+        
+        if website:
+            popup_content += f'<p><b>Website:</b> <a href="{website}" target="_blank">{website}</a></p>'
+        
+        popup_content += f"<p><b>Source:</b> {hotel.get('data_source', 'N/A')}</p>"
+        
+        # Add risk info if available
+        if stated_risk_level or risk_score or risk_analysis:
+            risk_level = (stated_risk_level or 
+                          risk_analysis.get('risk_level') or 
+                          _score_risk_level(risk_score))
+            
+            risk_color = RISK_COLORS.get(risk_level, 'gray')
+            
+            popup_content += f'<p><b>Risk Level:</b> <span style="color:{risk_color};font-weight:bold;">{risk_level.upper()}</span></p>'
+        
+        popup_content += "</div>"
+        
+        # Set icon color based on data source, else on the higher of the stated and scored risk
+        icon_color = SOURCE_ICON_COLORS.get(data_source)
+        if icon_color is None:
+            risk_rank = max(RISK_LEVEL_RANKS.get(stated_risk_level, 0),
+                            bisect_right(RISK_SCORE_THRESHOLDS, risk_score))
+            icon_color = RISK_ICON_COLORS[risk_rank]
+        
+        return tooltip, popup_content, icon_color
+    
+    def _output_dir_error(self, output_path: str) -> Optional[str]:
+        """
+        Create the directory of an output file and check that it can be written to
+        
+        Args:
+            output_path: Output file path
+            
+        Returns:
+            Optional[str]: Error message, or None if the file can be written
+        """
+        dirname = os.path.dirname(output_path) or '.'
+        try:
+            os.makedirs(dirname, exist_ok=True)
+        except OSError as e:
+            return f"Cannot create output directory {dirname}: {e}"
+        
+        if not os.access(dirname, os.W_OK):
+            return f"Output directory is not writable: {dirname}"
+        return None
+    
     def export_violations_report(self, data: Dict = None, output_path: str = None, 
                                 format_type: str = 'detailed') -> Dict:
         """
@@ -528,10 +941,18 @@ class ExportModule:
         """
         logger.info(f"Exporting violations report: {output_path}")
         
+        # One timestamp for both the default file name and the page itself
+        now = datetime.now()
+        
         # Set default output path if not provided
         if not output_path:
-            os.makedirs("exports", exist_ok=True)
-            output_path = f"exports/violations_report_{datetime.now().strftime('%Y%m%d_%H%M%S')}.html"
+            output_path = f"exports/violations_report_{now.strftime('%Y%m%d_%H%M%S')}.html"
+        
+        # Fail before doing any work if the file cannot be written
+        error = self._output_dir_error(output_path)
+        if error:
+            logger.error(error)
+            return {"error": error}
         
         # Generate report if not provided
         if not data and hasattr(self, 'violation_detection') and self.violation_detection:
@@ -547,150 +968,15 @@ class ExportModule:
             return {"error": "No report data to export"}
         
         try:
-            # Generate HTML report
-            html_content = f"""
-            <!DOCTYPE html>
-            <html>
-            <head>
-                <meta charset="utf-8">
-                <meta name="viewport" content="width=device-width, initial-scale=1">
-                <title>Hotel Violations Report</title>
-                <style>
-                    body {{ font-family: Arial, sans-serif; margin: 0; padding: 20px; }}
-                    h1, h2, h3 {{ color: #333; }}
-                    .container {{ max-width: 1200px; margin: 0 auto; }}
-                    .header {{ background-color: #f2f2f2; padding: 20px; border-radius: 5px; margin-bottom: 20px; }}
-                    .section {{ margin-bottom: 30px; }}
-                    table {{ border-collapse: collapse; width: 100%; }}
-                    th, td {{ border: 1px solid #ddd; padding: 8px; }}
-                    th {{ background-color: #f2f2f2; text-align: left; }}
-                    tr:nth-child(even) {{ background-color: #f9f9f9; }}
-                    .high {{ color: #d9534f; }}
-                    .medium {{ color: #f0ad4e; }}
-                    .low {{ color: #5cb85c; }}
-                    .summary-box {{ display: inline-block; width: 200px; height: 100px; margin: 10px;
-                                  padding: 15px; border-radius: 5px; text-align: center; }}
-                    .high-bg {{ background-color: #ffebee; }}
-                    .medium-bg {{ background-color: #fff8e1; }}
-                    .low-bg {{ background-color: #e8f5e9; }}
-                    .recommendations {{ background-color: #e3f2fd; padding: 15px; border-radius: 5px; }}
-                </style>
-            </head>
-            <body>
-                <div class="container">
-                    <div class="header">
-                        <h1>Hotel Violations Report</h1>
-                        <p>Generated on: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}</p>
-                    </div>
-                    
-                    <div class="section">
-                        <h2>Summary</h2>
-                        <div class="summary-box high-bg">
-                            <h3>High Risk</h3>
-                            <p>{data.get('summary', {}).get('high_risk_count', 0)}</p>
-                        </div>
-                        <div class="summary-box medium-bg">
-                            <h3>Medium Risk</h3>
-                            <p>{data.get('summary', {}).get('medium_risk_count', 0)}</p>
-                        </div>
-                        <div class="summary-box low-bg">
-                            <h3>Low Risk</h3>
-                            <p>{data.get('summary', {}).get('low_risk_count', 0)}</p>
-                        </div>
-                        <p>Total Hotels Analyzed: {data.get('summary', {}).get('total_hotels', 0)}</p>
-                    </div>
-            """
-            
-            # Add risk factors section
-            html_content += """
-                    <div class="section">
-                        <h2>Risk Factors</h2>
-                        <table>
-                            <tr>
-                                <th>Risk Factor</th>
-                                <th>Count</th>
-                            </tr>
-            """
-            
-            # Add risk factors
-            for factor, count in data.get('risk_factors', {}).items():
-                html_content += f"""
-                            <tr>
-                                <td>{factor}</td>
-                                <td>{count}</td>
-                            </tr>
-                """
-            
-            html_content += """
-                        </table>
-                    </div>
-            """
-            
-            # Add recommendations section
-            html_content += """
-                    <div class="section recommendations">
-                        <h2>Recommendations</h2>
-                        <ul>
-            """
-            
-            # Add recommendations
-            for rec in data.get('recommendations', []):
-                priority_class = rec.get('priority', 'medium')
-                html_content += f"""
-                            <li class="{priority_class}">{rec.get('description', '')}</li>
-                """
-            
-            html_content += """
-                        </ul>
-                    </div>
-            """
-            
-            # Add high risk hotels section if format_type is detailed
-            if format_type == 'detailed' and data.get('high_risk_hotels'):
-                html_content += """
-                    <div class="section">
-                        <h2>High Risk Hotels</h2>
-                        <table>
-                            <tr>
-                                <th>ID</th>
-                                <th>Name</th>
-                                <th>Address</th>
-                                <th>Risk Score</th>
-                                <th>Risk Factors</th>
-                            </tr>
-                """
-                
-                # Add high risk hotels
-                for hotel in data.get('high_risk_hotels', []):
-                    risk_factors_text = ""
-                    for factor in hotel.get('risk_analysis', {}).get('risk_factors', []):
-                        risk_factors_text += f"<li>{factor.get('details', '')}</li>"
-                    
-                    html_content += f"""
-                            <tr>
-                                <td>{hotel.get('id', '')}</td>
-                                <td>{hotel.get('name', '')}</td>
-                                <td>{hotel.get('address', '')}</td>
-                                <td class="high">{hotel.get('risk_analysis', {}).get('risk_score', 0)}</td>
-                                <td><ul>{risk_factors_text}</ul></td>
-                            </tr>
-                    """
-                
-                html_content += """
-                        </table>
-                    </div>
-                """
-            
-            # Close HTML
-            html_content += """
-                </div>
-            </body>
-            </html>
-            """
-            
-            # Write to file
-            with open(output_path, 'w', encoding='utf-8') as f:
-                f.write(html_content)
+            # Generate the HTML report straight into the file, as the template renders it
+            with open(output_path, 'w', encoding='utf-8', buffering=EXPORT_WRITE_BUFFER) as f:
+                f.writelines(_violations_report_template().generate(
+                    generated_at=now.strftime('%Y-%m-%d %H:%M:%S'),
+                    summary=data.get('summary', {}),
+                    risk_factors=data.get('risk_factors', {}),
+                    recommendations=data.get('recommendations', []),
+                    high_risk_hotels=data.get('high_risk_hotels', []) if format_type == 'detailed' else []
+                ))
             
             logger.info(f"Violations report export completed successfully: {output_path}")
             return {
@@ -700,9 +986,7 @@ class ExportModule:
             }
         
         except Exception as e:
-            logger.error(f"Error exporting violations report: {e}")
-            import traceback
-            traceback.print_exc()
+            logger.exception(f"Error exporting violations report: {e}")
             return {"error": f"Export failed: {str(e)}"}
     
     def export_timeline(self, hotel_id: str = None, output_path: str = None, 
@@ -720,10 +1004,18 @@ class ExportModule:
         """
         logger.info(f"Exporting timeline chart for hotel: {hotel_id}")
         
+        # One timestamp for both the default file name and the page itself
+        now = datetime.now()
+        
         # Set default output path if not provided
         if not output_path:
-            os.makedirs("exports", exist_ok=True)
-            output_path = f"exports/hotel_timeline_{hotel_id}_{datetime.now().strftime('%Y%m%d_%H%M%S')}.html"
+            output_path = f"exports/hotel_timeline_{hotel_id}_{now.strftime('%Y%m%d_%H%M%S')}.html"
+        
+        # Fail before doing any work if the file cannot be written
+        error = self._output_dir_error(output_path)
+        if error:
+            logger.error(error)
+            return {"error": error}
         
         # Get hotel data
         hotel_data = None
@@ -742,9 +1034,15 @@ class ExportModule:
         
         # Get hotel history
         history = []
+        history_sorted = False
         if hotel_id and self.db and hasattr(self.db, 'get_hotel_history'):
             try:
-                history = self.db.get_hotel_history(hotel_id)
+                try:
+                    # Let the database order the events by date when it supports it
+                    history = self.db.get_hotel_history(hotel_id, order_by='event_date')
+                    history_sorted = True
+                except TypeError:
+                    history = self.db.get_hotel_history(hotel_id)
                 logger.info(f"Retrieved {len(history)} history records for hotel")
             except Exception as e:
                 logger.error(f"Error retrieving hotel history: {e}")
@@ -755,90 +1053,81 @@ class ExportModule:
             return {"error": "No history records found for this hotel"}
         
         try:
-            # Generate HTML timeline
-            html_content = f"""
-            <!DOCTYPE html>
-            <html>
-            <head>
-                <meta charset="utf-8">
-                <meta name="viewport" content="width=device-width, initial-scale=1">
-                <title>Hotel Timeline - {hotel_name}</title>
-                <style>
-                    body {{ font-family: Arial, sans-serif; margin: 0; padding: 20px; }}
-                    h1, h2, h3 {{ color: #333; }}
-                    .container {{ max-width: 1200px; margin: 0 auto; }}
-                    .header {{ background-color: #f2f2f2; padding: 20px; border-radius: 5px; margin-bottom: 20px; }}
-                    .timeline {{ position: relative; max-width: 1200px; margin: 0 auto; }}
-                    .timeline::after {{ content: ''; position: absolute; width: 6px; background-color: #999; top: 0; bottom: 0; left: 50%; margin-left: -3px; }}
-                    .container-left {{ padding: 10px 40px; position: relative; background-color: inherit; width: 45%; left: 0; }}
-                    .container-right {{ padding: 10px 40px; position: relative; background-color: inherit; width: 45%; left: 50%; }}
-                    .content {{ padding: 20px; background-color: white; position: relative; border-radius: 6px; border: 1px solid #ddd; }}
-                    .container-left .content::after {{ content: " "; position: absolute; top: 22px; right: -15px; border-width: 10px 0 10px 15px; border-color: transparent transparent transparent white; border-style: solid; }}
-                    .container-right .content::after {{ content: " "; position: absolute; top: 22px; left: -15px; border-width: 10px 15px 10px 0; border-color: transparent white transparent transparent; border-style: solid; }}
-                    .name-change {{ background-color: #e3f2fd; }}
-                    .ownership-change {{ background-color: #fff8e1; }}
-                    .status-change {{ background-color: #ffebee; }}
-                    .platform-change {{ background-color: #e8f5e9; }}
-                    .date {{ position: relative; color: #666; }}
-                </style>
-            </head>
-            <body>
-                <div class="container">
-                    <div class="header">
-                        <h1>Timeline for {hotel_name}</h1>
-                        <p>Generated on: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}</p>
-                    </div>
-                    
-                    <div class="timeline">
-            """
-            
-            # Sort history by date
-            history.sort(key=lambda x: x.get('event_date', ''))
-            
-            # Add timeline events
-            for i, event in enumerate(history):
-                event_date = event.get('event_date', '').split('T')[0] if 'T' in event.get('event_date', '') else event.get('event_date', '')
-                event_type = event.get('event_type', '')
-                old_value = event.get('old_value', '')
-                new_value = event.get('new_value', '')
+            # Generate HTML timeline, writing each fragment to the file as it is built
+            with open(output_path, 'w', encoding='utf-8', buffering=EXPORT_WRITE_BUFFER) as f:
+                f.write(f"""
+                <!DOCTYPE html>
+                <html>
+                <head>
+                    <meta charset="utf-8">
+                    <meta name="viewport" content="width=device-width, initial-scale=1">
+                    <title>Hotel Timeline - {_escape_html(hotel_name)}</title>
+                    <style>
+                        body {{ font-family: Arial, sans-serif; margin: 0; padding: 20px; }}
+                        h1, h2, h3 {{ color: #333; }}
+                        .container {{ max-width: 1200px; margin: 0 auto; }}
+                        .header {{ background-color: #f2f2f2; padding: 20px; border-radius: 5px; margin-bottom: 20px; }}
+                        .timeline {{ position: relative; max-width: 1200px; margin: 0 auto; }}
+                        .timeline::after {{ content: ''; position: absolute; width: 6px; background-color: #999; top: 0; bottom: 0; left: 50%; margin-left: -3px; }}
+                        .container-left {{ padding: 10px 40px; position: relative; background-color: inherit; width: 45%; left: 0; }}
+                        .container-right {{ padding: 10px 40px; position: relative; background-color: inherit; width: 45%; left: 50%; }}
+                        .content {{ padding: 20px; background-color: white; position: relative; border-radius: 6px; border: 1px solid #ddd; }}
+                        .container-left .content::after {{ content: " "; position: absolute; top: 22px; right: -15px; border-width: 10px 0 10px 15px; border-color: transparent transparent transparent white; border-style: solid; }}
+                        .container-right .content::after {{ content: " "; position: absolute; top: 22px; left: -15px; border-width: 10px 15px 10px 0; border-color: transparent white transparent transparent; border-style: solid; }}
+                        .name-change {{ background-color: #e3f2fd; }}
+                        .ownership-change {{ background-color: #fff8e1; }}
+                        .status-change {{ background-color: #ffebee; }}
+                        .platform-change {{ background-color: #e8f5e9; }}
+                        .date {{ position: relative; color: #666; }}
+                    </style>
+                </head>
+                <body>
+                    <div class="container">
+                        <div class="header">
+                            <h1>Timeline for {_escape_html(hotel_name)}</h1>
+                            <p>Generated on: {now.strftime('%Y-%m-%d %H:%M:%S')}</p>
+                        </div>
+                        
+                        <div class="timeline">
+                """)
                 
-                # Determine event class
-                event_class = ""
-                if 'name' in event_type.lower():
-                    event_class = "name-change"
-                elif 'owner' in event_type.lower():
-                    event_class = "ownership-change"
-                elif 'status' in event_type.lower() or 'classification' in event_type.lower():
-                    event_class = "status-change"
-                elif 'platform' in event_type.lower() or 'listing' in event_type.lower():
-                    event_class = "platform-change"
+                # Sort history by date, unless the database already did
+                if not history_sorted:
+                    history.sort(key=lambda x: x.get('event_date', ''))
                 
-                # Alternate between left and right
-                container_class = "container-left" if i % 2 == 0 else "container-right"
+                # Add timeline events
+                for i, event in enumerate(history):
+                    get = event.get
+                    # Keep only the date part of ISO timestamps
+                    event_date = get('event_date', '').split('T', 1)[0]
+                    event_type = get('event_type', '')
+                    
+                    # Determine event class
+                    event_type_lower = event_type.lower()
+                    event_class = next((css_class for keyword, css_class in TIMELINE_EVENT_CLASSES
+                                        if keyword in event_type_lower), "")
+                    
+                    # Alternate between left and right
+                    container_class = "container-left" if i % 2 == 0 else "container-right"
+                    
+                    # Event values come from scraped pages, so they are escaped
+                    f.write(TIMELINE_EVENT_TEMPLATE.format(
+                        container_class=container_class,
+                        event_date=_escape_html(event_date),
+                        event_class=event_class,
+                        event_type=_escape_html(event_type),
+                        old_value=_escape_html(get('old_value', '')),
+                        new_value=_escape_html(get('new_value', '')),
+                        source=_escape_html(get('source', 'N/A'))
+                    ))
                 
-                html_content += f"""
-                        <div class="{container_class}">
-                            <div class="date">{event_date}</div>
-                            <div class="content {event_class}">
-                                <h3>{event_type}</h3>
-                                <p>From: {old_value}</p>
-                                <p>To: {new_value}</p>
-                                <p>Source: {event.get('source', 'N/A')}</p>
-                            </div>
+                # Close HTML
+                f.write("""
                         </div>
-                """
-            
-            # Close HTML
-            html_content += """
                     </div>
-                </div>
-            </body>
-            </html>
-            """
-            
-            # Write to file
-            with open(output_path, 'w', encoding='utf-8') as f:
-                f.write(html_content)
+                </body>
+                </html>
+                """)
             
             logger.info(f"Timeline export completed successfully: {output_path}")
             return {
@@ -849,9 +1138,7 @@ class ExportModule:
             }
         
         except Exception as e:
-            logger.error(f"Error exporting timeline: {e}")
-            import traceback
-            traceback.print_exc()
+            logger.exception(f"Error exporting timeline: {e}")
             return {"error": f"Export failed: {str(e)}"}
 
 # If run directly, display module info
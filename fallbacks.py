@@ -9,8 +9,15 @@ allowing the application to run even with partial installations.
 import sys
 import os
 import logging
+import types
+import importlib.abc
+import importlib.util
 from datetime import datetime
 
+# Fallback implementations shared with fixed_imports
+__all__ = ['FALLBACKS_USED', 'init_fallbacks', 'tabulate', 'Console', 'Table', 'track',
+           'Map', 'Marker', 'Icon']
+
 # Setup basic logging
 try:
     if not os.path.exists('logs'):
@@ -33,135 +40,130 @@ logger = logging.getLogger("fallbacks")
 # Dictionary to track which fallbacks are being used
 FALLBACKS_USED = {}
 
+class FallbackFinder(importlib.abc.MetaPathFinder, importlib.abc.Loader):
+    """
+    Import hook that installs a library's fallback the first time the library is imported
+    
+    It is the last entry of sys.meta_path, so it is only asked for modules that no other
+    finder could find: installed libraries are imported as usual and never probed up front.
+    """
+    
+    def find_spec(self, fullname, path=None, target=None):
+        library = fullname.partition('.')[0]
+        if library not in FALLBACK_INSTALLERS or library in FALLBACKS_USED:
+            return None
+        
+        logger.warning(f"{library} not found, using fallback")
+        FALLBACKS_USED[library] = True
+        FALLBACK_INSTALLERS[library]()
+        
+        if fullname not in sys.modules:
+            return None
+        return importlib.util.spec_from_loader(fullname, self)
+    
+    def create_module(self, spec):
+        # The installer already put the fallback module in sys.modules
+        return sys.modules[spec.name]
+    
+    def exec_module(self, module):
+        pass
+
 def init_fallbacks():
-    """Initialize and install necessary fallbacks"""
+    """Install the import hook that provides fallbacks for missing libraries"""
     logger.info("Initializing fallbacks module")
     
-    # Try to import each module, use fallback if not available
-    init_tabulate_fallback()
-    init_rich_fallback()
-    init_folium_fallback()
-    init_psycopg2_fallback()
-    
-    # Log what fallbacks are being used
-    for module, is_used in FALLBACKS_USED.items():
-        if is_used:
-            logger.warning(f"Using fallback for {module}")
-        else:
-            logger.info(f"Using actual {module} library")
+    if not any(isinstance(finder, FallbackFinder) for finder in sys.meta_path):
+        sys.meta_path.append(FallbackFinder())
     
     return FALLBACKS_USED
 
+# tabulate fallback
+def tabulate(data, headers=None, tablefmt="simple"):
+    if not data:
+        return ""
+    
+    result = ""
+    if headers:
+        result += " | ".join([str(h) for h in headers]) + "\n"
+        result += "-" * len(result) + "\n"
+    
+    for row in data:
+        result += " | ".join([str(cell) for cell in row]) + "\n"
+    
+    return result
+
 def init_tabulate_fallback():
-    """Initialize tabulate fallback if needed"""
-    try:
-        import tabulate
-        FALLBACKS_USED['tabulate'] = False
-        return
-    except ImportError:
-        logger.warning("tabulate not found, using fallback")
-        FALLBACKS_USED['tabulate'] = True
-        
-    # Create tabulate fallback
-    class TabulateFallback:
-        def __call__(self, data, headers=None, tablefmt="simple"):
-            if not data:
-                return ""
-            
-            result = ""
-            if headers:
-                result += " | ".join([str(h) for h in headers]) + "\n"
-                result += "-" * len(result) + "\n"
-            
-            for row in data:
-                result += " | ".join([str(cell) for cell in row]) + "\n"
-            
-            return result
+    """Install the tabulate fallback module"""
+    tabulate_module = types.ModuleType('tabulate', 'Fallback tabulate module')
+    tabulate_module.tabulate = tabulate
+    sys.modules['tabulate'] = tabulate_module
+
+# rich fallbacks
+class Console:
+    def __init__(self, *args, **kwargs):
+        pass
     
-    # Install the fallback
-    sys.modules['tabulate'] = type('tabulate', (), {
-        '__doc__': 'Fallback tabulate module',
-        'tabulate': TabulateFallback()
-    })
+    def print(self, *args, **kwargs):
+        if args and hasattr(args[0], '__str__'):
+            print(str(args[0]))
+        else:
+            print(*args)
 
-def init_rich_fallback():
-    """Initialize rich fallback if needed"""
-    try:
-        import rich
-        FALLBACKS_USED['rich'] = False
-        return
-    except ImportError:
-        logger.warning("rich not found, using fallback")
-        FALLBACKS_USED['rich'] = True
+class Table:
+    def __init__(self, *args, **kwargs):
+        self.title = kwargs.get('title', '')
+        self.rows = []
+        self.headers = []
     
-    # Create rich module and console
-    class Console:
-        def __init__(self, *args, **kwargs):
-            pass
-        
-        def print(self, *args, **kwargs):
-            if args and hasattr(args[0], '__str__'):
-                print(str(args[0]))
-            else:
-                print(*args)
+    def add_column(self, header, *args, **kwargs):
+        self.headers.append(header)
     
-    class Table:
-        def __init__(self, *args, **kwargs):
-            self.title = kwargs.get('title', '')
-            self.rows = []
-            self.headers = []
+    def add_row(self, *cells):
+        self.rows.append(cells)
+    
+    def __str__(self):
+        if self.title:
+            result = self.title + "\n" + "=" * len(self.title) + "\n\n"
+        else:
+            result = ""
         
-        def add_column(self, header, *args, **kwargs):
-            self.headers.append(header)
+        if self.headers:
+            result += " | ".join(self.headers) + "\n"
+            result += "-" * len(result) + "\n"
         
-        def add_row(self, *cells):
-            self.rows.append(cells)
+        for row in self.rows:
+            result += " | ".join([str(cell) for cell in row]) + "\n"
         
-        def __str__(self):
-            if self.title:
-                result = self.title + "\n" + "=" * len(self.title) + "\n\n"
-            else:
-                result = ""
-            
-            if self.headers:
-                result += " | ".join(self.headers) + "\n"
-                result += "-" * len(result) + "\n"
-            
-            for row in self.rows:
-                result += " | ".join([str(cell) for cell in row]) + "\n"
-            
-            return result
-    
-    def track(iterable, description=None, total=None):
-        if description:
-            print(description)
-        return iterable
-    
-    # Create fake rich module
-    rich_module = type('rich', (), {
-        '__doc__': 'Fallback rich module',
-        'Console': Console,
-        'Table': Table,
-        'track': track
-    })
-    
+        return result
+
+def track(iterable, description=None, total=None):
+    if description:
+        print(description)
+    return iterable
+
+def init_rich_fallback():
+    """Install the rich fallback module"""
     # Create fake rich.console module
-    console_module = type('console', (), {
-        '__doc__': 'Fallback rich.console module',
-        'Console': Console
-    })
+    console_module = types.ModuleType('rich.console', 'Fallback rich.console module')
+    console_module.Console = Console
     
     # Create fake rich.table module
-    table_module = type('table', (), {
-        '__doc__': 'Fallback rich.table module',
-        'Table': Table
-    })
+    table_module = types.ModuleType('rich.table', 'Fallback rich.table module')
+    table_module.Table = Table
     
     # Create fake rich.progress module
-    progress_module = type('progress', (), {
-        '__doc__': 'Fallback rich.progress module',
-        'track': track
-    })
+    progress_module = types.ModuleType('rich.progress', 'Fallback rich.progress module')
+    progress_module.track = track
+    
+    # Create fake rich package, with its submodules as attributes like a real package
+    rich_module = types.ModuleType('rich', 'Fallback rich module')
+    rich_module.__path__ = []
+    rich_module.Console = Console
+    rich_module.Table = Table
+    rich_module.track = track
+    rich_module.console = console_module
+    rich_module.table = table_module
+    rich_module.progress = progress_module
     
     # Install all the fallbacks
     sys.modules['rich'] = rich_module
@@ -169,105 +171,93 @@ def init_rich_fallback():
     sys.modules['rich.table'] = table_module
     sys.modules['rich.progress'] = progress_module
 
-def init_folium_fallback():
-    """Initialize folium fallback if needed"""
-    try:
-        import folium
-        FALLBACKS_USED['folium'] = False
-        return
-    except ImportError:
-        logger.warning("folium not found, using fallback")
-        FALLBACKS_USED['folium'] = True
+# folium fallbacks
+class Map:
+    def __init__(self, location=None, zoom_start=None, **kwargs):
+        self.location = location
+        self.zoom_start = zoom_start
+        self._children = {}
     
-    # Create folium fallbacks
-    class Map:
-        def __init__(self, location=None, zoom_start=None, **kwargs):
-            self.location = location
-            self.zoom_start = zoom_start
-            self._children = {}
-        
-        def add_to(self, obj):
-            return self
-        
-        def add_child(self, child, name=None, **kwargs):
-            if name is None:
-                name = f"child_{len(self._children)}"
-            self._children[name] = child
-            return self
-        
-        def save(self, path):
-            with open(path, "w") as f:
-                f.write("<html><body><h1>Map Unavailable</h1>")
-                f.write("<p>Folium library not installed properly.</p>")
-                f.write("<p>Please install folium to use map features.</p>")
-                f.write("</body></html>")
-            print(f"Created placeholder map at {path}")
-            return path
+    def add_to(self, obj):
+        return self
     
-    class Marker:
-        def __init__(self, location=None, popup=None, tooltip=None, icon=None, **kwargs):
-            self.location = location
-            self.popup = popup
-            self.tooltip = tooltip
-            self.icon = icon
-        
-        def add_to(self, obj):
-            if hasattr(obj, 'add_child'):
-                obj.add_child(self)
-            return self
+    def add_child(self, child, name=None, **kwargs):
+        if name is None:
+            name = f"child_{len(self._children)}"
+        self._children[name] = child
+        return self
     
-    class Icon:
-        def __init__(self, color=None, icon=None, prefix=None, **kwargs):
-            self.color = color
-            self.icon = icon
-            self.prefix = prefix
+    def save(self, path):
+        with open(path, "w") as f:
+            f.write("<html><body><h1>Map Unavailable</h1>")
+            f.write("<p>Folium library not installed properly.</p>")
+            f.write("<p>Please install folium to use map features.</p>")
+            f.write("</body></html>")
+        print(f"Created placeholder map at {path}")
+        return path
+
+class Marker:
+    def __init__(self, location=None, popup=None, tooltip=None, icon=None, **kwargs):
+        self.location = location
+        self.popup = popup
+        self.tooltip = tooltip
+        self.icon = icon
     
+    def add_to(self, obj):
+        if hasattr(obj, 'add_child'):
+            obj.add_child(self)
+        return self
+
+class Icon:
+    def __init__(self, color=None, icon=None, prefix=None, **kwargs):
+        self.color = color
+        self.icon = icon
+        self.prefix = prefix
+
+def init_folium_fallback():
+    """Install the folium fallback module"""
     # Create fake folium module
-    folium_module = type('folium', (), {
-        '__doc__': 'Fallback folium module',
-        'Map': Map,
-        'Marker': Marker,
-        'Icon': Icon
-    })
+    folium_module = types.ModuleType('folium', 'Fallback folium module')
+    folium_module.Map = Map
+    folium_module.Marker = Marker
+    folium_module.Icon = Icon
     
     # Install the fallback
     sys.modules['folium'] = folium_module
 
+# psycopg2 fallbacks
+class DatabaseError(Exception):
+    pass
+
+class OperationalError(DatabaseError):
+    pass
+
+class InterfaceError(DatabaseError):
+    pass
+
+# Create connection function
+def connect(*args, **kwargs):
+    raise DatabaseError("PostgreSQL not available. Please use SQLite instead.")
+
 def init_psycopg2_fallback():
-    """Initialize psycopg2 fallback if needed"""
-    try:
-        import psycopg2
-        FALLBACKS_USED['psycopg2'] = False
-        return
-    except ImportError:
-        logger.warning("psycopg2 not found, using fallback")
-        FALLBACKS_USED['psycopg2'] = True
-    
-    # Create exceptions
-    class DatabaseError(Exception):
-        pass
-    
-    class OperationalError(DatabaseError):
-        pass
-    
-    class InterfaceError(DatabaseError):
-        pass
-    
-    # Create connection function
-    def connect(*args, **kwargs):
-        raise DatabaseError("PostgreSQL not available. Please use SQLite instead.")
-    
+    """Install the psycopg2 fallback module"""
     # Create fake psycopg2 module
-    psycopg2_module = type('psycopg2', (), {
-        '__doc__': 'Fallback psycopg2 module',
-        'connect': connect,
-        'DatabaseError': DatabaseError,
-        'OperationalError': OperationalError,
-        'InterfaceError': InterfaceError
-    })
+    psycopg2_module = types.ModuleType('psycopg2', 'Fallback psycopg2 module')
+    psycopg2_module.connect = connect
+    psycopg2_module.DatabaseError = DatabaseError
+    psycopg2_module.OperationalError = OperationalError
+    psycopg2_module.InterfaceError = InterfaceError
     
     # Install the fallback
     sys.modules['psycopg2'] = psycopg2_module
 
+# Fallback installers by library name, used by FallbackFinder
+FALLBACK_INSTALLERS = {
+    'tabulate': init_tabulate_fallback,
+    'rich': init_rich_fallback,
+    'folium': init_folium_fallback,
+    'psycopg2': init_psycopg2_fallback
+}
+
 # Initialize fallbacks when module is imported
 init_fallbacks()
\ No newline at end of file
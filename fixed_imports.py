@@ -17,20 +17,7 @@ except ImportError:
 try:
     from tabulate import tabulate
 except ImportError:
-    # Simple tabulate fallback
-    def tabulate(data, headers=None, tablefmt="simple"):
-        if not data:
-            return ""
-        
-        result = ""
-        if headers:
-            result += " | ".join([str(h) for h in headers]) + "\n"
-            result += "-" * len(result) + "\n"
-        
-        for row in data:
-            result += " | ".join([str(cell) for cell in row]) + "\n"
-        
-        return result
+    from fallbacks import tabulate
 
 # Rich imports handling
 try:
@@ -38,79 +25,12 @@ try:
     from rich.table import Table
     from rich.progress import track
 except ImportError:
-    # Simple rich components fallbacks
-    class Console:
-        def print(self, *args, **kwargs):
-            print(*args)
-    
-    class Table:
-        def __init__(self, *args, **kwargs):
-            self.title = kwargs.get('title', '')
-            self.rows = []
-            self.headers = []
-        
-        def add_column(self, header, *args, **kwargs):
-            self.headers.append(header)
-        
-        def add_row(self, *cells):
-            self.rows.append(cells)
-        
-        def __str__(self):
-            if self.title:
-                result = self.title + "\n" + "=" * len(self.title) + "\n\n"
-            else:
-                result = ""
-            
-            if self.headers:
-                result += " | ".join(self.headers) + "\n"
-                result += "-" * len(result) + "\n"
-            
-            for row in self.rows:
-                result += " | ".join([str(cell) for cell in row]) + "\n"
-            
-            return result
-    
-    def track(iterable, description=None, total=None):
-        if description:
-            print(description)
-        return iterable
+    from fallbacks import Console, Table, track
 
 # Folium import handling
 try:
     import folium
 except ImportError:
-    # Simple folium fallbacks that won't crash code but will show warnings
-    class Map:
-        def __init__(self, *args, **kwargs):
-            print("Warning: folium not available. Map features limited.")
-            self._children = {}
-        
-        def add_to(self, obj):
-            return self
-        
-        def add_child(self, child, name=None):
-            return self
-        
-        def save(self, path):
-            with open(path, "w") as f:
-                f.write("<html><body><h1>Map Not Available</h1><p>Folium library not installed</p></body></html>")
-            print(f"Created placeholder map at {path}")
-            return path
-    
-    class Marker:
-        def __init__(self, *args, **kwargs):
-            pass
-        
-        def add_to(self, obj):
-            return self
-    
-    class Icon:
-        def __init__(self, *args, **kwargs):
-            pass
-    
-    # Create a minimal folium module
-    folium = type('folium', (), {
-        'Map': Map,
-        'Marker': Marker,
-        'Icon': Icon
-    })
\ No newline at end of file
+    # Importing fallbacks installs its import hook, which then provides a placeholder folium
+    from fallbacks import Map, Marker, Icon
+    import folium
\ No newline at end of file
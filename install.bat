@@ -60,7 +60,7 @@ echo Installing UI dependencies...
 %pip_cmd% install tabulate rich
 
 echo Installing visualization dependencies...
-%pip_cmd% install folium
+%pip_cmd% install folium jinja2
 
 echo Installing database dependencies...
 %pip_cmd% install psycopg2-binary || %pip_cmd% install psycopg2 || echo [WARNING] PostgreSQL support not available.
@@ -74,6 +74,31 @@ echo Installing visualization extensions...
 echo Installing machine learning dependencies (optional, may fail on some systems)...
 %pip_cmd% install scikit-learn || echo [WARNING] scikit-learn not installed, some clustering features will be limited.
 
+echo Installing fast string matching (optional)...
+%pip_cmd% install rapidfuzz || echo [WARNING] rapidfuzz not installed, duplicate detection will be slower.
+
+echo Installing results cache client (optional)...
+%pip_cmd% install redis || echo [WARNING] redis not installed, search results will not be cached.
+
+echo Installing Playwright browser backend (optional)...
+%pip_cmd% install playwright && %py_cmd% -m playwright install chromium || echo [WARNING] Playwright not installed, the Selenium backend will be used.
+
+echo Installing chromedriver manager (optional)...
+%pip_cmd% install webdriver-manager || echo [WARNING] webdriver-manager not installed, chromedriver must be on PATH or set in CHROMEDRIVER.
+
+echo Installing numba JIT compiler (optional)...
+%pip_cmd% install numba || echo [WARNING] numba not installed, distance and similarity fallbacks will run in pure Python.
+
+echo Installing fast JSON parsers (optional)...
+%pip_cmd% install orjson ijson || echo [WARNING] orjson/ijson not installed, JSON imports and exports will use the standard library.
+
+echo Installing fast Excel writer (optional)...
+%pip_cmd% install xlsxwriter || echo [WARNING] xlsxwriter not installed, Excel exports will use openpyxl.
+
+echo Installing fast CSV and Excel readers (optional)...
+%pip_cmd% install pyarrow || echo [WARNING] pyarrow not installed, CSV imports will use pandas.
+%pip_cmd% install python-calamine || echo [WARNING] python-calamine not installed, Excel imports will use openpyxl.
+
 
 
 :create_launcher